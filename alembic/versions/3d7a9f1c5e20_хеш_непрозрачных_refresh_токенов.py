@@ -0,0 +1,34 @@
+"""Хеш непрозрачных refresh-токенов
+
+Revision ID: 3d7a9f1c5e20
+Revises: 8c4f2e6a1b90
+Create Date: 2026-10-19 16:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3d7a9f1c5e20"
+down_revision: Union[str, None] = "8c4f2e6a1b90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SHA-256 (hex) непрозрачного refresh-токена; у refresh-токенов в формате JWT остаётся NULL
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.add_column(sa.Column("token_hash", sa.String(length=64), nullable=True))
+        batch_op.create_index("ix_refresh_tokens_token_hash", ["token_hash"], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.drop_index("ix_refresh_tokens_token_hash")
+        batch_op.drop_column("token_hash")
@@ -0,0 +1,74 @@
+"""Хеши токенов подтверждения и сброса пароля
+
+Revision ID: 5b1e9c7d2a43
+Revises: 026c6d7ea054
+Create Date: 2026-10-19 15:10:00.000000
+
+"""
+
+import hashlib
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1e9c7d2a43"
+down_revision: Union[str, None] = "026c6d7ea054"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("confirmation_token_hash", sa.String(length=64), nullable=True))
+    op.add_column("users", sa.Column("password_reset_token_hash", sa.String(length=64), nullable=True))
+
+    # Перенос действующих токенов: в базе остаются только их дайджесты
+    users = sa.table(
+        "users",
+        sa.column("id", sa.Integer),
+        sa.column("confirmation_token", sa.Text),
+        sa.column("confirmation_token_hash", sa.String),
+        sa.column("password_reset_token", sa.String),
+        sa.column("password_reset_token_hash", sa.String),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(users.c.id, users.c.confirmation_token, users.c.password_reset_token).where(
+            sa.or_(users.c.confirmation_token.isnot(None), users.c.password_reset_token.isnot(None))
+        )
+    ).all()
+    for user_id, confirmation_token, password_reset_token in rows:
+        connection.execute(
+            users.update()
+            .where(users.c.id == user_id)
+            .values(
+                confirmation_token_hash=_sha256(confirmation_token) if confirmation_token else None,
+                password_reset_token_hash=_sha256(password_reset_token) if password_reset_token else None,
+            )
+        )
+
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("confirmation_token")
+        batch_op.drop_column("password_reset_token")
+
+    op.create_index(op.f("ix_users_confirmation_token_hash"), "users", ["confirmation_token_hash"], unique=False)
+    op.create_index(op.f("ix_users_password_reset_token_hash"), "users", ["password_reset_token_hash"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Исходные токены не восстанавливаются: ранее выданные ссылки станут недействительными
+    op.drop_index(op.f("ix_users_password_reset_token_hash"), table_name="users")
+    op.drop_index(op.f("ix_users_confirmation_token_hash"), table_name="users")
+    op.add_column("users", sa.Column("password_reset_token", sa.String(), nullable=True))
+    op.add_column("users", sa.Column("confirmation_token", sa.Text(), nullable=True))
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("password_reset_token_hash")
+        batch_op.drop_column("confirmation_token_hash")
@@ -0,0 +1,51 @@
+"""Индексы для поиска пользователей
+
+Revision ID: 8c4f2e6a1b90
+Revises: 5b1e9c7d2a43
+Create Date: 2026-10-19 15:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c4f2e6a1b90"
+down_revision: Union[str, None] = "5b1e9c7d2a43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # varchar_pattern_ops позволяет PostgreSQL использовать индекс для LIKE 'prefix%' при любой collation;
+    # в остальных СУБД индекс по email повторял бы уже существующий уникальный индекс
+    if op.get_bind().dialect.name == "postgresql":
+        op.create_index(
+            "ix_users_email_pattern", "users", ["email"], unique=False, postgresql_ops={"email": "varchar_pattern_ops"}
+        )
+    op.create_index(
+        "ix_users_last_name_pattern", "users", ["last_name"], unique=False, postgresql_ops={"last_name": "varchar_pattern_ops"}
+    )
+    op.create_index(
+        "ix_users_first_name_pattern",
+        "users",
+        ["first_name"],
+        unique=False,
+        postgresql_ops={"first_name": "varchar_pattern_ops"},
+    )
+    op.create_index("ix_users_role_title_id", "users", ["role_title", "id"], unique=False)
+    op.create_index("ix_users_ban_email_confirmed_id", "users", ["ban", "email_confirmed", "id"], unique=False)
+    op.create_index("ix_users_registration_date_id", "users", ["registration_date", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_registration_date_id", table_name="users")
+    op.drop_index("ix_users_ban_email_confirmed_id", table_name="users")
+    op.drop_index("ix_users_role_title_id", table_name="users")
+    op.drop_index("ix_users_first_name_pattern", table_name="users")
+    op.drop_index("ix_users_last_name_pattern", table_name="users")
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_users_email_pattern", table_name="users")
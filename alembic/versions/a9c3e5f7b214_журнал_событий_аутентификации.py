@@ -0,0 +1,48 @@
+"""Журнал событий аутентификации
+
+Revision ID: a9c3e5f7b214
+Revises: 7f2d4b9e6a18
+Create Date: 2026-10-19 18:40:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a9c3e5f7b214"
+down_revision: Union[str, None] = "7f2d4b9e6a18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "auth_events",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("event_type", sa.String(length=50), nullable=False),
+        sa.Column("success", sa.Boolean(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("user_agent", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_auth_events_email_id", "auth_events", ["email", "id"], unique=False)
+    op.create_index("ix_auth_events_user_id_id", "auth_events", ["user_id", "id"], unique=False)
+    op.create_index("ix_auth_events_event_type_id", "auth_events", ["event_type", "id"], unique=False)
+    op.create_index("ix_auth_events_created_at_id", "auth_events", ["created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_auth_events_created_at_id", table_name="auth_events")
+    op.drop_index("ix_auth_events_event_type_id", table_name="auth_events")
+    op.drop_index("ix_auth_events_user_id_id", table_name="auth_events")
+    op.drop_index("ix_auth_events_email_id", table_name="auth_events")
+    op.drop_table("auth_events")
@@ -0,0 +1,34 @@
+"""Аренда email-рассылок
+
+Revision ID: b6e2d9f4a173
+Revises: a9c3e5f7b214
+Create Date: 2026-10-20 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e2d9f4a173"
+down_revision: Union[str, None] = "a9c3e5f7b214"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Рассылки в статусе running без аренды (запущенные до миграции) можно продолжить сразу
+    with op.batch_alter_table("email_broadcasts") as batch_op:
+        batch_op.add_column(sa.Column("lease_id", sa.Uuid(), nullable=True))
+        batch_op.add_column(sa.Column("lease_expires_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("email_broadcasts") as batch_op:
+        batch_op.drop_column("lease_expires_at")
+        batch_op.drop_column("lease_id")
@@ -0,0 +1,67 @@
+"""Refresh-токены по user_id и UUID
+
+Revision ID: e41b6c8d3f57
+Revises: 3d7a9f1c5e20
+Create Date: 2026-10-19 17:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e41b6c8d3f57"
+down_revision: Union[str, None] = "3d7a9f1c5e20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.add_column(sa.Column("user_id", sa.Integer(), nullable=True))
+
+    op.execute("UPDATE refresh_tokens SET user_id = " "(SELECT users.id FROM users WHERE users.email = refresh_tokens.email)")
+    op.execute("DELETE FROM refresh_tokens WHERE user_id IS NULL")
+
+    # В SQLite тип Uuid хранится как 32 шестнадцатеричных символа без дефисов
+    if op.get_bind().dialect.name != "postgresql":
+        op.execute("UPDATE refresh_tokens SET jti = lower(replace(jti, '-', ''))")
+
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.drop_index("ix_refresh_tokens_jti")
+        batch_op.drop_index("ix_refresh_tokens_email")
+        batch_op.drop_column("email")
+        batch_op.alter_column("jti", existing_type=sa.String(), type_=sa.Uuid(), postgresql_using="jti::uuid")
+        batch_op.alter_column("user_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key("fk_refresh_tokens_user_id_users", "users", ["user_id"], ["id"], ondelete="CASCADE")
+        batch_op.create_index("ix_refresh_tokens_user_id", ["user_id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.add_column(sa.Column("email", sa.String(length=255), nullable=True))
+
+    op.execute("UPDATE refresh_tokens SET email = " "(SELECT users.email FROM users WHERE users.id = refresh_tokens.user_id)")
+
+    with op.batch_alter_table("refresh_tokens") as batch_op:
+        batch_op.drop_index("ix_refresh_tokens_user_id")
+        batch_op.drop_constraint("fk_refresh_tokens_user_id_users", type_="foreignkey")
+        batch_op.drop_column("user_id")
+        batch_op.alter_column("jti", existing_type=sa.Uuid(), type_=sa.String(), postgresql_using="jti::text")
+        batch_op.alter_column("email", existing_type=sa.String(length=255), nullable=False)
+        batch_op.create_foreign_key("refresh_tokens_email_fkey", "users", ["email"], ["email"], ondelete="CASCADE")
+        batch_op.create_index("ix_refresh_tokens_email", ["email"], unique=False)
+        batch_op.create_index("ix_refresh_tokens_jti", ["jti"], unique=False)
+
+    # Возврат текстового представления UUID с дефисами, как его формирует JWTHandler
+    if op.get_bind().dialect.name != "postgresql":
+        op.execute(
+            "UPDATE refresh_tokens SET jti = "
+            "substr(jti, 1, 8) || '-' || substr(jti, 9, 4) || '-' || substr(jti, 13, 4) || '-' "
+            "|| substr(jti, 17, 4) || '-' || substr(jti, 21, 12)"
+        )
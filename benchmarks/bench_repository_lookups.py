@@ -0,0 +1,60 @@
+"""
+Микробенчмарк накладных расходов Python на построение и выполнение запросов поиска.
+
+Сравнивает запрос, создаваемый при каждом вызове (`select(...).filter_by(...)`, как в
+BaseRepository.find_one_or_none), с заранее построенными запросами UserRepository.find_by_email и
+RefreshTokenRepository.find_by_jti. Запросы выполняются на SQLite в памяти, поэтому разница
+отражает затраты SQLAlchemy на построение конструкции и вычисление ключа кеша компиляции.
+
+Запуск из корня проекта (требуется заполненный .env):
+    python -m benchmarks.bench_repository_lookups
+"""
+
+import timeit
+from uuid import uuid4
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.auth.services import RefreshTokenRepository, UserRepository
+from src.models import Base, RefreshToken, User
+
+CALLS = 5000
+JTI = uuid4()
+REPEATS = 5
+
+
+def _measure(func) -> float:
+    """
+    Возвращает лучшее среднее время одного вызова функции в микросекундах.
+    """
+    return min(timeit.repeat(func, number=CALLS, repeat=REPEATS)) / CALLS * 1_000_000
+
+
+def main() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        cases = {
+            "users: select().filter_by(email=...)": lambda: session.execute(
+                select(User).filter_by(email="user@example.com")
+            ).scalar_one_or_none(),
+            "users: UserRepository._find_by_email_query": lambda: session.execute(
+                UserRepository._find_by_email_query, {"email": "user@example.com"}
+            ).scalar_one_or_none(),
+            "refresh_tokens: select().filter_by(jti=...)": lambda: session.execute(
+                select(RefreshToken).filter_by(jti=JTI)
+            ).scalar_one_or_none(),
+            "refresh_tokens: RefreshTokenRepository._find_by_jti_query": lambda: session.execute(
+                RefreshTokenRepository._find_by_jti_query, {"jti": JTI}
+            ).scalar_one_or_none(),
+        }
+
+        for name, func in cases.items():
+            func()
+            print(f"{name:<60} {_measure(func):8.1f} мкс/вызов")
+
+
+if __name__ == "__main__":
+    main()
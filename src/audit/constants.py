@@ -0,0 +1,17 @@
+from enum import Enum
+
+
+class AuthEventType(str, Enum):
+    REGISTER = "register"
+    LOGIN = "login"
+    LOGIN_FAILED = "login_failed"
+    REFRESH = "refresh"
+    REFRESH_FAILED = "refresh_failed"
+    LOGOUT = "logout"
+    LOGOUT_ALL = "logout_all"
+    PASSWORD_RESET_REQUESTED = "password_reset_requested"
+    PASSWORD_RESET = "password_reset"
+    PASSWORD_RESET_FAILED = "password_reset_failed"
+    EMAIL_CONFIRMED = "email_confirmed"
+    EMAIL_CONFIRMATION_FAILED = "email_confirmation_failed"
+    EMAIL_CONFIRMATION_RESENT = "email_confirmation_resent"
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, status
+
+from src.audit.schemas.requests import AuthEventSearchRequest
+from src.audit.schemas.responses import AuthEventSearchResponse
+from src.audit.services import AuthEventRepository
+from src.auth.constants import Permission
+from src.auth.dependencies import require_permissions
+
+router = APIRouter(prefix="/audit", tags=["Журнал событий"])
+
+
+@router.post("/events/search", response_model=AuthEventSearchResponse, status_code=status.HTTP_200_OK)
+async def search_auth_events(data: AuthEventSearchRequest, admin_user=Depends(require_permissions(Permission.AUDIT_READ))):
+    """
+    Ищет события аутентификации по фильтрам, от новых к старым, с keyset-пагинацией.
+
+    Args:
+        data: Фильтры поиска и параметры пагинации (before_id, limit).
+        admin_user: Текущий пользователь с правом просмотра журнала событий.
+
+    Returns:
+        Страница событий и идентификатор для запроса следующей страницы (next_before_id).
+    """
+    filters = data.model_dump()
+    if data.event_type is not None:
+        filters["event_type"] = data.event_type.value
+    events = await AuthEventRepository.search(**filters)
+    next_before_id = events[-1].id if len(events) == data.limit else None
+    return {"events": events, "next_before_id": next_before_id}
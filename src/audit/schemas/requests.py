@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, EmailStr, Field
+
+from src.audit.constants import AuthEventType
+
+
+class AuthEventSearchRequest(BaseModel):
+    event_type: Optional[AuthEventType] = None
+    email: Optional[EmailStr] = None
+    user_id: Optional[int] = None
+    success: Optional[bool] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    before_id: Optional[int] = None
+    limit: int = Field(default=50, ge=1, le=200)
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class AuthEventResponse(BaseModel):
+    id: int
+    event_type: str
+    success: bool
+    user_id: Optional[int]
+    email: Optional[str]
+    ip_address: Optional[str]
+    user_agent: Optional[str]
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class AuthEventSearchResponse(BaseModel):
+    events: List[AuthEventResponse]
+    next_before_id: Optional[int]
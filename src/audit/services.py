@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from src.models import AuthEvent
+from src.services import BaseRepository
+
+
+class AuthEventRepository(BaseRepository[AuthEvent]):
+    """
+    Репозиторий для выполнения CRUD-операций с моделью AuthEvent.
+    """
+
+    model = AuthEvent
+
+    @classmethod
+    async def search(
+        cls,
+        event_type: Optional[str] = None,
+        email: Optional[str] = None,
+        user_id: Optional[int] = None,
+        success: Optional[bool] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+        limit: int = 50,
+    ) -> List[AuthEvent]:
+        """
+        Ищет события аутентификации по фильтрам с keyset-пагинацией от новых событий к старым.
+
+        Args:
+            event_type: Тип события.
+            email: Email, указанный в событии.
+            user_id: Идентификатор пользователя.
+            success: Признак успешности операции.
+            created_from: Нижняя граница времени события (включительно).
+            created_to: Верхняя граница времени события (не включительно).
+            before_id: Идентификатор последнего события предыдущей страницы.
+            limit: Максимальное количество событий на странице.
+
+        Returns:
+            Список событий, упорядоченный по убыванию id.
+        """
+        query = select(cls.model)
+        if event_type is not None:
+            query = query.where(cls.model.event_type == event_type)
+        if email is not None:
+            query = query.where(cls.model.email == email)
+        if user_id is not None:
+            query = query.where(cls.model.user_id == user_id)
+        if success is not None:
+            query = query.where(cls.model.success == success)
+        if created_from is not None:
+            query = query.where(cls.model.created_at >= created_from)
+        if created_to is not None:
+            query = query.where(cls.model.created_at < created_to)
+        if before_id is not None:
+            query = query.where(cls.model.id < before_id)
+
+        result = await cls._execute_read(query.order_by(cls.model.id.desc()).limit(limit))
+        return result.scalars().all()
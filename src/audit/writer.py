@@ -0,0 +1,168 @@
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Request
+
+from src.audit.constants import AuthEventType
+from src.audit.services import AuthEventRepository
+from src.config import settings
+from src.logs.logger import logger
+
+
+class AuditWriter:
+    """
+    Класс для неблокирующей записи событий аутентификации в журнал (таблица auth_events).
+
+    События помещаются в ограниченную очередь в памяти без обращения к базе данных, а фоновая задача
+    записывает их пакетной вставкой, когда в очереди накопилось `batch_size` событий или прошло
+    `flush_interval` секунд. При переполнении очереди события отбрасываются согласно `overflow_policy`:
+    drop_newest — новые события, drop_oldest — самые старые из ожидающих записи.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = settings.AUDIT_QUEUE_SIZE,
+        batch_size: int = settings.AUDIT_BATCH_SIZE,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL,
+        overflow_policy: str = settings.AUDIT_OVERFLOW_POLICY,
+        enabled: bool = settings.AUDIT_ENABLED,
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.enabled = enabled
+
+        self._queue: deque[dict] = deque()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: asyncio.Task | None = None
+
+        # Счётчики для мониторинга
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.write_errors = 0
+
+    def record(
+        self,
+        event_type: AuthEventType,
+        request: Optional[Request] = None,
+        email: Optional[str] = None,
+        user_id: Optional[int] = None,
+        success: bool = True,
+    ) -> None:
+        """
+        Добавляет событие в очередь записи. Не обращается к базе данных.
+
+        Args:
+            event_type: Тип события.
+            request: HTTP-запрос, из которого берутся IP-адрес и User-Agent клиента.
+            email: Email, указанный в запросе или принадлежащий пользователю.
+            user_id: Идентификатор пользователя, если он известен.
+            success: Признак успешности операции.
+        """
+        if not self.enabled:
+            return
+
+        if len(self._queue) >= self.max_queue:
+            self.dropped += 1
+            if self.overflow_policy == "drop_newest":
+                return
+            self._queue.popleft()
+
+        ip_address = None
+        user_agent = None
+        if request is not None:
+            ip_address = request.client.host if request.client else None
+            user_agent = request.headers.get("user-agent", "")[:255] or None
+
+        self._queue.append(
+            {
+                "event_type": event_type.value,
+                "success": success,
+                "user_id": user_id,
+                "email": str(email) if email else None,
+                "ip_address": ip_address,
+                "user_agent": user_agent,
+                "created_at": datetime.now(),
+            }
+        )
+
+        if len(self._queue) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """
+        Записывает все ожидающие события пакетами по `batch_size`.
+
+        Notes:
+            При ошибке записи пакет возвращается в начало очереди (с учётом её размера)
+            и будет записан при следующем сбросе.
+        """
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            try:
+                await AuthEventRepository.add_many(batch)
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"Ошибка при записи журнала событий аутентификации: {type(e).__name__}: {e}")
+                free = self.max_queue - len(self._queue)
+                self.dropped += max(len(batch) - free, 0)
+                self._queue.extendleft(reversed(batch[: max(free, 0)]))
+                return
+
+            self.written += len(batch)
+            self.batches += 1
+
+    def start(self) -> None:
+        """
+        Запускает фоновую задачу записи событий.
+        """
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Останавливает фоновую задачу и записывает оставшиеся события.
+
+        Notes:
+            Задача не отменяется, а завершается после текущей записи: отмена во время вставки
+            прервала бы транзакцию и потеряла бы уже извлечённый из очереди пакет.
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def stats(self) -> dict:
+        """
+        Возвращает состояние очереди журнала для мониторинга.
+
+        Returns:
+            Словарь с размером очереди и счётчиками записанных и отброшенных событий.
+        """
+        return {
+            "queued": len(self._queue),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "write_errors": self.write_errors,
+        }
+
+
+audit_writer = AuditWriter()
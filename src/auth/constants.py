@@ -1,5 +1,54 @@
-from enum import Enum
+from enum import Enum, IntFlag
+
 
 class UserRole(str, Enum):
     USER = "USER"
     ADMIN = "ADMIN"
+
+
+class TokenUse(str, Enum):
+    """
+    Назначение JWT-токена (claim "token_use").
+    """
+
+    ACCESS = "access"
+    REFRESH = "refresh"
+    RESET = "reset"
+
+
+class Permission(IntFlag):
+    """
+    Права доступа. Набор прав роли хранится как целочисленная битовая маска,
+    поэтому проверка прав — одна операция побитового И без обращения к базе данных.
+
+    Значения битов не должны меняться: маска передаётся в claim "perm" access-токена.
+    """
+
+    USERS_READ = 1 << 0  # Просмотр и поиск пользователей
+    AUDIT_READ = 1 << 1  # Поиск по журналу событий аутентификации
+    MONITORING_READ = 1 << 2  # Просмотр состояния компонентов (/monitoring/*)
+    BROADCASTS_MANAGE = 1 << 3  # Создание и управление email-рассылками
+
+
+# Фиксированная карта прав для ролей из UserRole (в таблице roles хранится только название роли).
+# Роли, отсутствующие в словаре, не имеют дополнительных прав.
+ROLE_PERMISSIONS: dict[str, Permission] = {
+    UserRole.USER.value: Permission(0),
+    UserRole.ADMIN.value: Permission.USERS_READ
+    | Permission.AUDIT_READ
+    | Permission.MONITORING_READ
+    | Permission.BROADCASTS_MANAGE,
+}
+
+
+def permissions_for_role(role_title: str) -> Permission:
+    """
+    Возвращает битовую маску прав роли.
+
+    Args:
+        role_title: Название роли.
+
+    Returns:
+        Маска прав роли (пустая для неизвестной роли).
+    """
+    return ROLE_PERMISSIONS.get(role_title, Permission(0))
@@ -1,16 +1,25 @@
-from fastapi import Depends, Request
+import hmac
+import operator
+from functools import reduce
+from typing import Callable, Optional
 
-from src.models import User
-from src.auth.constants import UserRole
+from fastapi import Depends, Header, Request
+
+from src.auth.constants import Permission, TokenUse, UserRole
+from src.auth.principal import Principal
 from src.auth.services import UserRepository
 from src.auth.utils.jwt_handler import jwt_handler
+from src.config import settings
 from src.exceptions import (
-    UserNotFoundException,
-    UserHasNoRightsException,
-    InvalidAccessTokenException,
     AccessTokenNotFoundException,
+    IntrospectionNotAllowedException,
+    InvalidAccessTokenException,
     RefreshTokenNotFoundException,
+    UserHasNoRightsException,
+    UserNotFoundException,
 )
+from src.models import User
+from src.users.utils.activity_tracker import activity_tracker
 
 
 async def get_access_token(request: Request) -> str:
@@ -51,21 +60,20 @@ async def get_refresh_token(request: Request) -> str:
     return refresh_token
 
 
-async def get_current_user(token: str = Depends(get_access_token)) -> User:
+async def get_token_subject(token: str = Depends(get_access_token)) -> str:
     """
-    Получает текущего пользователя на основе access-токена.
+    Проверяет access-токен и извлекает из него email пользователя.
 
     Args:
         token: Access-токен, полученный из зависимости get_access_token.
 
     Returns:
-        Экземпляр модели User, соответствующий пользователю.
+        Email пользователя из поля sub.
 
     Raises:
         InvalidAccessTokenException: Если токен недействителен или не содержит email.
-        UserNotFoundException: Если пользователь с указанным email не найден.
     """
-    payload = await jwt_handler.decode_token(token)
+    payload = await jwt_handler.decode_token(token, TokenUse.ACCESS)
     if not payload:
         raise InvalidAccessTokenException
 
@@ -73,14 +81,58 @@ async def get_current_user(token: str = Depends(get_access_token)) -> User:
     if not email:
         raise InvalidAccessTokenException
 
-    user = await UserRepository.find_one_or_none(email=email)
+    return email
+
+
+async def get_current_user(email: str = Depends(get_token_subject)) -> Principal:
+    """
+    Получает текущего пользователя на основе access-токена и отмечает его активность.
+
+    Args:
+        email: Email пользователя, полученный из зависимости get_token_subject.
+
+    Returns:
+        Экземпляр Principal (id, email, роль, подтверждение email, блокировка) без загрузки полной модели User.
+
+    Raises:
+        UserNotFoundException: Если пользователь с указанным email не найден.
+    """
+    user = await UserRepository.find_principal_by_email(email)
     if not user:
         raise UserNotFoundException(email)
 
+    activity_tracker.touch(user.id)
+
     return user
 
 
-async def get_current_admin_user(user: User = Depends(get_current_user)) -> User:
+async def get_current_user_model(email: str = Depends(get_token_subject)) -> User:
+    """
+    Получает полную модель текущего пользователя на основе access-токена и отмечает его активность.
+
+    Args:
+        email: Email пользователя, полученный из зависимости get_token_subject.
+
+    Returns:
+        Экземпляр модели User, соответствующий пользователю.
+
+    Raises:
+        UserNotFoundException: Если пользователь с указанным email не найден.
+
+    Notes:
+        Используется только там, где нужны все поля пользователя (например, /users/me);
+        для проверки доступа достаточно get_current_user.
+    """
+    user = await UserRepository.find_by_email(email)
+    if not user:
+        raise UserNotFoundException(email)
+
+    activity_tracker.touch(user.id)
+
+    return user
+
+
+async def get_current_admin_user(user: Principal = Depends(get_current_user)) -> Principal:
     """
     Проверяет, является ли текущий пользователь администратором.
 
@@ -88,11 +140,53 @@ async def get_current_admin_user(user: User = Depends(get_current_user)) -> User
         user: Пользователь, полученный из зависимости get_current_user.
 
     Returns:
-        Экземпляр модели User, если пользователь имеет роль администратора.
+        Экземпляр Principal, если пользователь имеет роль администратора.
 
     Raises:
         UserHasNoRightsException: Если пользователь не имеет роли администратора.
     """
     if user.role_title != UserRole.ADMIN.value:
         raise UserHasNoRightsException
-    return user
\ No newline at end of file
+    return user
+
+
+def require_permissions(*permissions: Permission) -> Callable:
+    """
+    Создаёт зависимость, проверяющую наличие у текущего пользователя всех указанных прав.
+
+    Args:
+        *permissions: Требуемые права.
+
+    Returns:
+        Зависимость FastAPI, возвращающая экземпляр Principal, если права есть.
+
+    Raises:
+        UserHasNoRightsException: Если у пользователя нет хотя бы одного из прав (при вызове зависимости).
+
+    Notes:
+        Требуемая маска вычисляется один раз при создании зависимости, а проверка — одна операция побитового И.
+    """
+    required = reduce(operator.or_, permissions, Permission(0))
+
+    async def check_permissions(user: Principal = Depends(get_current_user)) -> Principal:
+        if user.permissions & required != required:
+            raise UserHasNoRightsException
+        return user
+
+    return check_permissions
+
+
+async def verify_introspection_secret(x_introspection_secret: Optional[str] = Header(default=None)) -> None:
+    """
+    Проверяет общий секрет шлюза для доступа к интроспекции токенов.
+
+    Args:
+        x_introspection_secret: Значение заголовка X-Introspection-Secret.
+
+    Raises:
+        IntrospectionNotAllowedException: Если INTROSPECTION_SECRET не задан или секрет не совпадает.
+    """
+    if not settings.INTROSPECTION_SECRET or not x_introspection_secret:
+        raise IntrospectionNotAllowedException
+    if not hmac.compare_digest(x_introspection_secret.encode("utf-8"), settings.INTROSPECTION_SECRET.encode("utf-8")):
+        raise IntrospectionNotAllowedException
@@ -0,0 +1,91 @@
+import time
+
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.auth.constants import TokenUse, permissions_for_role
+from src.auth.utils.cookie_handler import cookie_handler
+from src.auth.utils.jwt_handler import jwt_handler
+from src.config import settings
+from src.exceptions import ProjectException
+from src.logs.logger import logger
+
+
+class SlidingRenewalMiddleware:
+    """
+    ASGI-middleware для скользящего продления access-токена.
+
+    Если действительный access-токен из cookies истекает менее чем через `window` минут, в ответ на тот же запрос
+    добавляется cookie с новым access-токеном. Активные клиенты продолжают работу без отдельного запроса
+    /auth/refresh (проверка токена, поиск и отзыв refresh-токена, две подписи).
+
+    Токен продлевается, только если refresh-токен из cookies соответствует активной сессии того же пользователя,
+    поэтому после выхода из системы (в том числе на всех устройствах) продление прекращается. Запросы, ответ на
+    которые сам устанавливает или удаляет access-токен (вход, обновление, выход), не изменяются. Новый токен
+    добавляется только в успешные ответы (2xx и 3xx): отказ в доступе или ошибка не выдают новые учётные данные.
+
+    Реализовано как «чистое» ASGI-middleware, без буферизации тела ответа.
+    """
+
+    def __init__(self, app: ASGIApp, window: int = settings.JWT_SLIDING_RENEWAL_WINDOW):
+        self.app = app
+        self.window = window * 60
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        access_token = await self._renew(HTTPConnection(scope).cookies)
+        if access_token is None:
+            await self.app(scope, receive, send)
+            return
+
+        response = Response()
+        cookie_handler.set_access_token(response, access_token)
+        cookie_header = next(value for key, value in response.raw_headers if key == b"set-cookie")
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                headers = message.setdefault("headers", [])
+                if not any(key == b"set-cookie" and value.startswith(b"access_token=") for key, value in headers):
+                    headers.append((b"set-cookie", cookie_header))
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+    async def _renew(self, cookies: dict[str, str]) -> str | None:
+        """
+        Выпускает новый access-токен, если текущий скоро истечёт, а сессия пользователя активна.
+
+        Args:
+            cookies: Cookies запроса.
+
+        Returns:
+            Новый access-токен или None, если продление не требуется или невозможно.
+        """
+        access_token = cookies.get("access_token")
+        refresh_token = cookies.get("refresh_token")
+        if not access_token or not refresh_token:
+            return None
+
+        try:
+            payload = await jwt_handler.decode_token(access_token, TokenUse.ACCESS)
+            email = payload.get("sub")
+            if not email or payload["exp"] - time.time() > self.window:
+                return None
+
+            session = await jwt_handler.find_refresh_token(refresh_token)
+            if not session or session.revoked or session.user.email != email:
+                return None
+
+            return await jwt_handler.create_access_token(
+                subject=email, permissions=permissions_for_role(session.user.role_title)
+            )
+        except ProjectException:
+            # Недействительный или истёкший токен: запрос обрабатывается без продления
+            return None
+        except Exception as e:
+            logger.error(f"Ошибка при продлении access-токена: {type(e).__name__}: {e}")
+            return None
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+from src.auth.constants import Permission
+
+
+@dataclass(slots=True, frozen=True)
+class Principal:
+    """
+    Аутентифицированный пользователь в объёме, необходимом для проверки доступа.
+
+    Заполняется из узкой выборки столбцов таблицы users (без пароля, токенов и персональных данных)
+    и не привязан к сессии SQLAlchemy. Полная модель User загружается только там, где она нужна.
+    Маска прав вычисляется по роли при создании, поэтому проверка прав не обращается к базе данных.
+    """
+
+    id: int
+    email: str
+    role_title: str
+    email_confirmed: bool
+    ban: bool
+    permissions: Permission = Permission(0)
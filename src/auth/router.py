@@ -1,43 +1,69 @@
-from uuid import uuid4
-from urllib.parse import quote
 from datetime import datetime, timedelta
+from urllib.parse import quote
+from uuid import uuid4
 
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
 from fastapi.responses import JSONResponse
-from fastapi import APIRouter, BackgroundTasks, Depends, status, Request
 
-from src.config import settings
-from src.logs.logger import logger
-from src.limits.limiter import limiter
-from src.auth.constants import UserRole
-from src.auth.utils.jwt_handler import jwt_handler
+from src.audit.constants import AuthEventType
+from src.audit.writer import audit_writer
+from src.auth.constants import TokenUse, UserRole, permissions_for_role
+from src.auth.dependencies import get_current_admin_user, get_current_user, get_refresh_token, verify_introspection_secret
+from src.auth.principal import Principal
+from src.auth.schemas.requests import (
+    ForgotPasswordRequest,
+    IntrospectRequest,
+    ResetPasswordRequest,
+    UserCreateRequest,
+    UserLoginRequest,
+)
+from src.auth.schemas.responses import (
+    AuthResponse,
+    IntrospectResponse,
+    MessageResponse,
+    RefreshTokenResponse,
+    TokenIntrospectionResponse,
+)
+from src.auth.services import RefreshTokenRepository, UserRepository
 from src.auth.utils.cookie_handler import cookie_handler
-from src.auth.utils.password_validator import validator
+from src.auth.utils.jwt_handler import jwt_handler
 from src.auth.utils.password_handler import password_handler
-from src.auth.services import RefreshTokenRepository, UserRepository
+from src.auth.utils.password_validator import validator
+from src.auth.utils.refresh_grace import RotatedTokens, refresh_grace
+from src.auth.utils.token_hasher import token_hasher
+from src.config import settings
 from src.email.utils.email_handler import email_handler
-from src.auth.dependencies import get_current_admin_user, get_refresh_token
-from src.auth.schemas.responses import MessageResponse, AuthResponse, RefreshTokenResponse
-from src.auth.schemas.requests import UserCreateRequest, UserLoginRequest, ForgotPasswordRequest, ResetPasswordRequest
 from src.exceptions import (
-    UserAlreadyExistsException,
-    InvalidCredentialsException,
-    InvalidRefreshTokenException,
+    AccountTemporarilyLockedException,
+    ExpiredTokenException,
     InternalServerErrorException,
-    RefreshTokenNotFoundException,
-    PasswordValidationErrorException,
+    InvalidCredentialsException,
     InvalidPasswordResetTokenException,
+    InvalidRefreshTokenException,
+    InvalidTokenException,
     PasswordIdenticalToPreviousException,
+    PasswordValidationErrorException,
+    RefreshTokenNotFoundException,
+    UserAlreadyExistsException,
 )
-
+from src.idempotency import idempotent
+from src.limits.admission import login_admission, register_admission, reset_password_admission
+from src.limits.limiter import limiter
+from src.limits.lockout import login_lockout
+from src.logs.logger import logger
 
 router = APIRouter(prefix="/auth", tags=["Модуль авторизации пользователей"])
 
 
 @router.post("/register", response_model=MessageResponse, status_code=status.HTTP_201_CREATED)
+@idempotent
 @limiter.limit("2/minute")
-async def user_registration(request: Request, user_data: UserCreateRequest, background_tasks: BackgroundTasks) -> MessageResponse:
+async def user_registration(
+    request: Request, user_data: UserCreateRequest, background_tasks: BackgroundTasks
+) -> MessageResponse:
     """
-    Регистрирует нового пользователя и отправляет письмо для подтверждения email (если ENABLE_EMAIL_CONFIRMATION включено в .env).
+    Регистрирует нового пользователя и отправляет письмо для подтверждения email
+    (если ENABLE_EMAIL_CONFIRMATION включено в .env).
 
     Args:
         request: HTTP-запрос для контекста лимитера.
@@ -45,34 +71,35 @@ async def user_registration(request: Request, user_data: UserCreateRequest, back
         background_tasks: Объект для выполнения фоновой задачи отправки email.
 
     Returns:
-        Сообщение об успешной регистрации с указанием на необходимость подтверждения email (если ENABLE_EMAIL_CONFIRMATION включено в .env).
+        Сообщение об успешной регистрации с указанием на необходимость подтверждения email
+        (если ENABLE_EMAIL_CONFIRMATION включено в .env).
 
     Raises:
         UserAlreadyExistsException: Если пользователь с указанным email уже существует.
         PasswordValidationErrorException: Если пароль не соответствует требованиям валидации.
+        ServiceOverloadedException: Если превышен лимит одновременных хеширований паролей.
         InternalServerErrorException: Если произошла ошибка при создании пользователя.
     """
-    check_user_existing = await UserRepository.find_one_or_none(email=user_data.email)
-    if check_user_existing:
-        raise UserAlreadyExistsException(user_data.email)
-
     validation_result = validator.validate(password=user_data.password, email=user_data.email)
     if validation_result is not True:
         raise PasswordValidationErrorException(validation_result)
 
-    hashed_password = password_handler.hash_password(user_data.password) 
+    hashed_password = await register_admission.run(password_handler.hash_password, user_data.password)
 
     email_confirmed = True
     confirmation_token = None
+    confirmation_token_hash = None
     confirmation_token_created_at = None
 
     if settings.ENABLE_EMAIL_CONFIRMATION:
         email_confirmed = False
         confirmation_token = str(uuid4())
+        confirmation_token_hash = token_hasher.hash_token(confirmation_token)
         confirmation_token_created_at = datetime.now()
 
     try:
-        await UserRepository.add(
+        user = await UserRepository.add_if_absent(
+            ("email",),
             email=user_data.email,
             password=hashed_password,
             first_name=user_data.first_name,
@@ -82,30 +109,28 @@ async def user_registration(request: Request, user_data: UserCreateRequest, back
             birthday=user_data.birthday,
             role_title=UserRole.USER.value,
             email_confirmed=email_confirmed,
-            confirmation_token=confirmation_token,
+            confirmation_token_hash=confirmation_token_hash,
             confirmation_token_created_at=confirmation_token_created_at,
         )
     except Exception as e:
         logger.error(f"Ошибка при создании пользователя: {type(e).__name__}: {e}")
         raise InternalServerErrorException("Не удалось создать пользователя")
 
+    if not user:
+        raise UserAlreadyExistsException(user_data.email)
+
     logger.info(f"Пользователь успешно зарегистрирован: {user_data.email}")
+    audit_writer.record(AuthEventType.REGISTER, request, email=user.email, user_id=user.id)
 
     message = f"Пользователь '{user_data.email}' создан успешно"
 
     if settings.ENABLE_EMAIL_CONFIRMATION:
+
         async def send_confirmation_email(email: str, token: str):
             try:
                 link = f"{settings.FRONTEND_URL}/email/confirm?email={quote(email)}&token={token}"
-                html_content = email_handler.render_template(
-                    "confirm_email.html",
-                    {"confirmation_link": link}
-                )
-                await email_handler.send_email(
-                    to=email,
-                    subject="Подтверждение регистрации",
-                    html_content=html_content
-                )
+                html_content = email_handler.render_template("confirm_email.html", {"confirmation_link": link})
+                await email_handler.send_email(to=email, subject="Подтверждение регистрации", html_content=html_content)
             except Exception as e:
                 logger.error(f"Ошибка при отправке письма подтверждения для {email}: {type(e).__name__}: {e}")
 
@@ -131,17 +156,35 @@ async def user_login(request: Request, user_data: UserLoginRequest) -> AuthRespo
 
     Raises:
         InvalidCredentialsException: Если email или пароль неверны.
+        AccountTemporarilyLockedException: Если вход временно заблокирован после серии неудачных попыток.
+        ServiceOverloadedException: Если превышен лимит одновременных проверок паролей.
+
+    Notes:
+        Блокировка проверяется до поиска пользователя и проверки пароля, поэтому подбор пароля
+        к заблокированной учётной записи не расходует CPU на bcrypt.
     """
-    user = await UserRepository.find_one_or_none(email=user_data.email)
-    if not user or not password_handler.verify_password(user_data.password, user.password):
+    try:
+        await login_lockout.check(user_data.email)
+    except AccountTemporarilyLockedException:
+        audit_writer.record(AuthEventType.LOGIN_FAILED, request, email=user_data.email, success=False)
+        raise
+
+    user = await UserRepository.find_by_email(user_data.email)
+    if not user or not await login_admission.run(password_handler.verify_password, user_data.password, user.password):
+        await login_lockout.register_failure(user_data.email)
+        audit_writer.record(
+            AuthEventType.LOGIN_FAILED, request, email=user_data.email, user_id=user.id if user else None, success=False
+        )
         raise InvalidCredentialsException
 
-    access_token = await jwt_handler.create_access_token(subject=user.email)
-    refresh_token = await jwt_handler.create_refresh_token(subject=user.email)
+    await login_lockout.reset(user_data.email)
+    audit_writer.record(AuthEventType.LOGIN, request, email=user.email, user_id=user.id)
+
+    access_token = await jwt_handler.create_access_token(subject=user.email, permissions=permissions_for_role(user.role_title))
+    refresh_token = await jwt_handler.create_refresh_token(subject=user.email, user_id=user.id)
 
     response = JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content=AuthResponse(message="Успешный вход", user=user.email).dict()
+        status_code=status.HTTP_200_OK, content=AuthResponse(message="Успешный вход", user=user.email).dict()
     )
 
     cookie_handler.set_auth_tokens(response, access_token, refresh_token)
@@ -150,11 +193,12 @@ async def user_login(request: Request, user_data: UserLoginRequest) -> AuthRespo
 
 
 @router.post("/logout", response_model=MessageResponse, status_code=status.HTTP_200_OK)
-async def logout(refresh_token: str = Depends(get_refresh_token)) -> MessageResponse:
+async def logout(request: Request, refresh_token: str = Depends(get_refresh_token)) -> MessageResponse:
     """
     Выполняет выход пользователя, отзывая refresh-токен и удаляя cookies.
 
     Args:
+        request: HTTP-запрос для журнала событий.
         refresh_token: Refresh-токен, полученный из зависимости.
 
     Returns:
@@ -167,19 +211,70 @@ async def logout(refresh_token: str = Depends(get_refresh_token)) -> MessageResp
     if not refresh_token:
         raise RefreshTokenNotFoundException
 
-    payload = await jwt_handler.decode_token(refresh_token)
-    jti = payload.get("jti")
-    email = payload.get("sub")
-    if not jti or not email:
-        raise InvalidRefreshTokenException
+    if jwt_handler.is_opaque_token(refresh_token):
+        refresh_token_check = await RefreshTokenRepository.revoke_by_token_hash(
+            token_hash=token_hasher.hash_token(refresh_token),
+            revoked=datetime.now(),
+        )
+        if not refresh_token_check:
+            logger.error("Не найден непрозрачный Refresh-токен")
+        audit_writer.record(
+            AuthEventType.LOGOUT,
+            request,
+            user_id=refresh_token_check.user_id if refresh_token_check else None,
+            success=bool(refresh_token_check),
+        )
+    else:
+        payload = await jwt_handler.decode_token(refresh_token)
+        jti = jwt_handler.parse_jti(payload)
+        email = payload.get("sub")
+        if not jti or not email:
+            raise InvalidRefreshTokenException
+
+        refresh_token_check = await RefreshTokenRepository.revoke(jti=jti, revoked=datetime.now())
+        if not refresh_token_check:
+            logger.error(f"Не найден Refresh-токен {jti} для пользователя {email}")
+        audit_writer.record(
+            AuthEventType.LOGOUT,
+            request,
+            email=email,
+            user_id=refresh_token_check.user_id if refresh_token_check else None,
+            success=bool(refresh_token_check),
+        )
 
-    refresh_token_check = await RefreshTokenRepository.revoke(jti=jti, revoked=datetime.now())
-    if not refresh_token_check:
-        logger.error(f"Не найден Refresh-токен {jti} для пользователя {email}")
+    if refresh_token_check:
+        refresh_grace.discard(refresh_token_check.user_id)
+
+    response = JSONResponse(status_code=status.HTTP_200_OK, content=MessageResponse(message="Выход выполнен").dict())
+    response.delete_cookie("access_token")
+    response.delete_cookie("refresh_token")
+
+    return response
+
+
+@router.post("/logout-all", response_model=MessageResponse, status_code=status.HTTP_200_OK)
+async def logout_all(request: Request, user: Principal = Depends(get_current_user)) -> MessageResponse:
+    """
+    Выполняет выход пользователя на всех устройствах, отзывая все его активные refresh-токены одним запросом.
+
+    Args:
+        request: HTTP-запрос для журнала событий.
+        user: Текущий пользователь, полученный через зависимость.
+
+    Returns:
+        Сообщение об успешном выходе с количеством завершённых сессий.
+
+    Raises:
+        AccessTokenNotFoundException: Если access-токен отсутствует.
+        InvalidAccessTokenException: Если access-токен недействителен.
+    """
+    revoked_count = await RefreshTokenRepository.revoke_all(user_id=user.id, revoked=datetime.now())
+    refresh_grace.discard(user.id)
+    audit_writer.record(AuthEventType.LOGOUT_ALL, request, email=user.email, user_id=user.id)
 
     response = JSONResponse(
         status_code=status.HTTP_200_OK,
-        content=MessageResponse(message="Выход выполнен").dict()
+        content=MessageResponse(message=f"Выход выполнен на всех устройствах (завершено сессий: {revoked_count})").dict(),
     )
     response.delete_cookie("access_token")
     response.delete_cookie("refresh_token")
@@ -203,38 +298,114 @@ async def refresh_token(request: Request, refresh_token: str = Depends(get_refre
     Raises:
         RefreshTokenNotFoundException: Если refresh-токен отсутствует.
         InvalidRefreshTokenException: Если refresh-токен недействителен, отозван или истёк.
+
+    Notes:
+        Одновременные обновления одним refresh-токеном (несколько вкладок браузера) выполняют одну ротацию,
+        а обновления отозванным токеном в течение JWT_REFRESH_GRACE_PERIOD секунд после ротации
+        получают ту же новую пару токенов (см. RefreshGrace).
     """
     if not refresh_token:
         raise RefreshTokenNotFoundException
 
-    payload = await jwt_handler.decode_token(refresh_token)
-    jti = payload.get("jti")
-    email = payload.get("sub")
-    if not jti or not email:
+    token = await jwt_handler.find_refresh_token(refresh_token)
+    if not token or datetime.now() - token.created_at > timedelta(days=30):
+        audit_writer.record(AuthEventType.REFRESH_FAILED, request, user_id=token.user_id if token else None, success=False)
         raise InvalidRefreshTokenException
 
-    token = await RefreshTokenRepository.find_one_or_none(jti=jti)
-    if not token or token.revoked or datetime.now() - token.created_at > timedelta(days=30):
-        raise InvalidRefreshTokenException
+    jti = token.jti
+    email = token.user.email
 
-    refresh_token_check = await RefreshTokenRepository.revoke(jti=jti, revoked=datetime.now())
-    if not refresh_token_check:
-        logger.error(f"Не найден Refresh-токен {jti} для пользователя {email}")
+    async def rotate() -> RotatedTokens:
+        if not await RefreshTokenRepository.revoke(jti=jti, revoked=datetime.now()):
+            # Токен уже отозван: ротация выполнена в другом воркере или пользователь вышел из системы
+            raise InvalidRefreshTokenException
+        new_access_token = await jwt_handler.create_access_token(
+            subject=email, permissions=permissions_for_role(token.user.role_title)
+        )
+        new_refresh_token = await jwt_handler.create_refresh_token(subject=email, user_id=token.user_id)
+        return RotatedTokens(token.user_id, email, new_access_token, new_refresh_token)
 
-    new_access_token = await jwt_handler.create_access_token(subject=email)
-    new_refresh_token = await jwt_handler.create_refresh_token(subject=email)
+    try:
+        tokens = await refresh_grace.get(jti) if token.revoked else await refresh_grace.rotate(jti, rotate)
+    except InvalidRefreshTokenException:
+        tokens = None
+    if not tokens:
+        audit_writer.record(AuthEventType.REFRESH_FAILED, request, email=email, user_id=token.user_id, success=False)
+        raise InvalidRefreshTokenException
+
+    audit_writer.record(AuthEventType.REFRESH, request, email=email, user_id=token.user_id)
 
     response = JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content=RefreshTokenResponse(message="Токены обновлены", user=email).dict()
+        status_code=status.HTTP_200_OK, content=RefreshTokenResponse(message="Токены обновлены", user=email).dict()
     )
 
-    cookie_handler.set_auth_tokens(response, new_access_token, new_refresh_token)
+    cookie_handler.set_auth_tokens(response, tokens.access_token, tokens.refresh_token)
 
     return response
 
 
+@router.post(
+    "/introspect",
+    response_model=IntrospectResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(verify_introspection_secret)],
+)
+async def introspect_tokens(data: IntrospectRequest) -> IntrospectResponse:
+    """
+    Проверяет пакет токенов для API-шлюзов и возвращает их состояние и claims.
+
+    Args:
+        data: Данные запроса, содержащие список токенов.
+
+    Returns:
+        Результаты в порядке переданных токенов. Токен активен, если это access-токен (claim "token_use")
+        с корректными подписью и сроком действия, а пользователь существует и не заблокирован.
+
+    Raises:
+        IntrospectionNotAllowedException: Если секрет шлюза (X-Introspection-Secret) не передан или неверен.
+
+    Notes:
+        Подписи проверяются через кеш JWTHandler.decode_token, а состояние всех пользователей пакета
+        загружается одним запросом `WHERE email IN (...)`.
+    """
+    payloads = []
+    for token in data.tokens:
+        try:
+            payload = await jwt_handler.decode_token(token)
+        except (InvalidTokenException, ExpiredTokenException):
+            payload = None
+        # Refresh-токены и токены сброса пароля не являются учётными данными для доступа к API
+        payloads.append(payload if payload and payload.get("token_use") == TokenUse.ACCESS.value else None)
+
+    users = await UserRepository.find_states_by_emails(
+        [payload["sub"] for payload in payloads if payload and payload.get("sub")]
+    )
+
+    results = []
+    for payload in payloads:
+        user = users.get(payload.get("sub")) if payload else None
+        if not user or user.ban:
+            results.append(TokenIntrospectionResponse(active=False))
+            continue
+        results.append(
+            TokenIntrospectionResponse(
+                active=True,
+                sub=user.email,
+                jti=payload.get("jti"),
+                iat=payload.get("iat"),
+                exp=payload.get("exp"),
+                user_id=user.id,
+                role_title=user.role_title,
+                email_confirmed=user.email_confirmed,
+                permissions=permissions_for_role(user.role_title),
+            )
+        )
+
+    return IntrospectResponse(results=results)
+
+
 @router.post("/forgot-password", response_model=MessageResponse, status_code=status.HTTP_200_OK)
+@idempotent
 @limiter.limit("2/minute")
 async def forgot_password(request: Request, data: ForgotPasswordRequest, background_tasks: BackgroundTasks) -> MessageResponse:
     """
@@ -251,14 +422,17 @@ async def forgot_password(request: Request, data: ForgotPasswordRequest, backgro
     Notes:
         Для безопасности возвращает одинаковое сообщение независимо от существования пользователя.
     """
-    user = await UserRepository.find_one_or_none(email=data.email)
+    user = await UserRepository.find_by_email(data.email)
+    audit_writer.record(
+        AuthEventType.PASSWORD_RESET_REQUESTED, request, email=data.email, user_id=user.id if user else None, success=bool(user)
+    )
     if user:
         password_reset_token = await jwt_handler.create_reset_token(subject=user.email)
 
         await UserRepository.update(
             id=user.id,
-            password_reset_token=password_reset_token,
-            password_reset_token_created_at=datetime.now()
+            password_reset_token_hash=token_hasher.hash_token(password_reset_token),
+            password_reset_token_created_at=datetime.now(),
         )
 
         async def send_password_reset_email(email: str, token: str):
@@ -274,17 +448,16 @@ async def forgot_password(request: Request, data: ForgotPasswordRequest, backgro
             """
             try:
                 link = f"{settings.FRONTEND_URL}/reset-password?token={token}"
-                html_content = email_handler.render_template(
-                    "reset_password.html",
-                    {"reset_link": link}
-                )
+                html_content = email_handler.render_template("reset_password.html", {"reset_link": link})
                 await email_handler.send_email(to=email, subject="Сброс пароля", html_content=html_content)
             except Exception as e:
                 logger.error(f"Ошибка при отправке письма подтверждения для {email}: {type(e).__name__}: {e}")
 
         background_tasks.add_task(send_password_reset_email, user.email, password_reset_token)
 
-    return MessageResponse(message="Если пользователь существует, на его email отправлено письмо с инструкцией по сбросу пароля")
+    return MessageResponse(
+        message="Если пользователь существует, на его email отправлено письмо с инструкцией по сбросу пароля"
+    )
 
 
 @router.post("/reset-password", response_model=MessageResponse, status_code=status.HTTP_200_OK)
@@ -304,25 +477,30 @@ async def reset_password(request: Request, data: ResetPasswordRequest) -> Messag
         InvalidPasswordResetTokenException: Если токен сброса недействителен или пользователь не найден.
         PasswordIdenticalToPreviousException: Если новый пароль совпадает со старым.
         PasswordValidationErrorException: Если новый пароль не соответствует требованиям валидации.
+        ServiceOverloadedException: Если превышен лимит одновременных операций с паролями.
     """
     payload = await jwt_handler.decode_token(data.token)
     email = payload.get("sub")
     if not email:
         raise InvalidPasswordResetTokenException
 
-    user = await UserRepository.find_one_or_none(email=email, password_reset_token=data.token)
+    user = await UserRepository.find_one_or_none(email=email, password_reset_token_hash=token_hasher.hash_token(data.token))
     if not user:
+        audit_writer.record(AuthEventType.PASSWORD_RESET_FAILED, request, email=email, success=False)
         raise InvalidPasswordResetTokenException
 
-    if password_handler.verify_password(data.new_password, user.password):
+    if await reset_password_admission.run(password_handler.verify_password, data.new_password, user.password):
         raise PasswordIdenticalToPreviousException
 
     validation_result = validator.validate(password=data.new_password, email=user.email)
     if validation_result is not True:
         raise PasswordValidationErrorException(validation_result)
 
-    new_hashed = password_handler.hash_password(data.new_password)
-    await UserRepository.update(id=user.id, password=new_hashed, password_reset_token=None, password_reset_token_created_at=None)
+    new_hashed = await reset_password_admission.run(password_handler.hash_password, data.new_password)
+    await UserRepository.update(
+        id=user.id, password=new_hashed, password_reset_token_hash=None, password_reset_token_created_at=None
+    )
+    audit_writer.record(AuthEventType.PASSWORD_RESET, request, email=user.email, user_id=user.id)
 
     return MessageResponse(message="Пароль успешно изменён")
 
@@ -338,4 +516,4 @@ async def check_admin(user=Depends(get_current_admin_user)):
     Returns:
         Данные текущего пользователя, если он администратор.
     """
-    return user
\ No newline at end of file
+    return user
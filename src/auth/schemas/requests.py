@@ -1,6 +1,10 @@
 from datetime import date
+from typing import List
+
 from pydantic import BaseModel, EmailStr, Field
 
+from src.config import settings
+
 
 class UserBaseRequest(BaseModel):
     email: EmailStr
@@ -26,3 +30,7 @@ class ForgotPasswordRequest(BaseModel):
 class ResetPasswordRequest(BaseModel):
     token: str
     new_password: str
+
+
+class IntrospectRequest(BaseModel):
+    tokens: List[str] = Field(min_length=1, max_length=settings.INTROSPECTION_MAX_TOKENS)
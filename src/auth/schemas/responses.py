@@ -1,3 +1,5 @@
+from typing import List, Optional
+
 from pydantic import BaseModel, EmailStr
 
 
@@ -11,4 +13,19 @@ class AuthResponse(MessageResponse):
 
 class RefreshTokenResponse(MessageResponse):
     user: EmailStr
-    
\ No newline at end of file
+
+
+class TokenIntrospectionResponse(BaseModel):
+    active: bool
+    sub: Optional[EmailStr] = None
+    jti: Optional[str] = None
+    iat: Optional[int] = None
+    exp: Optional[int] = None
+    user_id: Optional[int] = None
+    role_title: Optional[str] = None
+    email_confirmed: Optional[bool] = None
+    permissions: Optional[int] = None
+
+
+class IntrospectResponse(BaseModel):
+    results: List[TokenIntrospectionResponse]
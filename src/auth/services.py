@@ -1,26 +1,416 @@
+from datetime import datetime, timedelta
+from typing import Any, List, Optional
 from uuid import UUID
-from datetime import datetime
 
-from sqlalchemy import update
+from sqlalchemy import bindparam, case, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
 
+from src.auth.constants import permissions_for_role
+from src.auth.principal import Principal
+from src.database import is_primary_read_required
+from src.models import RefreshToken, User
 from src.services import BaseRepository
-from src.models import User, RefreshToken
-from src.database import get_async_session
+from src.single_flight import SingleFlight
+
+# Группы объединения одновременных поисков пользователя по email (запросы SPA с одними и теми же cookies)
+find_by_email_flight = SingleFlight("users.find_by_email")
+find_principal_flight = SingleFlight("users.find_principal_by_email")
+
+single_flight_groups = (find_by_email_flight, find_principal_flight)
 
 
 class UserRepository(BaseRepository[User]):
     """
     Репозиторий для выполнения CRUD-операций с моделью User.
     """
+
     model = User
 
+    # Максимальное количество пользователей в одном пакетном UPDATE
+    ACTIVITY_BATCH_SIZE = 500
+
+    # Заранее построенные запросы для частых поисков: ключ кеша компиляции SQLAlchemy вычисляется один раз
+    _find_by_email_query = select(User).where(User.email == bindparam("email"))
+    _find_principal_by_email_query = select(User.id, User.email, User.role_title, User.email_confirmed, User.ban).where(
+        User.email == bindparam("email")
+    )
+    _find_states_by_emails_query = select(User.email, User.id, User.role_title, User.ban, User.email_confirmed).where(
+        User.email.in_(bindparam("emails", expanding=True))
+    )
+
+    @classmethod
+    async def find_by_email(cls, email: str) -> Optional[User]:
+        """
+        Находит пользователя по email с использованием заранее построенного запроса.
+
+        Args:
+            email: Email пользователя.
+
+        Returns:
+            Экземпляр User, если пользователь найден, иначе None.
+
+        Notes:
+            Одновременные поиски одного email объединяются в один запрос (find_by_email_flight),
+            поэтому возвращённый экземпляр может быть общим и не должен изменяться.
+            Если в контексте требуется чтение с основной базы (read-your-writes), запрос не объединяется.
+        """
+
+        async def query() -> Optional[User]:
+            result = await cls._execute_read(cls._find_by_email_query, {"email": email})
+            return result.scalar_one_or_none()
+
+        if is_primary_read_required():
+            return await query()
+        return await find_by_email_flight.do(email, query)
+
+    @classmethod
+    async def find_principal_by_email(cls, email: str) -> Optional[Principal]:
+        """
+        Находит пользователя по email, загружая только поля, необходимые для проверки доступа.
+
+        Args:
+            email: Email пользователя.
+
+        Returns:
+            Экземпляр Principal, если пользователь найден, иначе None.
+
+        Notes:
+            Одновременные поиски одного email объединяются в один запрос (find_principal_flight).
+            Если в контексте требуется чтение с основной базы (read-your-writes), запрос не объединяется.
+        """
+
+        async def query() -> Optional[Principal]:
+            result = await cls._execute_read(cls._find_principal_by_email_query, {"email": email})
+            row = result.first()
+            return Principal(*row, permissions_for_role(row.role_title)) if row else None
+
+        if is_primary_read_required():
+            return await query()
+        return await find_principal_flight.do(email, query)
+
+    @classmethod
+    async def find_states_by_emails(cls, emails: List[str]) -> dict[str, Any]:
+        """
+        Находит состояние нескольких пользователей (id, роль, блокировка, подтверждение email)
+        одним запросом `SELECT ... WHERE email IN (...)` без загрузки полных моделей.
+
+        Args:
+            emails: Список email пользователей.
+
+        Returns:
+            Словарь, сопоставляющий email и строку с полями email, id, role_title, ban, email_confirmed.
+            Email, для которых пользователь не найден, в словаре отсутствуют.
+        """
+        if not emails:
+            return {}
+        result = await cls._execute_read(cls._find_states_by_emails_query, {"emails": list(set(emails))})
+        return {row.email: row for row in result.all()}
+
+    @classmethod
+    async def find_broadcast_recipients(cls, after_id: int, limit: int, role_title: Optional[str] = None) -> List[Any]:
+        """
+        Находит очередную страницу получателей рассылки: пользователей с подтверждённым email и без блокировки.
+
+        Args:
+            after_id: Идентификатор последнего получателя предыдущей страницы (0 — с начала).
+            limit: Максимальное количество получателей на странице.
+            role_title: Название роли получателей (None — все роли).
+
+        Returns:
+            Список строк с полями id и email, упорядоченный по id.
+
+        Notes:
+            Выбираются только нужные колонки, а keyset-пагинация по id использует индекс ix_users_ban_email_confirmed_id,
+            поэтому стоимость страницы не зависит от её номера.
+        """
+        query = select(cls.model.id, cls.model.email).where(
+            cls.model.ban.is_(False),
+            cls.model.email_confirmed.is_(True),
+            cls.model.id > after_id,
+        )
+        if role_title is not None:
+            query = query.where(cls.model.role_title == role_title)
+
+        result = await cls._execute_read(query.order_by(cls.model.id).limit(limit))
+        return result.all()
+
+    @classmethod
+    async def search(
+        cls,
+        email_prefix: Optional[str] = None,
+        name: Optional[str] = None,
+        role_title: Optional[str] = None,
+        ban: Optional[bool] = None,
+        email_confirmed: Optional[bool] = None,
+        registered_from: Optional[datetime] = None,
+        registered_to: Optional[datetime] = None,
+        after_id: Optional[int] = None,
+        limit: int = 50,
+    ) -> List[User]:
+        """
+        Ищет пользователей по фильтрам с keyset-пагинацией по id.
+
+        Args:
+            email_prefix: Начало email пользователя.
+            name: Начало имени или фамилии пользователя.
+            role_title: Название роли.
+            ban: Признак блокировки.
+            email_confirmed: Признак подтверждения email.
+            registered_from: Нижняя граница даты регистрации (включительно).
+            registered_to: Верхняя граница даты регистрации (не включительно).
+            after_id: Идентификатор последнего пользователя предыдущей страницы.
+            limit: Максимальное количество пользователей на странице.
+
+        Returns:
+            Список пользователей, упорядоченный по id.
+
+        Notes:
+            Поиск по префиксу выполняется через LIKE 'prefix%' (спецсимволы экранируются),
+            что позволяет использовать индексы *_pattern вместо полного сканирования таблицы.
+            Шаблон целиком передаётся одним параметром: выражение `$1 || '%'` не позволило бы PostgreSQL
+            использовать индекс в общем плане подготовленного запроса.
+        """
+        query = select(cls.model)
+        if email_prefix:
+            query = query.where(cls.model.email.like(cls._prefix_pattern(email_prefix), escape="/"))
+        if name:
+            name_pattern = cls._prefix_pattern(name)
+            query = query.where(
+                or_(
+                    cls.model.last_name.like(name_pattern, escape="/"),
+                    cls.model.first_name.like(name_pattern, escape="/"),
+                )
+            )
+        if role_title is not None:
+            query = query.where(cls.model.role_title == role_title)
+        if ban is not None:
+            query = query.where(cls.model.ban == ban)
+        if email_confirmed is not None:
+            query = query.where(cls.model.email_confirmed == email_confirmed)
+        if registered_from is not None:
+            query = query.where(cls.model.registration_date >= registered_from)
+        if registered_to is not None:
+            query = query.where(cls.model.registration_date < registered_to)
+        if after_id is not None:
+            query = query.where(cls.model.id > after_id)
+
+        result = await cls._execute_read(query.order_by(cls.model.id).limit(limit))
+        return result.scalars().all()
+
+    @staticmethod
+    def _prefix_pattern(prefix: str) -> str:
+        """
+        Формирует шаблон LIKE для поиска по префиксу.
+
+        Args:
+            prefix: Префикс искомого значения.
+
+        Returns:
+            Шаблон вида 'prefix%' со спецсимволами LIKE, экранированными символом "/".
+        """
+        escaped = prefix.replace("/", "//").replace("%", "/%").replace("_", "/_")
+        return f"{escaped}%"
+
+    @classmethod
+    async def update_last_activity(cls, activity: dict[int, datetime]) -> None:
+        """
+        Обновляет время последней активности нескольких пользователей пакетным запросом
+        `UPDATE ... SET last_activity = CASE id WHEN ... END WHERE id IN (...)`.
+
+        Args:
+            activity: Словарь, сопоставляющий id пользователя и время его последней активности.
+        """
+        user_ids = list(activity)
+
+        async def work(session: AsyncSession) -> None:
+            for start in range(0, len(user_ids), cls.ACTIVITY_BATCH_SIZE):
+                stop = start + cls.ACTIVITY_BATCH_SIZE
+                batch = {user_id: activity[user_id] for user_id in user_ids[start:stop]}
+                query = (
+                    update(cls.model)
+                    .where(cls.model.id.in_(batch))
+                    .values(last_activity=case(batch, value=cls.model.id))
+                    .execution_options(synchronize_session=False)
+                )
+                await session.execute(query)
+
+        await cls._run_write(work)
+
+    @classmethod
+    async def clear_expired_reset_tokens(cls, created_before: datetime, limit: int) -> int:
+        """
+        Удаляет просроченные токены сброса пароля не более чем у `limit` пользователей одним запросом
+        `UPDATE ... WHERE id IN (SELECT id ... LIMIT ?)`.
+
+        Args:
+            created_before: Токены, созданные раньше этого времени, считаются просроченными.
+            limit: Максимальное количество обновляемых пользователей.
+
+        Returns:
+            Количество пользователей, у которых удалён токен сброса пароля.
+        """
+        expired = (
+            select(cls.model.id)
+            .where(cls.model.password_reset_token_hash.isnot(None), cls.model.password_reset_token_created_at < created_before)
+            .limit(limit)
+        )
+        query = (
+            update(cls.model)
+            .where(cls.model.id.in_(expired))
+            .values(password_reset_token_hash=None, password_reset_token_created_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        result = await cls._execute_write(query)
+        return result.rowcount
+
+    @classmethod
+    async def delete_unconfirmed(cls, confirmation_sent_before: datetime, limit: int) -> int:
+        """
+        Удаляет не более `limit` пользователей, не подтвердивших email, вместе с их refresh-токенами в одной транзакции.
+
+        Args:
+            confirmation_sent_before: Удаляются пользователи, последнее письмо подтверждения которым
+                отправлено раньше этого времени.
+            limit: Максимальное количество удаляемых пользователей.
+
+        Returns:
+            Количество удалённых пользователей.
+
+        Notes:
+            Возраст учётной записи определяется по confirmation_token_created_at, а не по registration_date:
+            значение по умолчанию registration_date вычисляется при запуске приложения.
+            Refresh-токены удаляются явно, так как SQLite без PRAGMA foreign_keys не выполняет ON DELETE CASCADE.
+        """
+
+        async def work(session: AsyncSession) -> int:
+            result = await session.execute(
+                select(cls.model.id)
+                .where(
+                    cls.model.email_confirmed.is_(False),
+                    cls.model.confirmation_token_hash.isnot(None),
+                    cls.model.confirmation_token_created_at < confirmation_sent_before,
+                )
+                .limit(limit)
+            )
+            user_ids = result.scalars().all()
+            if user_ids:
+                await session.execute(
+                    delete(RefreshToken).where(RefreshToken.user_id.in_(user_ids)).execution_options(synchronize_session=False)
+                )
+                await session.execute(
+                    delete(cls.model).where(cls.model.id.in_(user_ids)).execution_options(synchronize_session=False)
+                )
+            return len(user_ids)
+
+        return await cls._run_write(work)
+
 
 class RefreshTokenRepository(BaseRepository[RefreshToken]):
     """
     Репозиторий для выполнения CRUD-операций с моделью RefreshToken.
     """
+
     model = RefreshToken
 
+    # Email владельца загружается тем же запросом (JOIN по первичному ключу users) для выдачи новых токенов
+    _with_user_email_query = (
+        select(RefreshToken)
+        .join(RefreshToken.user)
+        .options(contains_eager(RefreshToken.user).load_only(User.email, User.role_title))
+    )
+    _find_by_jti_query = _with_user_email_query.where(RefreshToken.jti == bindparam("jti"))
+    _find_by_token_hash_query = _with_user_email_query.where(RefreshToken.token_hash == bindparam("token_hash"))
+
+    @classmethod
+    async def find_by_jti(cls, jti: UUID) -> Optional[RefreshToken]:
+        """
+        Находит refresh-токен по jti с использованием заранее построенного запроса.
+
+        Args:
+            jti: Уникальный идентификатор токена (JWT ID).
+
+        Returns:
+            Экземпляр RefreshToken с загруженным email владельца (token.user.email), если токен найден, иначе None.
+        """
+        result = await cls._execute_read(cls._find_by_jti_query, {"jti": jti})
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def find_by_token_hash(cls, token_hash: str) -> Optional[RefreshToken]:
+        """
+        Находит непрозрачный refresh-токен по SHA-256 хешу с использованием заранее построенного запроса.
+
+        Args:
+            token_hash: SHA-256 хеш токена (hex).
+
+        Returns:
+            Экземпляр RefreshToken с загруженным email владельца (token.user.email), если токен найден, иначе None.
+        """
+        result = await cls._execute_read(cls._find_by_token_hash_query, {"token_hash": token_hash})
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def add_with_session_cap(cls, max_sessions: int, revoked_grace: int = 0, **data: Any) -> None:
+        """
+        Создаёт refresh-токен и в той же транзакции удаляет самые старые активные сессии пользователя сверх лимита,
+        а также его отозванные и истёкшие токены, чтобы количество строк пользователя оставалось ограниченным.
+
+        Args:
+            max_sessions: Максимальное количество активных сессий пользователя (0 — без ограничения).
+            revoked_grace: Время, в течение которого отозванные токены не удаляются (в секундах),
+                чтобы повторное обновление только что отозванным токеном попало в окно дедупликации.
+            **data: Данные создаваемого токена (jti, user_id, expires_at и token_hash для непрозрачных токенов).
+        """
+        user_id = data["user_id"]
+        now = datetime.now()
+
+        async def work(session: AsyncSession) -> None:
+            await session.execute(insert(cls.model).values(**data))
+            if max_sessions:
+                oldest_sessions = (
+                    select(cls.model.jti)
+                    .where(cls.model.user_id == user_id, cls.model.revoked.is_(None), cls.model.expires_at >= now)
+                    .order_by(cls.model.expires_at.desc())
+                    .offset(max_sessions)
+                )
+                await session.execute(
+                    delete(cls.model)
+                    .where(
+                        cls.model.user_id == user_id,
+                        or_(
+                            cls.model.revoked < now - timedelta(seconds=revoked_grace),
+                            cls.model.expires_at < now,
+                            cls.model.jti.in_(oldest_sessions),
+                        ),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+
+        await cls._run_write(work)
+
+    @classmethod
+    async def revoke_all(cls, user_id: int, revoked: datetime) -> int:
+        """
+        Отзывает все активные refresh-токены пользователя одним запросом
+        `UPDATE ... WHERE user_id = ? AND revoked IS NULL`.
+
+        Args:
+            user_id: Идентификатор пользователя.
+            revoked: Дата и время отзыва токенов.
+
+        Returns:
+            Количество отозванных токенов.
+        """
+        query = (
+            update(cls.model)
+            .where(cls.model.user_id == user_id, cls.model.revoked.is_(None))
+            .values(revoked=revoked)
+            .execution_options(synchronize_session=False)
+        )
+        result = await cls._execute_write(query)
+        return result.rowcount
+
     @classmethod
     async def revoke(cls, jti: UUID, revoked: datetime) -> RefreshToken | None:
         """
@@ -31,11 +421,41 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
             revoked: Дата и время отзыва токена.
 
         Returns:
-            Обновлённый экземпляр RefreshToken, если токен найден, иначе None.
+            Обновлённый экземпляр RefreshToken, если токен найден и ещё не был отозван, иначе None.
+
+        Notes:
+            Условие `revoked IS NULL` делает отзыв атомарным: из одновременных отзывов одного токена
+            (например, обновлений токенов в разных воркерах) успешен только один.
+        """
+        query = (
+            update(cls.model)
+            .where(cls.model.jti == jti, cls.model.revoked.is_(None))
+            .values(revoked=revoked)
+            .returning(cls.model)
+        )
+        result = await cls._execute_write(query)
+        return result.scalars().one_or_none()
+
+    @classmethod
+    async def revoke_by_token_hash(cls, token_hash: str, revoked: datetime) -> RefreshToken | None:
+        """
+        Отзывает непрозрачный refresh-токен по SHA-256 хешу, устанавливая дату отзыва.
+
+        Args:
+            token_hash: SHA-256 хеш токена (hex).
+            revoked: Дата и время отзыва токена.
+
+        Returns:
+            Обновлённый экземпляр RefreshToken, если токен найден и ещё не был отозван, иначе None.
+
+        Notes:
+            Как и в revoke, условие `revoked IS NULL` не даёт повторно отозвать уже отозванный токен.
         """
-        async with get_async_session() as session:
-            query = update(cls.model).where(cls.model.jti == jti).values(revoked=revoked).returning(cls.model)
-            result = await session.execute(query)
-            await session.commit()
-            return result.scalars().one_or_none()
-        
\ No newline at end of file
+        query = (
+            update(cls.model)
+            .where(cls.model.token_hash == token_hash, cls.model.revoked.is_(None))
+            .values(revoked=revoked)
+            .returning(cls.model)
+        )
+        result = await cls._execute_write(query)
+        return result.scalars().one_or_none()
@@ -1,4 +1,5 @@
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+
 from src.config import settings
 
 
@@ -9,7 +10,11 @@ class CookieHandler:
     Предоставляет методы для безопасной установки access- и refresh-токенов в HTTP-ответ.
     """
 
-    def __init__(self, access_token_expire: int = settings.JWT_ACCESS_TOKEN_EXPIRE, refresh_token_expire: int = settings.JWT_REFRESH_TOKEN_EXPIRE):
+    def __init__(
+        self,
+        access_token_expire: int = settings.JWT_ACCESS_TOKEN_EXPIRE,
+        refresh_token_expire: int = settings.JWT_REFRESH_TOKEN_EXPIRE,
+    ):
         self.access_token_expire = access_token_expire
         self.refresh_token_expire = refresh_token_expire
 
@@ -24,21 +29,32 @@ class CookieHandler:
             access_token: Access-токен для аутентификации.
             refresh_token: Refresh-токен для обновления access-токена.
         """
+        self.set_access_token(response, access_token)
         response.set_cookie(
-            key="access_token",
-            value=access_token,
+            key="refresh_token",
+            value=refresh_token,
             httponly=True,
             secure=True,
             samesite="Lax",
-            max_age=self.access_token_expire * 60,
+            max_age=self.refresh_token_expire * 60 * 60 * 24,
         )
+
+    def set_access_token(self, response: Response, access_token: str) -> None:
+        """
+        Устанавливает в cookies ответа только access-токен (например, при его продлении без обновления refresh-токена).
+
+        Args:
+            response: Объект ответа для установки cookies.
+            access_token: Access-токен для аутентификации.
+        """
         response.set_cookie(
-            key="refresh_token",
-            value=refresh_token,
+            key="access_token",
+            value=access_token,
             httponly=True,
             secure=True,
             samesite="Lax",
-            max_age=self.refresh_token_expire * 60 * 60 * 24,
+            max_age=self.access_token_expire * 60,
         )
 
+
 cookie_handler = CookieHandler()
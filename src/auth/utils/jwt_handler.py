@@ -1,17 +1,27 @@
-import jwt
-
-from uuid import uuid4
-from pathlib import Path
+import base64
+import hashlib
+import json
+import secrets
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+from uuid import UUID, uuid4
+
+import jwt
 from pydantic import EmailStr, ValidationError
 
-from src.config import settings
+from src.auth.constants import TokenUse
 from src.auth.services import RefreshTokenRepository
+from src.auth.utils.token_hasher import token_hasher
+from src.config import settings
 from src.exceptions import (
-    InvalidTokenException,
     ExpiredTokenException,
     InvalidEmailException,
+    InvalidTokenException,
 )
+from src.models import RefreshToken
 
 
 class JWTHandler:
@@ -20,8 +30,23 @@ class JWTHandler:
 
     Использует приватный и публичный ключи для подписи и верификации токенов.
     Поддерживает создание access-токенов, refresh-токенов и токенов сброса пароля.
+
+    Каждый токен содержит в заголовке идентификатор ключа (kid). Для ротации ключей предыдущие
+    публичные ключи указываются в JWT_ADDITIONAL_PUBLIC_KEY_PATHS (kid — отпечаток ключа) или, если ключ
+    использовался с заданным JWT_KEY_ID, в JWT_ADDITIONAL_PUBLIC_KEYS (kid -> путь): токены, подписанные ими,
+    продолжают проверяться, а все ключи публикуются в JWKS (/.well-known/jwks.json).
     """
 
+    # Обязательные параметры JWK для вычисления отпечатка ключа (RFC 7638)
+    THUMBPRINT_MEMBERS = {
+        "RSA": ("e", "kty", "n"),
+        "EC": ("crv", "kty", "x", "y"),
+        "OKP": ("crv", "kty", "x"),
+    }
+
+    # Идентификатор ключа для симметричных алгоритмов (HS*): отпечаток не вычисляется, чтобы не раскрывать хеш секрета
+    SYMMETRIC_KEY_ID = "hs"
+
     def __init__(self):
         # Загрузка приватного и публичного ключей шифрования из файлов
         self.private_key = Path(settings.JWT_PRIVATE_KEY_PATH).read_text()
@@ -29,37 +54,149 @@ class JWTHandler:
 
         # Конфигурация JWT из настроек приложения
         self.algorithm = settings.JWT_ALGORITHM
+        self._algorithm = jwt.get_algorithm_by_name(self.algorithm)
         self.access_token_exp = settings.JWT_ACCESS_TOKEN_EXPIRE
         self.refresh_token_exp = settings.JWT_REFRESH_TOKEN_EXPIRE
         self.reset_token_exp = settings.JWT_RESET_TOKEN_EXPIRE
+        self.max_active_sessions = settings.JWT_MAX_ACTIVE_SESSIONS
+        self.opaque_refresh_tokens = settings.JWT_REFRESH_TOKEN_OPAQUE
+        self.refresh_grace_period = settings.JWT_REFRESH_GRACE_PERIOD
+
+        # Ключи разбираются один раз, а не при каждой подписи и проверке токена
+        self._signing_key = self._algorithm.prepare_key(self.private_key)
+        public_key = self._algorithm.prepare_key(self.public_key)
+        self.key_id = settings.JWT_KEY_ID or self._get_key_id(public_key)
+
+        # Карта kid -> публичный ключ для проверки токенов, включая ключи предыдущих ротаций
+        self.verification_keys = {self.key_id: public_key}
+        # Для HS* отпечаток не вычисляется, поэтому секреты предыдущих ротаций указываются только с kid
+        if not self.algorithm.startswith("HS"):
+            for path in settings.JWT_ADDITIONAL_PUBLIC_KEY_PATHS:
+                additional_key = self._algorithm.prepare_key(Path(path).read_text())
+                self.verification_keys.setdefault(self._get_key_id(additional_key), additional_key)
+        for key_id, path in settings.JWT_ADDITIONAL_PUBLIC_KEYS.items():
+            if key_id == self.key_id:
+                raise ValueError(f"kid ключа предыдущей ротации совпадает с kid текущего ключа: {key_id}")
+            self.verification_keys[key_id] = self._algorithm.prepare_key(Path(path).read_text())
+
+        self.jwks = self._build_jwks()
+        self.jwks_json = json.dumps(self.jwks, separators=(",", ":")).encode("utf-8")
+        self.jwks_etag = f'"{hashlib.sha256(self.jwks_json).hexdigest()}"'
 
-    async def create_access_token(self, subject: EmailStr) -> str:
+        # LRU-кеш успешно проверенных токенов: токен -> payload (запись действительна до exp токена)
+        self.decode_cache_size = settings.JWT_DECODE_CACHE_SIZE
+        self._decode_cache: OrderedDict[str, dict] = OrderedDict()
+
+    async def create_access_token(self, subject: EmailStr, permissions: Optional[int] = None) -> str:
         """
         Создаёт access-токен для аутентификации пользователя.
 
         Args:
             subject: Email пользователя, используемый как идентификатор.
+            permissions: Битовая маска прав пользователя (Permission), добавляемая в claim "perm".
 
         Returns:
             Подписанный JWT access-токен в виде строки.
         """
-        token, _, _ = await self._create_token(subject, timedelta(minutes=self.access_token_exp))
+        claims = {"perm": int(permissions)} if permissions is not None else None
+        token, _, _ = await self._create_token(subject, timedelta(minutes=self.access_token_exp), TokenUse.ACCESS, claims)
         return token
 
-    async def create_refresh_token(self, subject: str) -> str:
+    async def create_refresh_token(self, subject: str, user_id: int) -> str:
         """
-        Создаёт refresh-токен и сохраняет его (jti, email, время истечения) в базе данных.
+        Создаёт refresh-токен и сохраняет его (jti, id пользователя, время истечения) в базе данных.
+        Самые старые активные сессии пользователя сверх JWT_MAX_ACTIVE_SESSIONS удаляются в той же транзакции.
 
         Args:
             subject: Email пользователя, используемый как идентификатор.
+            user_id: Идентификатор пользователя, которому принадлежит токен.
 
         Returns:
-            Подписанный JWT refresh-токен в виде строки.
+            Подписанный JWT refresh-токен или, если включён JWT_REFRESH_TOKEN_OPAQUE, непрозрачный токен
+            (32 случайных байта в base64url), в базе данных хранится только его SHA-256 хеш.
         """
-        token, jti, expires_at = await self._create_token(subject, timedelta(days=self.refresh_token_exp))
-        await RefreshTokenRepository.add(jti=jti, email=subject, expires_at=expires_at)
+        if not self.opaque_refresh_tokens:
+            token, jti, expires_at = await self._create_token(subject, timedelta(days=self.refresh_token_exp), TokenUse.REFRESH)
+            await RefreshTokenRepository.add_with_session_cap(
+                self.max_active_sessions,
+                self.refresh_grace_period,
+                jti=UUID(jti),
+                user_id=user_id,
+                expires_at=expires_at,
+            )
+            return token
+
+        token = secrets.token_urlsafe(32)
+        await RefreshTokenRepository.add_with_session_cap(
+            self.max_active_sessions,
+            self.refresh_grace_period,
+            jti=uuid4(),
+            user_id=user_id,
+            expires_at=datetime.now() + timedelta(days=self.refresh_token_exp),
+            token_hash=token_hasher.hash_token(token),
+        )
         return token
 
+    async def find_refresh_token(self, token: str) -> Optional[RefreshToken]:
+        """
+        Находит сохранённый refresh-токен по значению из cookies.
+
+        Args:
+            token: Refresh-токен (JWT или непрозрачный).
+
+        Returns:
+            Экземпляр RefreshToken или None, если токен не найден или срок его действия истёк.
+
+        Raises:
+            ExpiredTokenException: Если срок действия JWT refresh-токена истёк.
+            InvalidTokenException: Если JWT refresh-токен недействителен.
+
+        Notes:
+            Непрозрачные токены (без точек) ищутся по SHA-256 хешу одним индексированным запросом без проверки
+            подписи, срок их действия проверяется по expires_at. JWT-токены, выданные до включения
+            JWT_REFRESH_TOKEN_OPAQUE, продолжают приниматься.
+        """
+        if self.is_opaque_token(token):
+            refresh_token = await RefreshTokenRepository.find_by_token_hash(token_hasher.hash_token(token))
+            if not refresh_token or refresh_token.expires_at <= datetime.now():
+                return None
+            return refresh_token
+
+        payload = await self.decode_token(token)
+        jti = self.parse_jti(payload)
+        if not jti or not payload.get("sub"):
+            return None
+        return await RefreshTokenRepository.find_by_jti(jti)
+
+    @staticmethod
+    def parse_jti(payload: dict) -> Optional[UUID]:
+        """
+        Извлекает идентификатор токена (jti) из payload.
+
+        Args:
+            payload: Payload декодированного токена.
+
+        Returns:
+            jti в виде UUID или None, если он отсутствует или имеет некорректный формат.
+        """
+        try:
+            return UUID(payload["jti"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def is_opaque_token(token: str) -> bool:
+        """
+        Проверяет, является ли токен непрозрачным (JWT всегда содержит точки между частями).
+
+        Args:
+            token: Токен в виде строки.
+
+        Returns:
+            True, если токен непрозрачный, иначе False.
+        """
+        return "." not in token
+
     async def create_reset_token(self, subject: str) -> str:
         """
         Создаёт токен для сброса пароля.
@@ -70,16 +207,24 @@ class JWTHandler:
         Returns:
             Подписанный JWT токен сброса пароля в виде строки.
         """
-        token, _, _ = await self._create_token(subject, timedelta(minutes=self.reset_token_exp))
+        token, _, _ = await self._create_token(subject, timedelta(minutes=self.reset_token_exp), TokenUse.RESET)
         return token
 
-    async def _create_token(self, email: str, expires_delta: timedelta) -> tuple[str, str, datetime]:
+    async def _create_token(
+        self,
+        email: str,
+        expires_delta: timedelta,
+        token_use: TokenUse,
+        claims: Optional[dict] = None,
+    ) -> tuple[str, str, datetime]:
         """
         Создаёт JWT-токен с указанным временем истечения.
 
         Args:
             email: Email пользователя для включения в payload токена.
             expires_delta: Длительность действия токена.
+            token_use: Назначение токена (claim "token_use").
+            claims: Дополнительные claims токена.
 
         Returns:
             Кортеж из подписанного токена, уникального идентификатора (jti) и времени истечения.
@@ -101,32 +246,101 @@ class JWTHandler:
             "iat": int(now.timestamp()),
             "exp": int(expire.timestamp()),
             "jti": jti,
+            "token_use": token_use.value,
         }
+        if claims:
+            payload.update(claims)
 
-        token = jwt.encode(payload, self.private_key, algorithm=self.algorithm)
+        token = jwt.encode(payload, self._signing_key, algorithm=self.algorithm, headers={"kid": self.key_id})
         return token, jti, expire
 
-    async def decode_token(self, token: str) -> dict:
+    async def decode_token(self, token: str, token_use: Optional[TokenUse] = None) -> dict:
         """
         Декодирует и проверяет JWT-токен.
 
         Args:
             token: JWT-токен в виде строки.
+            token_use: Ожидаемое назначение токена. Токен с другим claim "token_use" отклоняется,
+                токены без этого claim (выпущенные до его появления) принимаются.
 
         Returns:
             Словарь с payload токена, если токен действителен.
 
         Raises:
             ExpiredTokenException: Если срок действия токена истёк.
-            InvalidTokenException: Если токен недействителен или не может быть декодирован.
+            InvalidTokenException: Если токен недействителен, подписан неизвестным ключом, не может быть декодирован
+                или имеет другое назначение.
+
+        Notes:
+            Ключ проверки выбирается по kid из заголовка токена. Токены без kid (выданные до
+            появления JWKS) проверяются текущим публичным ключом.
+
+            Результаты успешной проверки кешируются (не более JWT_DECODE_CACHE_SIZE токенов) до истечения
+            срока действия токена, поэтому повторная проверка того же токена не выполняет проверку подписи.
+            Вызывающий получает копию payload, поэтому её изменение не влияет на кеш.
         """
-        try:
-            payload = jwt.decode(token, self.public_key, algorithms=[self.algorithm])
-            return payload
-        except jwt.ExpiredSignatureError:
-            raise ExpiredTokenException
-        except jwt.InvalidTokenError:
+        payload = self._decode_cache.get(token)
+        if payload is not None:
+            if payload["exp"] <= time.time():
+                self._decode_cache.pop(token, None)
+                raise ExpiredTokenException
+            self._decode_cache.move_to_end(token)
+        else:
+            try:
+                key_id = jwt.get_unverified_header(token).get("kid", self.key_id)
+                key = self.verification_keys.get(key_id)
+                if key is None:
+                    raise InvalidTokenException
+                payload = jwt.decode(token, key, algorithms=[self.algorithm])
+            except jwt.ExpiredSignatureError:
+                raise ExpiredTokenException
+            except jwt.InvalidTokenError:
+                raise InvalidTokenException
+
+            if self.decode_cache_size and "exp" in payload:
+                self._decode_cache[token] = payload
+                if len(self._decode_cache) > self.decode_cache_size:
+                    self._decode_cache.popitem(last=False)
+
+        if token_use is not None and payload.get("token_use", token_use.value) != token_use.value:
             raise InvalidTokenException
+        return dict(payload)
+
+    def _get_key_id(self, public_key) -> str:
+        """
+        Вычисляет идентификатор ключа (kid) как его JWK-отпечаток по RFC 7638.
+
+        Args:
+            public_key: Публичный ключ.
+
+        Returns:
+            Отпечаток ключа в формате base64url без выравнивания. Одинаков для всех воркеров и серверов.
+            Для симметричных алгоритмов (HS*) — постоянный SYMMETRIC_KEY_ID.
+        """
+        if self.algorithm.startswith("HS"):
+            return self.SYMMETRIC_KEY_ID
+
+        jwk = self._algorithm.to_jwk(public_key, as_dict=True)
+        members = {name: jwk[name] for name in self.THUMBPRINT_MEMBERS[jwk["kty"]]}
+        digest = hashlib.sha256(json.dumps(members, separators=(",", ":"), sort_keys=True).encode("utf-8")).digest()
+        return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+    def _build_jwks(self) -> dict:
+        """
+        Формирует набор публичных ключей (JWKS) для проверки токенов сторонними сервисами.
+
+        Returns:
+            Словарь вида {"keys": [...]}. Для симметричных алгоритмов (HS*) набор пуст: секрет не публикуется.
+        """
+        if self.algorithm.startswith("HS"):
+            return {"keys": []}
+
+        keys = []
+        for key_id, public_key in self.verification_keys.items():
+            jwk = self._algorithm.to_jwk(public_key, as_dict=True)
+            jwk.pop("key_ops", None)
+            keys.append({**jwk, "kid": key_id, "use": "sig", "alg": self.algorithm})
+        return {"keys": keys}
 
 
 jwt_handler = JWTHandler()
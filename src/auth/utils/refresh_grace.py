@@ -0,0 +1,132 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, NamedTuple, Optional
+from uuid import UUID
+
+from src.config import settings
+from src.single_flight import SingleFlight
+
+
+class RotatedTokens(NamedTuple):
+    user_id: int
+    email: str
+    access_token: str
+    refresh_token: str
+
+
+class RefreshGrace:
+    """
+    Класс для дедупликации одновременных обновлений токенов одним refresh-токеном.
+
+    Когда несколько вкладок браузера одновременно вызывают /auth/refresh с одними и теми же cookies,
+    ротация выполняется один раз: одновременные вызовы в воркере ожидают одну ротацию (single-flight),
+    а вызовы, пришедшие после неё в течение `grace_period` секунд, получают ту же новую пару токенов
+    из кеша в памяти по jti старого refresh-токена вместо ошибки и повторного входа.
+
+    Notes:
+        Кеш локален для воркера: вызов, попавший в другой воркер после ротации, получает ошибку,
+        как и без окна дедупликации. Окно ограничено несколькими секундами, так как в течение него
+        отозванный refresh-токен позволяет получить уже выданную пару токенов.
+    """
+
+    def __init__(
+        self,
+        grace_period: int = settings.JWT_REFRESH_GRACE_PERIOD,
+        max_size: int = settings.JWT_REFRESH_GRACE_CACHE_SIZE,
+    ):
+        self.grace_period = grace_period
+        self.max_size = max_size
+
+        self._results: OrderedDict[UUID, tuple[float, RotatedTokens]] = OrderedDict()
+        self._flight = SingleFlight("auth.refresh", enabled=grace_period > 0)
+
+        # Счётчики для мониторинга
+        self.rotations = 0
+        self.grace_hits = 0
+
+    async def get(self, jti: UUID) -> Optional[RotatedTokens]:
+        """
+        Возвращает пару токенов, выданную при ротации refresh-токена, если окно дедупликации не истекло.
+
+        Args:
+            jti: Идентификатор отозванного refresh-токена.
+
+        Returns:
+            Экземпляр RotatedTokens или None, если ротация не выполнялась в этом воркере или окно истекло.
+
+        Notes:
+            Если ротация ещё выполняется (токен уже отозван, но новая пара не выдана), ожидает её завершения.
+        """
+        future = self._flight.pending(jti)
+        if future is not None:
+            self.grace_hits += 1
+            return await asyncio.shield(future)
+
+        entry = self._results.get(jti)
+        if entry is None:
+            return None
+        expires_at, tokens = entry
+        if time.monotonic() > expires_at:
+            self._results.pop(jti, None)
+            return None
+        self.grace_hits += 1
+        return tokens
+
+    async def rotate(self, jti: UUID, func: Callable[[], Awaitable[RotatedTokens]]) -> RotatedTokens:
+        """
+        Выполняет ротацию refresh-токена один раз для всех одновременных вызовов и запоминает результат.
+
+        Args:
+            jti: Идентификатор обновляемого refresh-токена.
+            func: Асинхронная функция, отзывающая старый токен и выдающая новую пару токенов.
+
+        Returns:
+            Экземпляр RotatedTokens с новой парой токенов.
+        """
+
+        async def run() -> RotatedTokens:
+            tokens = await func()
+            self.rotations += 1
+            if self.grace_period > 0:
+                self._remember(jti, tokens)
+            return tokens
+
+        return await self._flight.do(jti, run)
+
+    def discard(self, user_id: int) -> None:
+        """
+        Удаляет из кеша ротации пользователя, чтобы после выхода из системы старый refresh-токен
+        не возвращал выданную ранее пару токенов.
+
+        Args:
+            user_id: Идентификатор пользователя.
+        """
+        for jti in [jti for jti, (_, tokens) in self._results.items() if tokens.user_id == user_id]:
+            del self._results[jti]
+
+    def _remember(self, jti: UUID, tokens: RotatedTokens) -> None:
+        self._results[jti] = (time.monotonic() + self.grace_period, tokens)
+        self._results.move_to_end(jti)
+        # Записи добавляются в порядке истечения, поэтому сначала удаляются истёкшие и самые старые
+        now = time.monotonic()
+        while self._results and (len(self._results) > self.max_size or next(iter(self._results.values()))[0] < now):
+            self._results.popitem(last=False)
+
+    def stats(self) -> dict:
+        """
+        Возвращает счётчики дедупликации для мониторинга.
+
+        Returns:
+            Словарь с размером кеша, количеством ротаций, ответов из кеша и объединённых одновременных вызовов.
+        """
+        return {
+            "grace_period": self.grace_period,
+            "cached": len(self._results),
+            "rotations": self.rotations,
+            "grace_hits": self.grace_hits,
+            "coalesced": self._flight.coalesced,
+        }
+
+
+refresh_grace = RefreshGrace()
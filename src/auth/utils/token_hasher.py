@@ -0,0 +1,25 @@
+import hashlib
+
+
+class TokenHasher:
+    """
+    Класс для вычисления дайджестов одноразовых токенов (подтверждения email, сброса пароля).
+
+    В базе данных хранится только SHA-256 дайджест токена фиксированной длины (64 hex-символа),
+    по которому выполняется поиск через индекс. Сам токен передаётся только пользователю.
+    """
+
+    def hash_token(self, token: str) -> str:
+        """
+        Вычисляет SHA-256 дайджест токена.
+
+        Args:
+            token: Токен в виде строки.
+
+        Returns:
+            Дайджест токена в шестнадцатеричном виде (64 символа).
+        """
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+token_hasher = TokenHasher()
@@ -1,4 +1,5 @@
-from typing import Optional, Literal
+from typing import Dict, List, Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -8,12 +9,13 @@ class Settings(BaseSettings):
 
     Использует Pydantic для валидации и управления настройками.
     """
+
     model_config = SettingsConfigDict(env_file=".env")  # Загружает переменные из .env файла
 
     # --- Пароли ---
     PASSWORD_VALIDATION_LEVEL: Literal["none", "light", "medium", "strong"]  # Уровень строгости валидации паролей
     PASSWORDS_COMMON_LIST_PATH: str  # Путь к файлу со списком часто используемых паролей
-    PASSWORD_BCRYPT_SALT_ROUNDS: int # Количество раундов при генерации соли для шифрования пароля
+    PASSWORD_BCRYPT_SALT_ROUNDS: int  # Количество раундов при генерации соли для шифрования пароля
 
     # --- База данных ---
     DB_TYPE: str  # Тип базы данных (например, postgresql или sqlite)
@@ -22,6 +24,14 @@ class Settings(BaseSettings):
     DB_USER: Optional[str] = None  # Пользователь базы данных (опционально)
     DB_PASS: Optional[str] = None  # Пароль для базы данных (опционально)
     DB_NAME: Optional[str] = None  # Имя базы данных (опционально)
+    DB_REPLICA_URLS: List[str] = []  # Строки подключения к репликам для чтения (JSON-список, опционально)
+    DB_REPLICA_EJECT_SECONDS: int = 30  # Время исключения недоступной реплики из ротации (в секундах)
+    DB_SQLITE_SINGLE_WRITER: bool = (
+        False  # Для SQLite: запись через одно соединение с групповой фиксацией (только один рабочий процесс)
+    )
+    DB_SQLITE_WRITER_BATCH_SIZE: int = 100  # Максимальное количество операций записи в одной групповой транзакции
+    DB_SQLITE_WRITER_QUEUE_SIZE: int = 10000  # Максимальное количество операций записи, ожидающих в очереди
+    DB_SQLITE_READ_POOL_SIZE: int = 5  # Количество read-only соединений для чтения в режиме одного писателя
 
     @property
     def DATABASE_URL(self) -> str:
@@ -50,6 +60,28 @@ class Settings(BaseSettings):
     JWT_RESET_TOKEN_EXPIRE: int  # Время жизни токена для сброса пароля (в минутах)
     JWT_PRIVATE_KEY_PATH: str  # Путь к файлу с приватным ключом для JWT
     JWT_PUBLIC_KEY_PATH: str  # Путь к файлу с публичным ключом для JWT
+    JWT_KEY_ID: Optional[str] = None  # Идентификатор (kid) текущего ключа подписи (по умолчанию — отпечаток ключа по RFC 7638)
+    JWT_ADDITIONAL_PUBLIC_KEY_PATHS: List[str] = []  # Пути к публичным ключам предыдущих ротаций с kid-отпечатком (JSON-список)
+    JWT_ADDITIONAL_PUBLIC_KEYS: Dict[str, str] = {}  # Публичные ключи предыдущих ротаций с заданным kid (JSON kid -> путь)
+    JWKS_CACHE_MAX_AGE: int = 21600  # Время кеширования /.well-known/jwks.json клиентами (в секундах)
+    JWT_MAX_ACTIVE_SESSIONS: int = 10  # Максимум активных refresh-токенов (сессий) пользователя (0 — без ограничения)
+    JWT_REFRESH_TOKEN_OPAQUE: bool = False  # Непрозрачные refresh-токены (случайные байты, в базе — SHA-256) вместо JWT
+    JWT_DECODE_CACHE_SIZE: int = 10000  # Количество проверенных токенов в кеше декодирования (0 — без кеша)
+    JWT_REFRESH_GRACE_PERIOD: int = (
+        10  # Окно повторной выдачи новой пары токенов по отозванному refresh-токену (в секундах, 0 — нет)
+    )
+    JWT_REFRESH_GRACE_CACHE_SIZE: int = 10000  # Максимальное количество ротаций в кеше окна дедупликации
+    JWT_SLIDING_RENEWAL_ENABLED: bool = (
+        False  # Продление access-токена в ответе на запрос, если срок его действия скоро истечёт
+    )
+    JWT_SLIDING_RENEWAL_WINDOW: int = 5  # За сколько до истечения access-токена он продлевается (в минутах)
+
+    # --- Объединение запросов ---
+    SINGLE_FLIGHT_ENABLED: bool = True  # Объединение одновременных одинаковых поисков пользователя в один запрос к базе данных
+
+    # --- Интроспекция токенов ---
+    INTROSPECTION_SECRET: Optional[str] = None  # Общий секрет шлюзов для /auth/introspect (не задан — эндпоинт отключён)
+    INTROSPECTION_MAX_TOKENS: int = 100  # Максимальное количество токенов в одном запросе интроспекции
 
     # --- Email ---
     EMAIL_TEMPLATES: str  # Путь к шаблонам email-сообщений
@@ -61,12 +93,79 @@ class Settings(BaseSettings):
     SMTP_HOST: str  # Хост SMTP-сервера
     SMTP_PORT: int  # Порт SMTP-сервера
 
+    # --- Email-рассылки ---
+    BROADCAST_SMTP_CONNECTIONS: int = 4  # Количество одновременно открытых SMTP-сессий рассылки
+    BROADCAST_BATCH_SIZE: int = 500  # Количество получателей, загружаемых из базы данных за один запрос
+    BROADCAST_MESSAGES_PER_CONNECTION: int = 100  # Количество писем, после которого SMTP-сессия открывается заново
+    BROADCAST_LEASE_TIMEOUT: int = 120  # Срок аренды рассылки, после которого её может продолжить другой процесс (в секундах)
+
+    # --- Журнал событий аутентификации ---
+    AUDIT_ENABLED: bool = True  # Включение журнала событий аутентификации (auth_events)
+    AUDIT_QUEUE_SIZE: int = 10000  # Максимальное количество событий, ожидающих записи в памяти
+    AUDIT_BATCH_SIZE: int = 500  # Количество событий, при накоплении которого выполняется запись
+    AUDIT_FLUSH_INTERVAL: float = 2.0  # Максимальный интервал между записями событий (в секундах)
+    AUDIT_OVERFLOW_POLICY: Literal["drop_newest", "drop_oldest"] = (
+        "drop_newest"  # Отбрасываемые при переполнении очереди события
+    )
+
+    # --- Активность пользователей ---
+    ACTIVITY_TRACKING_ENABLED: bool = True  # Включение учёта времени последней активности пользователей
+    ACTIVITY_FLUSH_INTERVAL: int = 10  # Интервал пакетной записи активности в базу данных (в секундах)
+    ACTIVITY_MIN_RESOLUTION: int = 60  # Минимальный интервал между записями активности одного пользователя (в секундах)
+
+    # --- Обслуживание ---
+    REAPER_ENABLED: bool = True  # Включение периодической очистки просроченных токенов и неподтверждённых пользователей
+    REAPER_INTERVAL: int = 3600  # Интервал запуска очистки (в секундах)
+    REAPER_BATCH_SIZE: int = 500  # Максимальное количество пользователей, обрабатываемых одним запросом
+    REAPER_MAX_BATCHES: int = 20  # Максимальное количество пакетов каждого вида за один запуск
+    UNCONFIRMED_USER_RETENTION: int = 168  # Срок хранения пользователей с неподтверждённым email (в часах)
+
+    # --- Сервер ---
+    SERVER_HOST: str = "0.0.0.0"  # Адрес, на котором запускается сервер
+    SERVER_PORT: int = 8000  # Порт сервера
+    SERVER_WORKERS: int = 0  # Количество рабочих процессов (0 — по числу ядер процессора)
+    SERVER_PRELOAD: bool = True  # Загрузка приложения в мастер-процессе до запуска воркеров (требует gunicorn)
+    SERVER_KEEPALIVE_TIMEOUT: int = 5  # Время удержания keep-alive соединения (в секундах)
+    SERVER_BACKLOG: int = 2048  # Максимальная длина очереди входящих соединений
+    SERVER_GRACEFUL_SHUTDOWN_TIMEOUT: int = 30  # Время на корректное завершение запросов при остановке (в секундах)
+
     # --- Frontend ---
     FRONTEND_URL: str  # URL фронтенд-приложения
 
     # --- Ограничения ---
     ENABLE_RATE_LIMITER: bool  # Включение ограничителя частоты запросов
 
+    # --- Блокировка входа ---
+    LOGIN_LOCKOUT_ENABLED: bool = True  # Временная блокировка входа в учётную запись после серии неудачных попыток
+    LOGIN_LOCKOUT_THRESHOLD: int = 5  # Количество неудачных попыток подряд, после которого вход блокируется
+    LOGIN_LOCKOUT_BASE_DELAY: int = 30  # Длительность первой блокировки, удваивается с каждой следующей неудачей (в секундах)
+    LOGIN_LOCKOUT_MAX_DELAY: int = 900  # Максимальная длительность блокировки (в секундах)
+    LOGIN_LOCKOUT_RESET_AFTER: int = 3600  # Время без неудачных попыток, после которого счётчик сбрасывается (в секундах)
+    LOGIN_LOCKOUT_MAX_KEYS: int = 100000  # Максимальное количество отслеживаемых email в хранилище в памяти
+    LOGIN_LOCKOUT_STORE_BACKEND: Optional[str] = (
+        None  # Путь к классу общего хранилища (например, myproject.stores.RedisLockoutStore)
+    )
+
+    # --- Идемпотентность ---
+    IDEMPOTENCY_ENABLED: bool = True  # Поддержка заголовка Idempotency-Key для /auth/register и /auth/forgot-password
+    IDEMPOTENCY_TTL: int = 86400  # Время хранения ответа для повтора запроса с тем же ключом (в секундах)
+    IDEMPOTENCY_MAX_KEYS: int = 10000  # Максимальное количество ключей в хранилище в памяти
+    IDEMPOTENCY_KEY_MAX_LENGTH: int = 255  # Максимальная длина ключа идемпотентности
+    IDEMPOTENCY_STORE_BACKEND: Optional[str] = (
+        None  # Путь к классу общего хранилища (например, myproject.stores.RedisIdempotencyStore)
+    )
+
+    # --- Контроль нагрузки (bcrypt) ---
+    ADMISSION_CONTROL_ENABLED: bool = True  # Включение ограничения конкурентности хеширования паролей
+    ADMISSION_MAX_QUEUE_WAIT: float = 2.0  # Максимальное время ожидания слота в очереди (в секундах)
+    ADMISSION_RETRY_AFTER: int = 5  # Значение заголовка Retry-After при отклонении запроса (в секундах)
+    ADMISSION_LOGIN_CONCURRENCY: int = 4  # Одновременных проверок пароля для /auth/login
+    ADMISSION_LOGIN_QUEUE: int = 32  # Размер очереди ожидания для /auth/login
+    ADMISSION_REGISTER_CONCURRENCY: int = 2  # Одновременных хеширований пароля для /auth/register
+    ADMISSION_REGISTER_QUEUE: int = 16  # Размер очереди ожидания для /auth/register
+    ADMISSION_RESET_PASSWORD_CONCURRENCY: int = 2  # Одновременных операций с паролем для /auth/reset-password
+    ADMISSION_RESET_PASSWORD_QUEUE: int = 16  # Размер очереди ожидания для /auth/reset-password
+
 
 # Экземпляр настроек, инициализированный при загрузке модуля
 settings = Settings()
@@ -1,8 +1,15 @@
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 
 from src.config import settings
-
+from src.logs.logger import logger
 
 # Создание асинхронного движка SQLAlchemy для подключения к базе данных
 engine = create_async_engine(settings.DATABASE_URL)
@@ -10,10 +17,128 @@ engine = create_async_engine(settings.DATABASE_URL)
 # Фабрика сессий для создания асинхронных сессий SQLAlchemy
 get_async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Режим одного писателя для SQLite: записи выполняются фоновой задачей через соединения основного движка
+# (по одной транзакции за раз, см. src/sqlite_writer.py), чтения — через отдельный пул read-only соединений.
+# Очередь существует в памяти процесса, поэтому режим допускает только один рабочий процесс (см. src/serve.py)
+sqlite_single_writer = settings.DB_TYPE == "sqlite" and settings.DB_SQLITE_SINGLE_WRITER
+
+if sqlite_single_writer:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_sqlite_writer(dbapi_connection, connection_record) -> None:
+        # Транзакциями управляет SQLAlchemy, а не драйвер: без этого не работают SAVEPOINT
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin_sqlite_write(connection) -> None:
+        # Блокировка записи берётся в начале транзакции, а не при первом изменении
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+    read_engine = create_async_engine(
+        settings.DATABASE_URL.replace(":///", ":///file:", 1) + "?mode=ro&uri=true",
+        pool_size=settings.DB_SQLITE_READ_POOL_SIZE,
+    )
+else:
+    read_engine = engine
+
+# Фабрика сессий для чтений на основной базе
+get_read_session = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+# Признак того, что чтения в текущем контексте (запросе) должны выполняться на основной базе
+_primary_reads: ContextVar[bool] = ContextVar("primary_reads", default=False)
+
+
+class ReplicaRouter:
+    """
+    Маршрутизатор чтений по репликам базы данных.
+
+    Реплики выбираются по кругу (round-robin). Реплика, на которой произошла ошибка подключения,
+    исключается из ротации на `eject_seconds` секунд, после чего снова получает запросы.
+    """
+
+    def __init__(self, urls: list[str], eject_seconds: int):
+        self.eject_seconds = eject_seconds
+        self.engines: list[AsyncEngine] = [create_async_engine(url) for url in urls]
+        self._session_makers = [
+            sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False) for replica_engine in self.engines
+        ]
+        self._ejected_until = [0.0] * len(self.engines)
+        self._counter = itertools.count()
+
+    def choose(self) -> Optional[tuple[int, sessionmaker]]:
+        """
+        Выбирает следующую доступную реплику.
+
+        Returns:
+            Кортеж из индекса реплики и фабрики сессий или None, если доступных реплик нет.
+        """
+        count = len(self.engines)
+        now = time.monotonic()
+        for _ in range(count):
+            index = next(self._counter) % count
+            if self._ejected_until[index] <= now:
+                return index, self._session_makers[index]
+        return None
+
+    def eject(self, index: int, error: Exception) -> None:
+        """
+        Временно исключает реплику из ротации.
+
+        Args:
+            index: Индекс реплики.
+            error: Ошибка, из-за которой реплика исключается.
+        """
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+        logger.error(f"Реплика #{index} исключена на {self.eject_seconds} с: {type(error).__name__}: {error}")
+
+    async def dispose(self) -> None:
+        """
+        Освобождает соединения всех реплик.
+        """
+        for replica_engine in self.engines:
+            await replica_engine.dispose()
+
+
+replica_router = ReplicaRouter(settings.DB_REPLICA_URLS, settings.DB_REPLICA_EJECT_SECONDS)
+
+
+def is_primary_read_required() -> bool:
+    """
+    Проверяет, должны ли чтения в текущем контексте выполняться на основной базе.
+
+    Returns:
+        True, если в текущем контексте была запись или включён режим use_primary().
+    """
+    return _primary_reads.get()
+
+
+def mark_primary_write() -> None:
+    """
+    Отмечает запись в текущем контексте: последующие чтения в нём выполняются на основной базе (read-your-writes).
+    """
+    _primary_reads.set(True)
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """
+    Контекстный менеджер, направляющий все чтения внутри блока на основную базу.
+    """
+    token = _primary_reads.set(True)
+    try:
+        yield
+    finally:
+        _primary_reads.reset(token)
+
+
 class Base(DeclarativeBase):
     """
     Базовый класс для всех моделей SQLAlchemy.
 
     Используется для определения общей структуры моделей и их маппинга на таблицы базы данных.
     """
+
     pass
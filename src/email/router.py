@@ -1,24 +1,32 @@
-from uuid import uuid4
 from datetime import datetime, timedelta
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, status, Request
+from fastapi import APIRouter, Depends, Request, status
 
-from src.models import User
-from src.config import settings
-from src.logs.logger import logger
-from src.limits.limiter import limiter
+from src.audit.constants import AuthEventType
+from src.audit.writer import audit_writer
+from src.auth.constants import Permission
+from src.auth.dependencies import get_current_user, require_permissions
+from src.auth.principal import Principal
 from src.auth.services import UserRepository
-from src.auth.dependencies import get_current_user
-from src.email.schemas.responses import MessageResponse
-from src.email.schemas.requests import EmailConfirmationRequest
+from src.auth.utils.token_hasher import token_hasher
+from src.config import settings
+from src.email.constants import BroadcastStatus
+from src.email.schemas.requests import BroadcastCreateRequest, EmailConfirmationRequest
+from src.email.schemas.responses import BroadcastResponse, MessageResponse
+from src.email.services import EmailBroadcastRepository
+from src.email.utils.broadcaster import email_broadcaster
 from src.email.utils.email_handler import email_handler
 from src.exceptions import (
-    UserNotFoundException,
-    TooEarlyResendException,
+    BroadcastNotFoundException,
+    BroadcastStatusConflictException,
     EmailAlreadyConfirmedException,
     InvalidOrExpiredEmailTokenException,
+    TooEarlyResendException,
+    UserNotFoundException,
 )
-
+from src.limits.limiter import limiter
+from src.logs.logger import logger
 
 router = APIRouter(prefix="/email", tags=["Модуль работы с email"])
 
@@ -39,19 +47,24 @@ async def confirm_email(request: Request, data: EmailConfirmationRequest) -> Mes
     Raises:
         InvalidOrExpiredEmailTokenException: Если токен недействителен, истёк или пользователь не найден.
     """
-    user = await UserRepository.find_one_or_none(email=data.email, confirmation_token=str(data.confirmation_token))
+    user = await UserRepository.find_one_or_none(
+        email=data.email,
+        confirmation_token_hash=token_hasher.hash_token(str(data.confirmation_token)),
+    )
     if not user or user.email_confirmed:
+        audit_writer.record(AuthEventType.EMAIL_CONFIRMATION_FAILED, request, email=data.email, success=False)
         raise InvalidOrExpiredEmailTokenException
 
     created_at = user.confirmation_token_created_at
     if not created_at or datetime.now() - created_at > timedelta(hours=settings.EMAIL_CONFIRM_TOKEN_EXPIRE):
+        audit_writer.record(AuthEventType.EMAIL_CONFIRMATION_FAILED, request, email=data.email, user_id=user.id, success=False)
         raise InvalidOrExpiredEmailTokenException
 
     success = await UserRepository.update(
         id=user.id,
         email_confirmed=True,
         email_confirmed_at=datetime.now(),
-        confirmation_token=None,
+        confirmation_token_hash=None,
         confirmation_token_created_at=None,
     )
 
@@ -59,12 +72,14 @@ async def confirm_email(request: Request, data: EmailConfirmationRequest) -> Mes
         logger.error(f"Ошибка при подтверждении email: не удалось обновить пользователя с email {data.email}")
         raise InvalidOrExpiredEmailTokenException()
 
+    audit_writer.record(AuthEventType.EMAIL_CONFIRMED, request, email=user.email, user_id=user.id)
+
     return MessageResponse(message="Email успешно подтверждён")
 
 
 @router.post("/resend", response_model=MessageResponse, status_code=status.HTTP_200_OK)
 @limiter.limit("2/minute")
-async def resend_confirmation(request: Request, current_user: User = Depends(get_current_user)) -> MessageResponse:
+async def resend_confirmation(request: Request, current_user: Principal = Depends(get_current_user)) -> MessageResponse:
     """
     Повторно отправляет письмо для подтверждения email текущему пользователю.
 
@@ -80,7 +95,10 @@ async def resend_confirmation(request: Request, current_user: User = Depends(get
         EmailAlreadyConfirmedException: Если email уже подтверждён.
         TooEarlyResendException: Если токен ещё действителен и повторная отправка невозможна.
     """
-    user = await UserRepository.find_one_or_none(email=current_user.email)
+    if current_user.email_confirmed:
+        raise EmailAlreadyConfirmedException
+
+    user = await UserRepository.find_by_email(current_user.email)
 
     if not user:
         raise UserNotFoundException
@@ -94,17 +112,105 @@ async def resend_confirmation(request: Request, current_user: User = Depends(get
 
     new_token = str(uuid4())
     created_at = datetime.now()
-    await UserRepository.update(id=user.id, confirmation_token=new_token, confirmation_token_created_at=created_at)
+    await UserRepository.update(
+        id=user.id,
+        confirmation_token_hash=token_hasher.hash_token(new_token),
+        confirmation_token_created_at=created_at,
+    )
+    audit_writer.record(AuthEventType.EMAIL_CONFIRMATION_RESENT, request, email=user.email, user_id=user.id)
 
     try:
         link = f"{settings.FRONTEND_URL}/email/confirm?email={user.email}&token={new_token}"
-        html_content = email_handler.render_template(
-            "confirm_email.html",
-            {"confirmation_link": link}
-        )
+        html_content = email_handler.render_template("confirm_email.html", {"confirmation_link": link})
         await email_handler.send_email(to=user.email, subject="Подтверждение регистрации", html_content=html_content)
     except Exception as e:
         logger.error(f"Ошибка отправки email для подтверждения регистрации ({user.email}): {type(e).__name__}: {e}")
         return MessageResponse(message="Если аккаунт существует, письмо отправлено повторно")
 
-    return MessageResponse(message="Если аккаунт существует, письмо отправлено повторно")
\ No newline at end of file
+    return MessageResponse(message="Если аккаунт существует, письмо отправлено повторно")
+
+
+@router.post("/broadcasts", response_model=BroadcastResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_broadcast(data: BroadcastCreateRequest, admin_user=Depends(require_permissions(Permission.BROADCASTS_MANAGE))):
+    """
+    Создаёт и запускает рассылку письма всем пользователям с подтверждённым email и без блокировки.
+
+    Args:
+        data: Тема, текст письма и (опционально) роль получателей.
+        admin_user: Текущий пользователь с правом управления рассылками.
+
+    Returns:
+        Созданная рассылка. Письма отправляются в фоновой задаче, прогресс доступен через GET /email/broadcasts/{id}.
+    """
+    broadcast = await EmailBroadcastRepository.add(
+        subject=data.subject,
+        message=data.message,
+        role_title=data.role_title,
+        status=BroadcastStatus.PENDING.value,
+    )
+    return await email_broadcaster.start(broadcast.id) or broadcast
+
+
+@router.get("/broadcasts/{broadcast_id}", response_model=BroadcastResponse, status_code=status.HTTP_200_OK)
+async def get_broadcast(broadcast_id: int, admin_user=Depends(require_permissions(Permission.BROADCASTS_MANAGE))):
+    """
+    Возвращает состояние и прогресс рассылки.
+
+    Args:
+        broadcast_id: Идентификатор рассылки.
+        admin_user: Текущий пользователь с правом управления рассылками.
+
+    Raises:
+        BroadcastNotFoundException: Если рассылка не найдена.
+    """
+    broadcast = await EmailBroadcastRepository.find_by_id(broadcast_id)
+    if not broadcast:
+        raise BroadcastNotFoundException(broadcast_id)
+    return broadcast
+
+
+@router.post("/broadcasts/{broadcast_id}/pause", response_model=BroadcastResponse, status_code=status.HTTP_200_OK)
+async def pause_broadcast(broadcast_id: int, admin_user=Depends(require_permissions(Permission.BROADCASTS_MANAGE))):
+    """
+    Приостанавливает выполняющуюся рассылку. Текущая страница получателей досылается в фоне,
+    после чего прогресс сохраняется и рассылку можно продолжить.
+
+    Args:
+        broadcast_id: Идентификатор рассылки.
+        admin_user: Текущий пользователь с правом управления рассылками.
+
+    Raises:
+        BroadcastNotFoundException: Если рассылка не найдена.
+        BroadcastStatusConflictException: Если рассылка не выполняется.
+    """
+    broadcast = await email_broadcaster.pause(broadcast_id)
+    if not broadcast:
+        existing = await EmailBroadcastRepository.find_by_id(broadcast_id)
+        if not existing:
+            raise BroadcastNotFoundException(broadcast_id)
+        raise BroadcastStatusConflictException(broadcast_id, existing.status)
+    return broadcast
+
+
+@router.post("/broadcasts/{broadcast_id}/resume", response_model=BroadcastResponse, status_code=status.HTTP_202_ACCEPTED)
+async def resume_broadcast(broadcast_id: int, admin_user=Depends(require_permissions(Permission.BROADCASTS_MANAGE))):
+    """
+    Продолжает приостановленную или завершившуюся ошибкой рассылку с последнего сохранённого получателя.
+    Рассылка, процесс-исполнитель которой аварийно завершился, продолжается после истечения аренды
+    (BROADCAST_LEASE_TIMEOUT).
+
+    Args:
+        broadcast_id: Идентификатор рассылки.
+        admin_user: Текущий пользователь с правом управления рассылками.
+
+    Raises:
+        BroadcastNotFoundException: Если рассылка не найдена.
+        BroadcastStatusConflictException: Если рассылка выполняется с действующей арендой или завершена.
+    """
+    broadcast = await email_broadcaster.start(broadcast_id)
+    if not broadcast:
+        existing = await EmailBroadcastRepository.find_by_id(broadcast_id)
+        if not existing:
+            raise BroadcastNotFoundException(broadcast_id)
+        raise BroadcastStatusConflictException(broadcast_id, existing.status)
+    return broadcast
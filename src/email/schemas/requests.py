@@ -1,8 +1,15 @@
+from typing import Optional
 from uuid import UUID
-from pydantic import BaseModel, EmailStr
+
+from pydantic import BaseModel, EmailStr, Field
 
 
 class EmailConfirmationRequest(BaseModel):
     email: EmailStr
     confirmation_token: UUID
-    
\ No newline at end of file
+
+
+class BroadcastCreateRequest(BaseModel):
+    subject: str = Field(min_length=1, max_length=255)
+    message: str = Field(min_length=1)
+    role_title: Optional[str] = None
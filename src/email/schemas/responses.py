@@ -1,5 +1,24 @@
+from datetime import datetime
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class MessageResponse(BaseModel):
     message: str
+
+
+class BroadcastResponse(BaseModel):
+    id: int
+    subject: str
+    role_title: Optional[str]
+    status: str
+    last_user_id: int
+    sent: int
+    failed: int
+    error: Optional[str]
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,132 @@
+from datetime import datetime
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import and_, case, or_, update
+
+from src.models import EmailBroadcast
+from src.services import BaseRepository
+
+
+class EmailBroadcastRepository(BaseRepository[EmailBroadcast]):
+    """
+    Репозиторий для выполнения CRUD-операций с моделью EmailBroadcast.
+    """
+
+    model = EmailBroadcast
+
+    @classmethod
+    async def transition(
+        cls,
+        broadcast_id: int,
+        from_statuses: Sequence[str],
+        held_by: Optional[UUID] = None,
+        **data: Any,
+    ) -> Optional[EmailBroadcast]:
+        """
+        Атомарно обновляет рассылку, только если она находится в одном из указанных статусов.
+
+        Args:
+            broadcast_id: Идентификатор рассылки.
+            from_statuses: Допустимые текущие статусы рассылки.
+            held_by: Идентификатор аренды (lease_id), которой должна принадлежать рассылка (None — без проверки).
+            **data: Обновляемые данные (например, status=...).
+
+        Returns:
+            Обновлённый экземпляр EmailBroadcast или None, если рассылка не найдена или её статус не подходит.
+
+        Notes:
+            Условие по статусу проверяется в том же UPDATE, поэтому одну рассылку не могут одновременно
+            запустить несколько воркеров.
+        """
+        query = update(cls.model).where(cls.model.id == broadcast_id, cls.model.status.in_(from_statuses))
+        if held_by is not None:
+            query = query.where(cls.model.lease_id == held_by)
+        result = await cls._execute_write(query.values(**data).returning(cls.model))
+        return result.scalars().one_or_none()
+
+    @classmethod
+    async def save_progress(
+        cls,
+        broadcast_id: int,
+        lease_id: UUID,
+        lease_expires_at: datetime,
+        running_status: str,
+        paused_status: str,
+        **progress: Any,
+    ) -> Optional[EmailBroadcast]:
+        """
+        Сохраняет прогресс выполняющейся рассылки и продлевает её аренду.
+
+        Args:
+            broadcast_id: Идентификатор рассылки.
+            lease_id: Идентификатор аренды запуска, сохраняющего прогресс.
+            lease_expires_at: Новый срок аренды.
+            running_status: Статус выполняющейся рассылки.
+            paused_status: Статус приостановленной рассылки.
+            **progress: Сохраняемый прогресс (last_user_id, счётчики).
+
+        Returns:
+            Обновлённый экземпляр EmailBroadcast или None, если аренда потеряна.
+
+        Notes:
+            Если рассылка приостановлена, аренда освобождается в том же UPDATE: продолжение рассылки
+            после этого начинается новым запуском, а не ожидает завершившийся.
+        """
+        paused = cls.model.status == paused_status
+        query = (
+            update(cls.model)
+            .where(
+                cls.model.id == broadcast_id,
+                cls.model.lease_id == lease_id,
+                cls.model.status.in_((running_status, paused_status)),
+            )
+            .values(
+                lease_id=case((paused, None), else_=cls.model.lease_id),
+                lease_expires_at=case((paused, None), else_=lease_expires_at),
+                **progress,
+            )
+            .returning(cls.model)
+        )
+        result = await cls._execute_write(query)
+        return result.scalars().one_or_none()
+
+    @classmethod
+    async def claim(
+        cls,
+        broadcast_id: int,
+        from_statuses: Sequence[str],
+        running_status: str,
+        now: datetime,
+        **data: Any,
+    ) -> Optional[EmailBroadcast]:
+        """
+        Атомарно захватывает рассылку для выполнения.
+
+        Args:
+            broadcast_id: Идентификатор рассылки.
+            from_statuses: Статусы, из которых рассылку можно запустить.
+            running_status: Статус выполняющейся рассылки.
+            now: Текущее время для проверки срока аренды.
+            **data: Обновляемые данные (новые статус и аренда).
+
+        Returns:
+            Обновлённый экземпляр EmailBroadcast или None, если рассылка не найдена, завершена
+            или выполняется с действующей арендой.
+
+        Notes:
+            Выполняющаяся рассылка с истёкшей арендой (процесс-исполнитель аварийно завершился) захватывается
+            так же, как приостановленная.
+        """
+        lease_expired = and_(
+            cls.model.status == running_status,
+            or_(cls.model.lease_expires_at.is_(None), cls.model.lease_expires_at < now),
+        )
+        query = (
+            update(cls.model)
+            .where(cls.model.id == broadcast_id, or_(cls.model.status.in_(from_statuses), lease_expired))
+            .values(**data)
+            .returning(cls.model)
+        )
+        result = await cls._execute_write(query)
+        return result.scalars().one_or_none()
@@ -0,0 +1,283 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID, uuid4
+
+from aiosmtplib import SMTP
+
+from src.auth.services import UserRepository
+from src.config import settings
+from src.email.constants import BroadcastStatus
+from src.email.services import EmailBroadcastRepository
+from src.email.utils.email_handler import email_handler
+from src.logs.logger import logger
+from src.models import EmailBroadcast
+
+
+class EmailBroadcaster:
+    """
+    Класс для выполнения email-рассылок всем пользователям с подтверждённым email.
+
+    Получатели загружаются из базы данных страницами по `batch_size` (keyset-пагинация по id), поэтому
+    в памяти одновременно находится не больше одной страницы. Письма отправляются `connections`
+    воркерами, каждый из которых переиспользует свою SMTP-сессию для `messages_per_connection` писем.
+
+    После отправки каждой страницы прогресс (id последнего получателя и счётчики) сохраняется в базе данных,
+    поэтому приостановленную или прерванную рассылку можно продолжить с места остановки.
+    При остановке приложения или аварийном завершении процесса письма текущей страницы могут быть отправлены повторно.
+
+    Выполняющаяся рассылка арендуется запуском (lease_id), который продлевает аренду каждую треть `lease_timeout`.
+    Если процесс-исполнитель аварийно завершился, по истечении аренды рассылку можно продолжить из любого процесса,
+    а прежний запуск, потерявший аренду, прекращает отправку.
+    """
+
+    def __init__(
+        self,
+        connections: int = settings.BROADCAST_SMTP_CONNECTIONS,
+        batch_size: int = settings.BROADCAST_BATCH_SIZE,
+        messages_per_connection: int = settings.BROADCAST_MESSAGES_PER_CONNECTION,
+        lease_timeout: int = settings.BROADCAST_LEASE_TIMEOUT,
+    ):
+        self.connections = connections
+        self.batch_size = batch_size
+        self.messages_per_connection = messages_per_connection
+        self.lease_timeout = lease_timeout
+
+        # Запуски рассылок в этом процессе: id рассылки -> (идентификатор аренды, задача)
+        self._runs: dict[int, tuple[UUID, asyncio.Task]] = {}
+
+    async def start(self, broadcast_id: int) -> Optional[EmailBroadcast]:
+        """
+        Запускает или продолжает рассылку в фоновой задаче.
+
+        Args:
+            broadcast_id: Идентификатор рассылки.
+
+        Returns:
+            Экземпляр EmailBroadcast в статусе running или None, если рассылку нельзя запустить
+            (она не найдена, завершена или выполняется с действующей арендой).
+
+        Notes:
+            Если приостановленная рассылка ещё досылает текущую страницу в этом процессе, она продолжается
+            тем же запуском, поэтому письма этой страницы не отправляются повторно.
+        """
+        run = self._runs.get(broadcast_id)
+        if run is not None:
+            broadcast = await EmailBroadcastRepository.transition(
+                broadcast_id,
+                (BroadcastStatus.PAUSED.value,),
+                held_by=run[0],
+                status=BroadcastStatus.RUNNING.value,
+            )
+            if broadcast:
+                return broadcast
+
+        now = datetime.now()
+        broadcast = await EmailBroadcastRepository.claim(
+            broadcast_id,
+            (BroadcastStatus.PENDING.value, BroadcastStatus.PAUSED.value, BroadcastStatus.FAILED.value),
+            BroadcastStatus.RUNNING.value,
+            now,
+            status=BroadcastStatus.RUNNING.value,
+            lease_id=uuid4(),
+            lease_expires_at=now + timedelta(seconds=self.lease_timeout),
+            started_at=now,
+            error=None,
+        )
+        if broadcast:
+            self._runs[broadcast.id] = (broadcast.lease_id, asyncio.create_task(self._run(broadcast)))
+        return broadcast
+
+    async def pause(self, broadcast_id: int) -> Optional[EmailBroadcast]:
+        """
+        Приостанавливает выполняющуюся рассылку после отправки текущей страницы получателей.
+
+        Args:
+            broadcast_id: Идентификатор рассылки.
+
+        Returns:
+            Экземпляр EmailBroadcast в статусе paused или None, если рассылка не выполняется.
+
+        Notes:
+            Метод не ожидает завершения страницы: рассылка (в том числе выполняющаяся в другом процессе)
+            проверяет статус при сохранении прогресса после каждой страницы и останавливается,
+            поэтому возвращённый прогресс может быть меньше итогового на одну страницу.
+        """
+        return await EmailBroadcastRepository.transition(
+            broadcast_id,
+            (BroadcastStatus.RUNNING.value,),
+            status=BroadcastStatus.PAUSED.value,
+        )
+
+    async def stop(self) -> None:
+        """
+        Прерывает все рассылки текущего процесса и переводит их в статус paused для последующего продолжения.
+        """
+        for _, task in list(self._runs.values()):
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._runs.clear()
+
+    async def _run(self, broadcast: EmailBroadcast) -> None:
+        """
+        Выполняет рассылку: загружает получателей страницами и передаёт их воркерам через ограниченную очередь.
+
+        Args:
+            broadcast: Запущенная рассылка.
+        """
+        html_content = email_handler.render_template(
+            "broadcast.html", {"subject": broadcast.subject, "message": broadcast.message}
+        )
+        counters = {"sent": broadcast.sent, "failed": broadcast.failed}
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self.batch_size)
+        workers = [
+            asyncio.create_task(self._worker(queue, broadcast.subject, html_content, counters)) for _ in range(self.connections)
+        ]
+        after_id = broadcast.last_user_id
+
+        try:
+            while True:
+                recipients = await UserRepository.find_broadcast_recipients(after_id, self.batch_size, broadcast.role_title)
+                if not recipients:
+                    break
+
+                for recipient in recipients:
+                    await queue.put(recipient.email)
+                if not await self._wait_holding_lease(broadcast, queue):
+                    # Аренда потеряна: рассылку продолжил другой запуск
+                    return
+
+                after_id = recipients[-1].id
+                checkpoint = await EmailBroadcastRepository.save_progress(
+                    broadcast.id,
+                    broadcast.lease_id,
+                    datetime.now() + timedelta(seconds=self.lease_timeout),
+                    BroadcastStatus.RUNNING.value,
+                    BroadcastStatus.PAUSED.value,
+                    last_user_id=after_id,
+                    sent=counters["sent"],
+                    failed=counters["failed"],
+                )
+                if not checkpoint or checkpoint.status != BroadcastStatus.RUNNING.value:
+                    # Рассылка приостановлена: прогресс сохранён и аренда освобождена,
+                    # продолжение начнётся со следующей страницы
+                    return
+
+            await EmailBroadcastRepository.transition(
+                broadcast.id,
+                (BroadcastStatus.RUNNING.value,),
+                held_by=broadcast.lease_id,
+                status=BroadcastStatus.COMPLETED.value,
+                finished_at=datetime.now(),
+            )
+        except asyncio.CancelledError:
+            # Остановка приложения: рассылка переводится в статус paused, если аренда ещё принадлежит этому запуску
+            await EmailBroadcastRepository.transition(
+                broadcast.id,
+                (BroadcastStatus.RUNNING.value,),
+                held_by=broadcast.lease_id,
+                status=BroadcastStatus.PAUSED.value,
+            )
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка при выполнении рассылки {broadcast.id}: {type(e).__name__}: {e}")
+            await EmailBroadcastRepository.transition(
+                broadcast.id,
+                (BroadcastStatus.RUNNING.value,),
+                held_by=broadcast.lease_id,
+                status=BroadcastStatus.FAILED.value,
+                error=f"{type(e).__name__}: {e}",
+            )
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            if self._runs.get(broadcast.id, (None, None))[1] is asyncio.current_task():
+                del self._runs[broadcast.id]
+
+    async def _wait_holding_lease(self, broadcast: EmailBroadcast, queue: asyncio.Queue) -> bool:
+        """
+        Ожидает отправки всех писем из очереди, продлевая аренду рассылки каждую треть срока аренды.
+
+        Args:
+            broadcast: Выполняющаяся рассылка.
+            queue: Очередь адресов получателей.
+
+        Returns:
+            True, если письма отправлены, или False, если аренда потеряна.
+        """
+        sending = asyncio.ensure_future(queue.join())
+        try:
+            while True:
+                done, _ = await asyncio.wait({sending}, timeout=self.lease_timeout / 3)
+                if done:
+                    return True
+                renewed = await EmailBroadcastRepository.transition(
+                    broadcast.id,
+                    (BroadcastStatus.RUNNING.value, BroadcastStatus.PAUSED.value),
+                    held_by=broadcast.lease_id,
+                    lease_expires_at=datetime.now() + timedelta(seconds=self.lease_timeout),
+                )
+                if not renewed:
+                    return False
+        finally:
+            sending.cancel()
+
+    async def _worker(self, queue: asyncio.Queue, subject: str, html_content: str, counters: dict) -> None:
+        """
+        Отправляет письма из очереди через одну переиспользуемую SMTP-сессию.
+
+        Args:
+            queue: Очередь адресов получателей.
+            subject: Тема письма.
+            html_content: HTML-содержимое письма.
+            counters: Общие счётчики отправленных и неотправленных писем.
+
+        Notes:
+            При ошибке сессия закрывается, и письмо один раз отправляется повторно через новую сессию
+            (сервер может закрыть простаивающее соединение).
+        """
+        smtp: Optional[SMTP] = None
+        sent_on_connection = 0
+        try:
+            while True:
+                to = await queue.get()
+                try:
+                    for attempt in range(2):
+                        try:
+                            if smtp is None or sent_on_connection >= self.messages_per_connection:
+                                await self._close(smtp)
+                                smtp = await email_handler.connect()
+                                sent_on_connection = 0
+                            await smtp.send_message(email_handler.build_message(to, subject, html_content))
+                            sent_on_connection += 1
+                            counters["sent"] += 1
+                            break
+                        except Exception as e:
+                            await self._close(smtp)
+                            smtp = None
+                            if attempt:
+                                counters["failed"] += 1
+                                logger.error(f"[SMTP] Ошибка при отправке рассылки на {to}: {type(e).__name__}: {e}")
+                finally:
+                    queue.task_done()
+        finally:
+            await self._close(smtp)
+
+    @staticmethod
+    async def _close(smtp: Optional[SMTP]) -> None:
+        """
+        Закрывает SMTP-сессию, игнорируя ошибки (соединение могло быть уже разорвано сервером).
+        """
+        if smtp is None:
+            return
+        try:
+            await smtp.quit()
+        except Exception:
+            smtp.close()
+
+
+email_broadcaster = EmailBroadcaster()
@@ -1,9 +1,9 @@
 import socket
-
 from email.mime.text import MIMEText
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+
 from aiosmtplib import SMTP, SMTPAuthenticationError, SMTPConnectError, SMTPException
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from src.config import settings
 from src.logs.logger import logger
@@ -30,16 +30,13 @@ class EmailHandler:
         self.smtp_username = smtp_username
         self.smtp_password = smtp_password
         self.email_from = email_from
-        self.env = Environment(
-            loader=FileSystemLoader(template_path),
-            autoescape=select_autoescape(["html", "xml"])
-        )
+        self.env = Environment(loader=FileSystemLoader(template_path), autoescape=select_autoescape(["html", "xml"]))
 
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
         retry=retry_if_exception_type((SMTPException, socket.gaierror, TimeoutError, ConnectionRefusedError)),
-        reraise=True
+        reraise=True,
     )
     async def send_email(self, to: str, subject: str, html_content: str) -> None:
         """
@@ -60,20 +57,10 @@ class EmailHandler:
             TimeoutError: Превышено время ожидания подключения.
             Exception: Необработанная ошибка при отправке.
         """
-        msg = MIMEText(html_content, "html")
-        msg["Subject"] = subject
-        msg["From"] = self.email_from
-        msg["To"] = to
+        msg = self.build_message(to, subject, html_content)
 
         try:
-            smtp = SMTP(
-                hostname=self.smtp_host,
-                port=self.smtp_port,
-                timeout=10,
-                start_tls=True
-            )
-            await smtp.connect()
-            await smtp.login(self.smtp_username, self.smtp_password)
+            smtp = await self.connect()
             await smtp.send_message(msg)
             await smtp.quit()
         except SMTPAuthenticationError as e:
@@ -92,6 +79,36 @@ class EmailHandler:
             logger.exception(f"[SMTP] Неизвестная ошибка при отправке на {to}: {type(e).__name__}: {e}")
             raise
 
+    async def connect(self) -> SMTP:
+        """
+        Открывает SMTP-сессию с авторизацией. Сессия может использоваться для отправки нескольких писем.
+
+        Returns:
+            Подключённый и авторизованный клиент SMTP. Закрывается вызывающим кодом через quit().
+        """
+        smtp = SMTP(hostname=self.smtp_host, port=self.smtp_port, timeout=10, start_tls=True)
+        await smtp.connect()
+        await smtp.login(self.smtp_username, self.smtp_password)
+        return smtp
+
+    def build_message(self, to: str, subject: str, html_content: str) -> MIMEText:
+        """
+        Формирует HTML-письмо.
+
+        Args:
+            to: Адрес получателя.
+            subject: Тема письма.
+            html_content: HTML-содержимое письма.
+
+        Returns:
+            Письмо с заполненными заголовками Subject, From и To.
+        """
+        msg = MIMEText(html_content, "html")
+        msg["Subject"] = subject
+        msg["From"] = self.email_from
+        msg["To"] = to
+        return msg
+
     def render_template(self, template_name: str, context: dict) -> str:
         """
         Рендерит HTML-шаблон с использованием Jinja2.
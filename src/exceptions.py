@@ -12,8 +12,10 @@ class ProjectException(HTTPException):
         self.expose_to_client = expose_to_client
         super().__init__(status_code=self.status_code, detail=self.detail)
 
+
 # --- Ошибки, связанные с пользователями ---
 
+
 class UserAlreadyExistsException(ProjectException):
     status_code = status.HTTP_409_CONFLICT
 
@@ -32,8 +34,10 @@ class UserHasNoRightsException(ProjectException):
     status_code = status.HTTP_403_FORBIDDEN
     detail = "Доступ запрещён"
 
+
 # --- Ошибки, связанные с паролем ---
 
+
 class PasswordValidationErrorException(ProjectException):
     status_code = status.HTTP_400_BAD_REQUEST
 
@@ -45,19 +49,32 @@ class PasswordIdenticalToPreviousException(ProjectException):
     status_code = status.HTTP_400_BAD_REQUEST
     detail = "Пароль должен отличаться от предыдущего"
 
+
 # --- Ошибки, связанные с токенами сброса пароля ---
 
+
 class InvalidPasswordResetTokenException(ProjectException):
     status_code = status.HTTP_400_BAD_REQUEST
     detail = "Ссылка для сброса пароля недействительна"
 
+
 # --- Ошибки, связанные с авторизацией и аутентификацией ---
 
+
 class InvalidCredentialsException(ProjectException):
     status_code = status.HTTP_401_UNAUTHORIZED
     detail = "Неверные учётные данные"
 
 
+class AccountTemporarilyLockedException(ProjectException):
+    status_code = status.HTTP_429_TOO_MANY_REQUESTS
+    detail = "Слишком много неудачных попыток входа. Вход временно заблокирован"
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.headers = {"Retry-After": str(retry_after)}
+
+
 class RefreshTokenNotFoundException(ProjectException):
     status_code = status.HTTP_401_UNAUTHORIZED
     detail = "Токен обновления не предоставлен"
@@ -92,8 +109,15 @@ class InvalidEmailException(ProjectException):
     status_code = status.HTTP_400_BAD_REQUEST
     detail = "Некорректный email"
 
+
+class IntrospectionNotAllowedException(ProjectException):
+    status_code = status.HTTP_403_FORBIDDEN
+    detail = "Интроспекция токенов недоступна"
+
+
 # --- Ошибки, связанные с подтверждением email ---
 
+
 class InvalidOrExpiredEmailTokenException(ProjectException):
     status_code = status.HTTP_400_BAD_REQUEST
     detail = "Ссылка подтверждения недействительна или устарела"
@@ -108,11 +132,54 @@ class TooEarlyResendException(ProjectException):
     status_code = status.HTTP_429_TOO_MANY_REQUESTS
     detail = "Слишком частые попытки. Попробуйте позже"
 
+
+# --- Ошибки, связанные с email-рассылками ---
+
+
+class BroadcastNotFoundException(ProjectException):
+    status_code = status.HTTP_404_NOT_FOUND
+
+    def __init__(self, broadcast_id: int):
+        super().__init__(detail=f"Рассылка {broadcast_id} не найдена")
+
+
+class BroadcastStatusConflictException(ProjectException):
+    status_code = status.HTTP_409_CONFLICT
+
+    def __init__(self, broadcast_id: int, broadcast_status: str):
+        super().__init__(detail=f"Действие недоступно для рассылки {broadcast_id} в статусе {broadcast_status}")
+
+
+# --- Ошибки, связанные с нагрузкой ---
+
+
+class ServiceOverloadedException(ProjectException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    detail = "Сервер перегружен. Попробуйте позже"
+
+    def __init__(self, retry_after: int):
+        super().__init__()
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+# --- Ошибки, связанные с ключами идемпотентности ---
+
+
+class InvalidIdempotencyKeyException(ProjectException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    detail = "Недопустимый ключ идемпотентности (Idempotency-Key)"
+
+
+class IdempotencyKeyReusedException(ProjectException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    detail = "Ключ идемпотентности (Idempotency-Key) уже использован для другого запроса"
+
+
 # --- Общие/внутренние ошибки ---
 
+
 class InternalServerErrorException(ProjectException):
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
 
     def __init__(self, reason: str = "Внутренняя ошибка сервера"):
         super().__init__(detail=reason, expose_to_client=False)
-    
\ No newline at end of file
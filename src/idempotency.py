@@ -0,0 +1,125 @@
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+
+from src.config import settings
+from src.exceptions import IdempotencyKeyReusedException, InvalidIdempotencyKeyException
+from src.single_flight import SingleFlight
+from src.stores import load_store
+
+
+class IdempotencyStore(ABC):
+    """
+    Интерфейс хранилища сохранённых ответов для заголовка Idempotency-Key.
+
+    Общее хранилище для нескольких воркеров (например, Redis) реализуется подклассом с асинхронными
+    методами get и set и указывается в IDEMPOTENCY_STORE_BACKEND как путь для импорта
+    (например, "myproject.stores.RedisIdempotencyStore"). Класс создаётся без аргументов.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[dict]:
+        """
+        Возвращает сохранённую запись или None, если ключ не найден или срок его хранения истёк.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: dict, ttl: int) -> None:
+        """
+        Сохраняет запись (JSON-совместимый словарь) на `ttl` секунд.
+        """
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """
+    Хранилище сохранённых ответов в памяти воркера.
+
+    Хранит не более `max_size` ключей: при переполнении удаляются самые старые записи.
+    """
+
+    def __init__(self, max_size: int = settings.IDEMPOTENCY_MAX_KEYS):
+        self.max_size = max_size
+        self._items: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[dict]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if time.monotonic() > expires_at:
+            self._items.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: dict, ttl: int) -> None:
+        self._items[key] = (time.monotonic() + ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+
+idempotency_store = load_store(settings.IDEMPOTENCY_STORE_BACKEND, IdempotencyStore, MemoryIdempotencyStore)
+
+# Одновременные повторы с одним ключом в пределах воркера ожидают первый запрос, а не выполняются параллельно
+_idempotency_flight = SingleFlight("idempotency", enabled=settings.IDEMPOTENCY_ENABLED)
+
+
+def idempotent(func: Callable) -> Callable:
+    """
+    Декоратор эндпоинта, добавляющий поддержку заголовка Idempotency-Key.
+
+    Успешный ответ на запрос с заголовком сохраняется на IDEMPOTENCY_TTL секунд вместе с хешем тела запроса.
+    Повтор запроса с тем же ключом и телом возвращает сохранённый ответ без выполнения эндпоинта
+    (без обращений к базе данных, хеширования паролей, генерации токенов и отправки писем).
+    Запросы без заголовка и ответы с ошибками не сохраняются.
+
+    Args:
+        func: Эндпоинт FastAPI с параметром `request: Request`, возвращающий JSON-совместимый ответ.
+
+    Returns:
+        Обёрнутый эндпоинт.
+
+    Raises:
+        InvalidIdempotencyKeyException: Если ключ длиннее IDEMPOTENCY_KEY_MAX_LENGTH символов.
+        IdempotencyKeyReusedException: Если ключ уже использован с другим телом запроса.
+
+    Notes:
+        Декоратор размещается над декоратором лимитера, чтобы повторы не расходовали лимит запросов.
+    """
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        request: Request = kwargs["request"]
+        key = request.headers.get("idempotency-key")
+        if not settings.IDEMPOTENCY_ENABLED or not key:
+            return await func(*args, **kwargs)
+        if len(key) > settings.IDEMPOTENCY_KEY_MAX_LENGTH:
+            raise InvalidIdempotencyKeyException
+
+        store_key = f"{request.url.path}:{key}"
+        fingerprint = hashlib.sha256(await request.body()).hexdigest()
+
+        async def execute() -> Any:
+            stored = await idempotency_store.get(store_key)
+            if stored is not None:
+                if stored["fingerprint"] != fingerprint:
+                    raise IdempotencyKeyReusedException
+                return stored["content"]
+
+            content = jsonable_encoder(await func(*args, **kwargs))
+            await idempotency_store.set(
+                store_key,
+                {"fingerprint": fingerprint, "content": content},
+                settings.IDEMPOTENCY_TTL,
+            )
+            return content
+
+        return await _idempotency_flight.do((store_key, fingerprint), execute)
+
+    return wrapper
@@ -0,0 +1,115 @@
+import asyncio
+from typing import Any, Callable, TypeVar
+
+from src.config import settings
+from src.exceptions import ServiceOverloadedException
+
+T = TypeVar("T")
+
+
+class AdmissionController:
+    """
+    Ограничитель конкурентности для CPU-ёмких операций (хеширование и проверка паролей bcrypt).
+
+    Одновременно выполняется не более `max_concurrency` операций, остальные ожидают в очереди
+    ограниченного размера не дольше `max_wait` секунд. Запросы сверх лимита отклоняются сразу,
+    поэтому всплеск нагрузки на эндпоинты входа и регистрации не влияет на остальные эндпоинты воркера.
+    """
+
+    def __init__(
+        self, name: str, max_concurrency: int, max_queue: int, max_wait: float, retry_after: int, enabled: bool = True
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.retry_after = retry_after
+        self.enabled = enabled
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queued = 0
+        self._active = 0
+
+        # Счётчики для мониторинга
+        self.admitted = 0
+        self.shed_queue_full = 0
+        self.shed_timeout = 0
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Выполняет синхронную функцию в пуле потоков, соблюдая лимит конкурентности группы.
+
+        Args:
+            func: Синхронная CPU-ёмкая функция (например, password_handler.hash_password).
+            *args: Позиционные аргументы функции.
+
+        Returns:
+            Результат выполнения функции.
+
+        Raises:
+            ServiceOverloadedException: Если очередь ожидания заполнена или время ожидания слота истекло.
+        """
+        if not self.enabled:
+            return await asyncio.to_thread(func, *args)
+
+        if self._active + self._queued >= self.max_concurrency + self.max_queue:
+            self.shed_queue_full += 1
+            raise ServiceOverloadedException(retry_after=self.retry_after)
+
+        self._queued += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.shed_timeout += 1
+            raise ServiceOverloadedException(retry_after=self.retry_after)
+        finally:
+            self._queued -= 1
+
+        self._active += 1
+        self.admitted += 1
+        try:
+            return await asyncio.to_thread(func, *args)
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        """
+        Возвращает текущее состояние группы для мониторинга.
+
+        Returns:
+            Словарь с размером очереди, числом активных операций и счётчиками отклонённых запросов.
+        """
+        return {
+            "name": self.name,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self._active,
+            "queued": self._queued,
+            "admitted": self.admitted,
+            "shed_queue_full": self.shed_queue_full,
+            "shed_timeout": self.shed_timeout,
+        }
+
+
+def _create_controller(name: str, max_concurrency: int, max_queue: int) -> AdmissionController:
+    return AdmissionController(
+        name=name,
+        max_concurrency=max_concurrency,
+        max_queue=max_queue,
+        max_wait=settings.ADMISSION_MAX_QUEUE_WAIT,
+        retry_after=settings.ADMISSION_RETRY_AFTER,
+        enabled=settings.ADMISSION_CONTROL_ENABLED,
+    )
+
+
+# Группы эндпоинтов с независимыми лимитами
+login_admission = _create_controller("login", settings.ADMISSION_LOGIN_CONCURRENCY, settings.ADMISSION_LOGIN_QUEUE)
+register_admission = _create_controller("register", settings.ADMISSION_REGISTER_CONCURRENCY, settings.ADMISSION_REGISTER_QUEUE)
+reset_password_admission = _create_controller(
+    "reset_password",
+    settings.ADMISSION_RESET_PASSWORD_CONCURRENCY,
+    settings.ADMISSION_RESET_PASSWORD_QUEUE,
+)
+
+admission_groups = (login_admission, register_admission, reset_password_admission)
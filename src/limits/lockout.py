@@ -0,0 +1,183 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from src.config import settings
+from src.exceptions import AccountTemporarilyLockedException
+from src.stores import load_store
+
+
+class LockoutStore(ABC):
+    """
+    Интерфейс хранилища счётчиков неудачных входов.
+
+    Общее хранилище для нескольких воркеров (например, Redis) реализуется подклассом с асинхронными
+    методами get, set и delete и указывается в LOGIN_LOCKOUT_STORE_BACKEND как путь для импорта
+    (например, "myproject.stores.RedisLockoutStore"). Класс создаётся без аргументов.
+    """
+
+    @abstractmethod
+    async def get(self, email: str) -> Optional[dict]:
+        """
+        Возвращает состояние счётчика (failures, locked_until) или None, если записи нет или она истекла.
+        """
+
+    @abstractmethod
+    async def set(self, email: str, state: dict, expires_at: float) -> None:
+        """
+        Сохраняет состояние счётчика до момента `expires_at` (Unix-время).
+        """
+
+    @abstractmethod
+    async def delete(self, email: str) -> None:
+        """
+        Удаляет счётчик (после успешного входа).
+        """
+
+
+class MemoryLockoutStore(LockoutStore):
+    """
+    Хранилище счётчиков неудачных входов в памяти воркера.
+
+    Истёкшие записи удаляются при обращении к ним и при каждой записи (от давно не обновлявшихся к новым),
+    а при превышении `max_size` записей удаляются самые давно обновлённые.
+    """
+
+    def __init__(self, max_size: int = settings.LOGIN_LOCKOUT_MAX_KEYS):
+        self.max_size = max_size
+        self._items: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def get(self, email: str) -> Optional[dict]:
+        item = self._items.get(email)
+        if item is None:
+            return None
+        if item[0] <= time.time():
+            del self._items[email]
+            return None
+        return item[1]
+
+    async def set(self, email: str, state: dict, expires_at: float) -> None:
+        self._items[email] = (expires_at, state)
+        self._items.move_to_end(email)
+        now = time.time()
+        while self._items and (len(self._items) > self.max_size or next(iter(self._items.values()))[0] <= now):
+            self._items.popitem(last=False)
+
+    async def delete(self, email: str) -> None:
+        self._items.pop(email, None)
+
+
+class LoginLockout:
+    """
+    Класс для временной блокировки входа в учётную запись после серии неудачных попыток.
+
+    Счётчик ведётся по email (а не по IP-адресу), поэтому распределённый подбор паролей к одной учётной записи
+    также блокируется. После `threshold` неудачных попыток подряд вход блокируется на `base_delay` секунд,
+    и каждая следующая неудача удваивает блокировку (не более `max_delay` секунд). Счётчик сбрасывается
+    после успешного входа или через `reset_after` секунд без неудачных попыток.
+
+    Проверка выполняется до поиска пользователя и проверки пароля bcrypt, поэтому попытки входа
+    в заблокированную учётную запись почти не расходуют CPU.
+    """
+
+    def __init__(
+        self,
+        store: LockoutStore,
+        threshold: int = settings.LOGIN_LOCKOUT_THRESHOLD,
+        base_delay: int = settings.LOGIN_LOCKOUT_BASE_DELAY,
+        max_delay: int = settings.LOGIN_LOCKOUT_MAX_DELAY,
+        reset_after: int = settings.LOGIN_LOCKOUT_RESET_AFTER,
+        enabled: bool = settings.LOGIN_LOCKOUT_ENABLED,
+    ):
+        self.store = store
+        self.threshold = threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.reset_after = reset_after
+        self.enabled = enabled
+
+        # Счётчики для мониторинга
+        self.failures = 0
+        self.lockouts = 0
+        self.rejected = 0
+
+    async def check(self, email: str) -> None:
+        """
+        Проверяет, не заблокирован ли вход в учётную запись.
+
+        Args:
+            email: Email, указанный при входе.
+
+        Raises:
+            AccountTemporarilyLockedException: Если вход временно заблокирован (с заголовком Retry-After).
+        """
+        if not self.enabled:
+            return
+        state = await self.store.get(email.lower())
+        if state is None:
+            return
+        remaining = state["locked_until"] - time.time()
+        if remaining > 0:
+            self.rejected += 1
+            raise AccountTemporarilyLockedException(retry_after=math.ceil(remaining))
+
+    async def register_failure(self, email: str) -> None:
+        """
+        Учитывает неудачную попытку входа и при достижении порога блокирует вход.
+
+        Args:
+            email: Email, указанный при входе.
+        """
+        if not self.enabled:
+            return
+        key = email.lower()
+        now = time.time()
+        state = await self.store.get(key) or {"failures": 0, "locked_until": 0.0}
+
+        failures = state["failures"] + 1
+        locked_until = state["locked_until"]
+        if failures >= self.threshold:
+            delay = min(self.base_delay * 2 ** (failures - self.threshold), self.max_delay)
+            locked_until = now + delay
+            self.lockouts += 1
+
+        self.failures += 1
+        await self.store.set(
+            key,
+            {"failures": failures, "locked_until": locked_until},
+            max(now + self.reset_after, locked_until),
+        )
+
+    async def reset(self, email: str) -> None:
+        """
+        Сбрасывает счётчик после успешного входа.
+
+        Args:
+            email: Email пользователя.
+        """
+        if self.enabled:
+            await self.store.delete(email.lower())
+
+    def stats(self) -> dict:
+        """
+        Возвращает счётчики блокировок для мониторинга.
+
+        Returns:
+            Словарь с количеством неудачных попыток, блокировок и отклонённых без проверки пароля попыток
+            (и количеством отслеживаемых email для хранилища в памяти).
+        """
+        return {
+            "enabled": self.enabled,
+            "tracked": len(self.store) if isinstance(self.store, MemoryLockoutStore) else None,
+            "failures": self.failures,
+            "lockouts": self.lockouts,
+            "rejected": self.rejected,
+        }
+
+
+login_lockout = LoginLockout(load_store(settings.LOGIN_LOCKOUT_STORE_BACKEND, LockoutStore, MemoryLockoutStore))
@@ -1,15 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from contextlib import asynccontextmanager
 from slowapi.errors import RateLimitExceeded
 
-from src.database import engine
-from src.logs.logger import logger
-from src.exceptions import ProjectException
+from src.audit.router import router as audit_router
+from src.audit.writer import audit_writer
+from src.auth.middleware import SlidingRenewalMiddleware
 from src.auth.router import router as auth_router
+from src.config import settings
+from src.database import engine, read_engine, replica_router
 from src.email.router import router as email_router
-from src.users.router import router as users_router
+from src.email.utils.broadcaster import email_broadcaster
+from src.exceptions import ProjectException
 from src.limits.limiter import limiter, rate_limit_exceeded_handler
+from src.logs.logger import logger
+from src.maintenance.reaper import reaper
+from src.monitoring.router import router as monitoring_router
+from src.sqlite_writer import sqlite_writer
+from src.users.router import router as users_router
+from src.users.utils.activity_tracker import activity_tracker
+from src.well_known.router import router as well_known_router
 
 
 # Контекстный менеджер для управления жизненным циклом приложения
@@ -17,20 +28,40 @@ from src.limits.limiter import limiter, rate_limit_exceeded_handler
 async def lifespan(app: FastAPI):
     """
     Управляет подключением и отключением ресурсов приложения.
-    При завершении работы приложения освобождает соединение с базой данных.
+    Запускает фоновую запись активности пользователей, журнала событий аутентификации и очистку
+    устаревших данных, а при завершении работы приложения приостанавливает email-рассылки, записывает
+    оставшиеся активность и события и освобождает соединения с базой данных и репликами.
     """
+    activity_tracker.start()
+    audit_writer.start()
+    reaper.start()
     yield
+    await reaper.stop()
+    await email_broadcaster.stop()
+    await activity_tracker.stop()
+    await audit_writer.stop()
+    await sqlite_writer.stop()
     await engine.dispose()
+    await read_engine.dispose()
+    await replica_router.dispose()
 
 
 # Инициализация приложения FastAPI
 app = FastAPI(lifespan=lifespan)
 
 
+# Скользящее продление access-токенов в ответах на обычные запросы
+if settings.JWT_SLIDING_RENEWAL_ENABLED:
+    app.add_middleware(SlidingRenewalMiddleware)
+
+
 # Подключение роутеров
 app.include_router(auth_router)
 app.include_router(email_router)
 app.include_router(users_router)
+app.include_router(monitoring_router)
+app.include_router(audit_router)
+app.include_router(well_known_router)
 
 
 @app.exception_handler(ProjectException)
@@ -41,15 +72,12 @@ async def project_exception_handler(request: Request, exc: ProjectException):
     Возвращает JSON-ответ с деталями ошибки или общим сообщением.
     """
     if not exc.expose_to_client:
-        logger.error(
-            f"{request.method} {request.url} — {type(exc).__name__}: {exc.detail}"
-        )
+        logger.error(f"{request.method} {request.url} — {type(exc).__name__}: {exc.detail}")
 
     return JSONResponse(
         status_code=exc.status_code,
-        content={
-            "error": exc.detail if exc.expose_to_client else "Ошибка на сервере. Попробуйте позже."
-        }
+        content={"error": exc.detail if exc.expose_to_client else "Ошибка на сервере. Попробуйте позже."},
+        headers=exc.headers,
     )
 
 
@@ -0,0 +1,161 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from src.auth.services import UserRepository
+from src.config import settings
+from src.database import engine
+from src.logs.logger import logger
+from src.sqlite_writer import sqlite_writer
+
+
+class Reaper:
+    """
+    Класс для периодической очистки устаревших данных пользователей.
+
+    Удаляет просроченные токены сброса пароля и пользователей, не подтвердивших email дольше
+    `unconfirmed_retention` часов. Данные обрабатываются пакетами по `batch_size` пользователей
+    (каждый пакет — отдельная короткая транзакция), не более `max_batches` пакетов каждого вида за запуск.
+
+    Запускается фоновой задачей из lifespan приложения или однократно из командной строки:
+        python -m src.maintenance.reaper
+    """
+
+    def __init__(
+        self,
+        interval: int = settings.REAPER_INTERVAL,
+        batch_size: int = settings.REAPER_BATCH_SIZE,
+        max_batches: int = settings.REAPER_MAX_BATCHES,
+        unconfirmed_retention: int = settings.UNCONFIRMED_USER_RETENTION,
+        reset_token_expire: int = settings.JWT_RESET_TOKEN_EXPIRE,
+        enabled: bool = settings.REAPER_ENABLED,
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.unconfirmed_retention = unconfirmed_retention
+        self.reset_token_expire = reset_token_expire
+        self.enabled = enabled
+
+        self._task: asyncio.Task | None = None
+
+        # Счётчики для мониторинга
+        self.runs = 0
+        self.errors = 0
+        self.reset_tokens_cleared = 0
+        self.unconfirmed_users_deleted = 0
+        self.last_run_at: datetime | None = None
+        self.last_run_duration: float | None = None
+
+    async def run_once(self) -> dict:
+        """
+        Выполняет один проход очистки.
+
+        Returns:
+            Словарь с количеством удалённых токенов сброса пароля и неподтверждённых пользователей за проход.
+        """
+        started = time.monotonic()
+        now = datetime.now()
+
+        reset_tokens_cleared = await self._run_batches(
+            UserRepository.clear_expired_reset_tokens,
+            now - timedelta(minutes=self.reset_token_expire),
+        )
+        unconfirmed_users_deleted = await self._run_batches(
+            UserRepository.delete_unconfirmed,
+            now - timedelta(hours=self.unconfirmed_retention),
+        )
+
+        self.runs += 1
+        self.reset_tokens_cleared += reset_tokens_cleared
+        self.unconfirmed_users_deleted += unconfirmed_users_deleted
+        self.last_run_at = now
+        self.last_run_duration = time.monotonic() - started
+
+        return {
+            "reset_tokens_cleared": reset_tokens_cleared,
+            "unconfirmed_users_deleted": unconfirmed_users_deleted,
+        }
+
+    async def _run_batches(self, batch, cutoff: datetime) -> int:
+        """
+        Выполняет пакетную операцию, пока она обрабатывает полные пакеты, но не более `max_batches` раз.
+
+        Args:
+            batch: Метод репозитория, принимающий границу времени и размер пакета и возвращающий количество обработанных строк.
+            cutoff: Граница времени, до которой данные считаются устаревшими.
+
+        Returns:
+            Общее количество обработанных строк.
+        """
+        total = 0
+        for _ in range(self.max_batches):
+            processed = await batch(cutoff, self.batch_size)
+            total += processed
+            if processed < self.batch_size:
+                break
+        return total
+
+    def start(self) -> None:
+        """
+        Запускает фоновую задачу периодической очистки.
+        """
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Останавливает фоновую задачу очистки.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Ошибка при очистке устаревших данных: {type(e).__name__}: {e}")
+
+    def stats(self) -> dict:
+        """
+        Возвращает счётчики очистки для мониторинга.
+
+        Returns:
+            Словарь с количеством запусков, ошибок, обработанных строк и данными последнего запуска.
+        """
+        return {
+            "enabled": self.enabled,
+            "runs": self.runs,
+            "errors": self.errors,
+            "reset_tokens_cleared": self.reset_tokens_cleared,
+            "unconfirmed_users_deleted": self.unconfirmed_users_deleted,
+            "last_run_at": self.last_run_at,
+            "last_run_duration": self.last_run_duration,
+        }
+
+
+reaper = Reaper()
+
+
+async def _main() -> None:
+    try:
+        result = await reaper.run_once()
+    finally:
+        await sqlite_writer.stop()
+        await engine.dispose()
+    print(
+        f"Удалено токенов сброса пароля: {result['reset_tokens_cleared']}, "
+        f"неподтверждённых пользователей: {result['unconfirmed_users_deleted']}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -1,7 +1,8 @@
 from datetime import date, datetime
+from uuid import UUID
 
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, Integer, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, String, Text
 
 from src.database import Base
 
@@ -16,6 +17,16 @@ class Role(Base):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Индексы для поиска пользователей администратором (/users/search) с keyset-пагинацией по id
+        # Только PostgreSQL: в остальных СУБД повторял бы уникальный индекс по email
+        Index("ix_users_email_pattern", "email", postgresql_ops={"email": "varchar_pattern_ops"}).ddl_if(dialect="postgresql"),
+        Index("ix_users_last_name_pattern", "last_name", postgresql_ops={"last_name": "varchar_pattern_ops"}),
+        Index("ix_users_first_name_pattern", "first_name", postgresql_ops={"first_name": "varchar_pattern_ops"}),
+        Index("ix_users_role_title_id", "role_title", "id"),
+        Index("ix_users_ban_email_confirmed_id", "ban", "email_confirmed", "id"),
+        Index("ix_users_registration_date_id", "registration_date", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
@@ -37,22 +48,67 @@ class User(Base):
 
     email_confirmed: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
     email_confirmed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
-    confirmation_token: Mapped[str | None] = mapped_column(Text, nullable=True)
+    confirmation_token_hash: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
     confirmation_token_created_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     refresh_tokens: Mapped[list["RefreshToken"]] = relationship(back_populates="user", cascade="all, delete-orphan")
 
-    password_reset_token: Mapped[str | None] = mapped_column(String(), nullable=True)
+    password_reset_token_hash: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
     password_reset_token_created_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
 
-    jti: Mapped[str] = mapped_column(String, primary_key=True, index=True)
-    email: Mapped[str] = mapped_column(String(255), ForeignKey("users.email", ondelete="CASCADE"), index=True, nullable=False)
+    jti: Mapped[UUID] = mapped_column(Uuid, primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True, nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    token_hash: Mapped[str | None] = mapped_column(String(64), unique=True, index=True, nullable=True)
     revoked: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now())
 
     user: Mapped["User"] = relationship(back_populates="refresh_tokens")
+
+
+class EmailBroadcast(Base):
+    __tablename__ = "email_broadcasts"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    role_title: Mapped[str | None] = mapped_column(String(50), nullable=True)
+
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    last_user_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    sent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Аренда выполняющейся рассылки: идентификатор запуска и срок, до которого его продлевает процесс-исполнитель
+    lease_id: Mapped[UUID | None] = mapped_column(Uuid, nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class AuthEvent(Base):
+    __tablename__ = "auth_events"
+    __table_args__ = (
+        # Индексы для просмотра журнала администратором (/audit/events) от новых событий к старым
+        Index("ix_auth_events_email_id", "email", "id"),
+        Index("ix_auth_events_user_id_id", "user_id", "id"),
+        Index("ix_auth_events_event_type_id", "event_type", "id"),
+        Index("ix_auth_events_created_at_id", "created_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    event_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    success: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    # Без внешнего ключа: события сохраняются после удаления пользователя
+    user_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    email: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    ip_address: Mapped[str | None] = mapped_column(String(45), nullable=True)
+    user_agent: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
@@ -0,0 +1,136 @@
+from fastapi import APIRouter, Depends, status
+
+from src.audit.writer import audit_writer
+from src.auth.constants import Permission
+from src.auth.dependencies import require_permissions
+from src.auth.services import single_flight_groups
+from src.auth.utils.refresh_grace import refresh_grace
+from src.limits.admission import admission_groups
+from src.limits.lockout import login_lockout
+from src.maintenance.reaper import reaper
+from src.monitoring.schemas.responses import (
+    ActivityStatsResponse,
+    AdmissionStatsResponse,
+    AuditStatsResponse,
+    LockoutStatsResponse,
+    ReaperStatsResponse,
+    RefreshGraceStatsResponse,
+    SingleFlightStatsResponse,
+    SQLiteWriterStatsResponse,
+)
+from src.sqlite_writer import sqlite_writer
+from src.users.utils.activity_tracker import activity_tracker
+
+router = APIRouter(prefix="/monitoring", tags=["Мониторинг"])
+
+
+@router.get("/admission", response_model=AdmissionStatsResponse, status_code=status.HTTP_200_OK)
+async def get_admission_stats(admin_user=Depends(require_permissions(Permission.MONITORING_READ))):
+    """
+    Возвращает глубину очередей и счётчики отклонённых запросов для групп CPU-ёмких эндпоинтов.
+
+    Args:
+        admin_user: Текущий пользователь с правом просмотра мониторинга.
+
+    Returns:
+        Статистика по каждой группе контроля нагрузки (login, register, reset_password).
+    """
+    return {"groups": [group.stats() for group in admission_groups]}
+
+
+@router.get("/activity", response_model=ActivityStatsResponse, status_code=status.HTTP_200_OK)
+async def get_activity_stats(admin_user=Depends(require_permissions(Permission.MONITORING_READ))):
+    """
+    Возвращает состояние буфера учёта активности пользователей.
+
+    Args:
+        admin_user: Текущий пользователь с правом просмотра мониторинга.
+
+    Returns:
+        Размер буфера и счётчики пакетных записей активности.
+    """
+    return activity_tracker.stats()
+
+
+@router.get("/reaper", response_model=ReaperStatsResponse, status_code=status.HTTP_200_OK)
+async def get_reaper_stats(admin_user=Depends(require_permissions(Permission.MONITORING_READ))):
+    """
+    Возвращает счётчики очистки просроченных токенов сброса пароля и неподтверждённых пользователей.
+
+    Args:
+        admin_user: Текущий пользователь с правом просмотра мониторинга.
+
+    Returns:
+        Количество запусков, ошибок, обработанных строк и данные последнего запуска.
+    """
+    return reaper.stats()
+
+
+@router.get("/audit", response_model=AuditStatsResponse, status_code=status.HTTP_200_OK)
+async def get_audit_stats(admin_user=Depends(require_permissions(Permission.MONITORING_READ))):
+    """
+    Возвращает состояние очереди журнала событий аутентификации.
+
+    Args:
+        admin_user: Текущий пользователь с правом просмотра мониторинга.
+
+    Returns:
+        Размер очереди и счётчики записанных и отброшенных событий.
+    """
+    return audit_writer.stats()
+
+
+@router.get("/single-flight", response_model=SingleFlightStatsResponse, status_code=status.HTTP_200_OK)
+async def get_single_flight_stats(admin_user=Depends(require_permissions(Permission.MONITORING_READ))):
+    """
+    Возвращает счётчики объединения одновременных одинаковых поисков пользователя.
+
+    Args:
+        admin_user: Текущий пользователь с правом просмотра мониторинга.
+
+    Returns:
+        Статистика по каждой группе (вызовы, выполненные и объединённые запросы).
+    """
+    return {"groups": [group.stats() for group in single_flight_groups]}
+
+
+@router.get("/refresh-grace", response_model=RefreshGraceStatsResponse, status_code=status.HTTP_200_OK)
+async def get_refresh_grace_stats(admin_user=Depends(require_permissions(Permission.MONITORING_READ))):
+    """
+    Возвращает счётчики дедупликации одновременных обновлений токенов.
+
+    Args:
+        admin_user: Текущий пользователь с правом просмотра мониторинга.
+
+    Returns:
+        Размер кеша, количество ротаций, ответов из кеша и объединённых одновременных вызовов.
+    """
+    return refresh_grace.stats()
+
+
+@router.get("/sqlite-writer", response_model=SQLiteWriterStatsResponse, status_code=status.HTTP_200_OK)
+async def get_sqlite_writer_stats(admin_user=Depends(require_permissions(Permission.MONITORING_READ))):
+    """
+    Возвращает состояние очереди записи SQLite в режиме одного писателя.
+
+    Args:
+        admin_user: Текущий пользователь с правом просмотра мониторинга.
+
+    Returns:
+        Размер очереди и счётчики операций записи и групповых фиксаций.
+    """
+    return sqlite_writer.stats()
+
+
+@router.get("/lockout", response_model=LockoutStatsResponse, status_code=status.HTTP_200_OK)
+async def get_lockout_stats(admin_user=Depends(require_permissions(Permission.MONITORING_READ))):
+    """
+    Возвращает счётчики неудачных попыток входа и временных блокировок учётных записей.
+
+    Args:
+        admin_user: Текущий пользователь с правом просмотра мониторинга.
+
+    Returns:
+        Количество неудачных попыток, блокировок и попыток, отклонённых без проверки пароля.
+    """
+    return login_lockout.stats()
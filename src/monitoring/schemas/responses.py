@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class AdmissionGroupResponse(BaseModel):
+    name: str
+    max_concurrency: int
+    max_queue: int
+    active: int
+    queued: int
+    admitted: int
+    shed_queue_full: int
+    shed_timeout: int
+
+
+class AdmissionStatsResponse(BaseModel):
+    groups: List[AdmissionGroupResponse]
+
+
+class ActivityStatsResponse(BaseModel):
+    pending: int
+    flushes: int
+    rows_written: int
+
+
+class ReaperStatsResponse(BaseModel):
+    enabled: bool
+    runs: int
+    errors: int
+    reset_tokens_cleared: int
+    unconfirmed_users_deleted: int
+    last_run_at: Optional[datetime]
+    last_run_duration: Optional[float]
+
+
+class AuditStatsResponse(BaseModel):
+    queued: int
+    written: int
+    dropped: int
+    batches: int
+    write_errors: int
+
+
+class SingleFlightGroupResponse(BaseModel):
+    name: str
+    in_flight: int
+    calls: int
+    executed: int
+    coalesced: int
+
+
+class SingleFlightStatsResponse(BaseModel):
+    groups: List[SingleFlightGroupResponse]
+
+
+class RefreshGraceStatsResponse(BaseModel):
+    grace_period: int
+    cached: int
+    rotations: int
+    grace_hits: int
+    coalesced: int
+
+
+class SQLiteWriterStatsResponse(BaseModel):
+    enabled: bool
+    queued: int
+    jobs: int
+    failed_jobs: int
+    commits: int
+    commit_errors: int
+    max_batch: int
+
+
+class LockoutStatsResponse(BaseModel):
+    enabled: bool
+    tracked: Optional[int]
+    failures: int
+    lockouts: int
+    rejected: int
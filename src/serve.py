@@ -0,0 +1,122 @@
+import importlib.util
+import os
+
+import uvicorn
+
+from src.config import settings
+from src.logs.logger import logger
+
+APP_PATH = "src.main:app"
+
+
+def _is_installed(module_name: str) -> bool:
+    """
+    Проверяет, установлен ли опциональный модуль, не импортируя его.
+
+    Args:
+        module_name: Имя модуля (например, uvloop).
+
+    Returns:
+        True, если модуль доступен для импорта, иначе False.
+    """
+    return importlib.util.find_spec(module_name) is not None
+
+
+def _get_workers_count() -> int:
+    """
+    Определяет количество рабочих процессов.
+
+    Returns:
+        Значение SERVER_WORKERS, а если оно равно 0 — количество ядер процессора.
+        В режиме DB_SQLITE_SINGLE_WRITER — всегда 1.
+
+    Raises:
+        ValueError: Если DB_SQLITE_SINGLE_WRITER включён одновременно с SERVER_WORKERS больше 1.
+
+    Notes:
+        Очередь единственного писателя SQLite существует в памяти процесса: у каждого воркера была бы своя
+        очередь, и записи в один файл снова выполнялись бы конкурентно.
+    """
+    if settings.DB_TYPE == "sqlite" and settings.DB_SQLITE_SINGLE_WRITER:
+        if settings.SERVER_WORKERS > 1:
+            raise ValueError("DB_SQLITE_SINGLE_WRITER требует одного рабочего процесса (SERVER_WORKERS=1)")
+        return 1
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def _run_gunicorn(workers: int) -> None:
+    """
+    Запускает приложение через gunicorn с воркерами uvicorn (пакет uvicorn-worker) и предварительной загрузкой приложения.
+
+    Приложение импортируется в мастер-процессе один раз (preload_app), после чего воркеры создаются
+    через fork и разделяют загруженный код и ключи. Воркеры uvicorn сами выбирают uvloop и httptools,
+    если они установлены.
+
+    Args:
+        workers: Количество рабочих процессов.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class StandaloneApplication(BaseApplication):
+        def __init__(self, options: dict):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from src.main import app
+
+            return app
+
+    StandaloneApplication(
+        {
+            "bind": f"{settings.SERVER_HOST}:{settings.SERVER_PORT}",
+            "workers": workers,
+            "worker_class": "uvicorn_worker.UvicornWorker",
+            "preload_app": True,
+            "keepalive": settings.SERVER_KEEPALIVE_TIMEOUT,
+            "backlog": settings.SERVER_BACKLOG,
+            "graceful_timeout": settings.SERVER_GRACEFUL_SHUTDOWN_TIMEOUT,
+        }
+    ).run()
+
+
+def run() -> None:
+    """
+    Запускает production-сервер с параметрами из Settings.
+
+    Использует uvloop и httptools, если они установлены. При нескольких воркерах и включённом
+    SERVER_PRELOAD запускается через gunicorn (если установлены gunicorn и uvicorn-worker),
+    иначе через менеджер процессов uvicorn.
+    """
+    workers = _get_workers_count()
+    loop = "uvloop" if _is_installed("uvloop") else "asyncio"
+    http = "httptools" if _is_installed("httptools") else "h11"
+
+    if workers > 1 and settings.SERVER_PRELOAD:
+        if _is_installed("gunicorn") and _is_installed("uvicorn_worker"):
+            _run_gunicorn(workers)
+            return
+        logger.warning(
+            "gunicorn или uvicorn-worker не установлены, SERVER_PRELOAD игнорируется: "
+            "воркеры uvicorn загружают приложение самостоятельно"
+        )
+
+    uvicorn.run(
+        APP_PATH,
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_TIMEOUT,
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -1,10 +1,39 @@
-from sqlalchemy import delete, insert, select, update
-from typing import Any, Generic, Type, TypeVar, Optional, List
+from typing import Any, Awaitable, Callable, Generic, Iterator, List, Mapping, Optional, Sequence, Type, TypeVar
 
-from src.database import get_async_session
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Result
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
 
+from src.database import (
+    engine,
+    get_async_session,
+    get_read_session,
+    is_primary_read_required,
+    mark_primary_write,
+    replica_router,
+)
+from src.sqlite_writer import sqlite_writer
 
 T = TypeVar("T")
+R = TypeVar("R")
+
+# Конструкции INSERT с поддержкой ON CONFLICT для поддерживаемых диалектов
+ON_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+if engine.dialect.name not in ON_CONFLICT_INSERTS:
+    raise ValueError(f"Диалект базы данных {engine.dialect.name} не поддерживает INSERT ... ON CONFLICT")
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    """
+    Разбивает последовательность на части не длиннее `size` элементов.
+    """
+    for start in range(0, len(items), size):
+        stop = start + size
+        yield items[start:stop]
 
 
 class BaseRepository(Generic[T]):
@@ -13,10 +42,17 @@ class BaseRepository(Generic[T]):
 
     Использует обобщённый тип (Generic[T]) для работы с различными моделями базы данных.
     Атрибут `model` должен быть определён в подклассах и указывать на конкретную модель SQLAlchemy.
+
+    Чтения выполняются на репликах (если они заданы в DB_REPLICA_URLS), записи — на основной базе.
+    После записи чтения в том же запросе также выполняются на основной базе (read-your-writes).
+    В режиме DB_SQLITE_SINGLE_WRITER записи выполняются через очередь единственного писателя (SQLiteWriter).
     """
 
     model: Type[T]
 
+    # Максимальное количество строк (или идентификаторов в IN) в одном запросе массовых операций
+    BULK_CHUNK_SIZE = 1000
+
     @classmethod
     async def find_by_id(cls, model_id: int) -> Optional[T]:
         """
@@ -28,9 +64,8 @@ class BaseRepository(Generic[T]):
         Returns:
             Экземпляр модели, если запись найдена, иначе None.
         """
-        async with get_async_session() as session:
-            result = await session.execute(select(cls.model).filter_by(id=model_id))
-            return result.scalar_one_or_none()
+        result = await cls._execute_read(select(cls.model).filter_by(id=model_id))
+        return result.scalar_one_or_none()
 
     @classmethod
     async def find_one_or_none(cls, **filter_by: Any) -> Optional[T]:
@@ -43,9 +78,8 @@ class BaseRepository(Generic[T]):
         Returns:
             Экземпляр модели, если запись найдена, иначе None.
         """
-        async with get_async_session() as session:
-            result = await session.execute(select(cls.model).filter_by(**filter_by))
-            return result.scalar_one_or_none()
+        result = await cls._execute_read(select(cls.model).filter_by(**filter_by))
+        return result.scalar_one_or_none()
 
     @classmethod
     async def find_all(cls, **filter_by: Any) -> List[T]:
@@ -58,9 +92,8 @@ class BaseRepository(Generic[T]):
         Returns:
             Список экземпляров модели. Если записи не найдены, возвращается пустой список.
         """
-        async with get_async_session() as session:
-            result = await session.execute(select(cls.model).filter_by(**filter_by))
-            return result.scalars().all()
+        result = await cls._execute_read(select(cls.model).filter_by(**filter_by))
+        return result.scalars().all()
 
     @classmethod
     async def add(cls, **data: Any) -> Optional[T]:
@@ -76,11 +109,34 @@ class BaseRepository(Generic[T]):
         Notes:
             Использует `returning` для возврата созданной записи после вставки.
         """
-        async with get_async_session() as session:
-            query = insert(cls.model).values(**data).returning(cls.model)
-            result = await session.execute(query)
-            await session.commit()
-            return result.scalars().one_or_none()
+        result = await cls._execute_write(insert(cls.model).values(**data).returning(cls.model))
+        return result.scalars().one_or_none()
+
+    @classmethod
+    async def add_if_absent(cls, conflict_columns: Sequence[str], **data: Any) -> Optional[T]:
+        """
+        Создаёт новую запись, если запись с теми же значениями уникального ключа не существует, за один запрос к базе данных.
+
+        Args:
+            conflict_columns: Столбцы уникального ключа, совпадение по которому означает, что запись уже существует.
+            **data: Ключевые аргументы, представляющие данные для создания записи.
+
+        Returns:
+            Созданный экземпляр модели или None, если запись с такими значениями ключа уже существует.
+
+        Notes:
+            Использует `INSERT ... ON CONFLICT (conflict_columns) DO NOTHING RETURNING` (PostgreSQL и SQLite),
+            поэтому одновременные вставки одинаковых записей не приводят к ошибке уникальности. Нарушение других
+            ограничений уникальности не подавляется и приводит к ошибке.
+        """
+        query = (
+            ON_CONFLICT_INSERTS[engine.dialect.name](cls.model)
+            .values(**data)
+            .on_conflict_do_nothing(index_elements=list(conflict_columns))
+            .returning(cls.model)
+        )
+        result = await cls._execute_write(query)
+        return result.scalars().one_or_none()
 
     @classmethod
     async def delete(cls, id: int) -> None:
@@ -90,10 +146,7 @@ class BaseRepository(Generic[T]):
         Args:
             id: Идентификатор записи для удаления.
         """
-        async with get_async_session() as session:
-            async with session.begin():
-                await session.execute(delete(cls.model).where(cls.model.id == id))
-                await session.commit()
+        await cls._execute_write(delete(cls.model).where(cls.model.id == id))
 
     @classmethod
     async def update(cls, id: int, **data: Any) -> Optional[T]:
@@ -107,9 +160,213 @@ class BaseRepository(Generic[T]):
         Returns:
             Обновлённый экземпляр модели, если запись найдена и обновлена, иначе None.
         """
-        async with get_async_session() as session:
-            query = update(cls.model).where(cls.model.id == id).values(**data).returning(cls.model)
-            result = await session.execute(query)
-            await session.commit()
-            return result.scalars().one_or_none()
-        
\ No newline at end of file
+        query = update(cls.model).where(cls.model.id == id).values(**data).returning(cls.model)
+        result = await cls._execute_write(query)
+        return result.scalars().one_or_none()
+
+    @classmethod
+    async def add_many(cls, rows: Sequence[dict], returning: bool = False) -> List[T]:
+        """
+        Массово создаёт записи в одной транзакции.
+
+        Args:
+            rows: Список словарей с данными создаваемых записей.
+            returning: Возвращать ли созданные записи (если диалект поддерживает RETURNING для пакетной вставки).
+
+        Returns:
+            Список созданных экземпляров модели, если запрошен и поддерживается RETURNING, иначе пустой список.
+
+        Notes:
+            Использует пакетную вставку SQLAlchemy (insertmanyvalues), строки отправляются частями по BULK_CHUNK_SIZE.
+        """
+        returning = returning and engine.dialect.insert_executemany_returning
+
+        async def work(session: AsyncSession) -> List[T]:
+            created = []
+            for chunk in _chunks(rows, cls.BULK_CHUNK_SIZE):
+                query = insert(cls.model).returning(cls.model) if returning else insert(cls.model)
+                result = await session.execute(query, list(chunk))
+                if returning:
+                    created.extend(result.scalars().all())
+            return created
+
+        return await cls._run_write(work)
+
+    @classmethod
+    async def update_many(
+        cls,
+        values: dict,
+        ids: Optional[Sequence[int]] = None,
+        returning: bool = False,
+        **filter_by: Any,
+    ) -> List[T] | int:
+        """
+        Массово обновляет записи по списку идентификаторов или по фильтрам в одной транзакции.
+
+        Args:
+            values: Словарь с обновляемыми значениями (одинаковыми для всех записей).
+            ids: Список идентификаторов обновляемых записей (обрабатывается частями по BULK_CHUNK_SIZE).
+            returning: Возвращать ли обновлённые записи (если диалект поддерживает UPDATE ... RETURNING).
+            **filter_by: Ключевые аргументы для фильтрации, если идентификаторы не переданы.
+
+        Returns:
+            Список обновлённых экземпляров модели, если запрошен RETURNING, иначе количество обновлённых записей.
+
+        Raises:
+            ValueError: Если не переданы ни идентификаторы, ни фильтры.
+        """
+        if ids is None and not filter_by:
+            raise ValueError("Для массового обновления необходимо передать идентификаторы или фильтры")
+
+        queries = (
+            [update(cls.model).where(cls.model.id.in_(chunk)) for chunk in _chunks(list(ids), cls.BULK_CHUNK_SIZE)]
+            if ids is not None
+            else [update(cls.model).filter_by(**filter_by)]
+        )
+        return await cls._execute_bulk(
+            [query.values(**values) for query in queries],
+            returning and engine.dialect.update_returning,
+        )
+
+    @classmethod
+    async def update_many_by_id(cls, rows: Sequence[dict]) -> None:
+        """
+        Массово обновляет записи разными значениями по первичному ключу в одной транзакции.
+
+        Args:
+            rows: Список словарей, каждый из которых содержит первичный ключ и обновляемые значения.
+
+        Notes:
+            Использует пакетное обновление SQLAlchemy по первичному ключу (executemany).
+        """
+
+        async def work(session: AsyncSession) -> None:
+            for chunk in _chunks(rows, cls.BULK_CHUNK_SIZE):
+                await session.execute(update(cls.model), list(chunk))
+
+        await cls._run_write(work)
+
+    @classmethod
+    async def delete_many(
+        cls,
+        ids: Optional[Sequence[int]] = None,
+        returning: bool = False,
+        **filter_by: Any,
+    ) -> List[T] | int:
+        """
+        Массово удаляет записи по списку идентификаторов или по фильтрам в одной транзакции.
+
+        Args:
+            ids: Список идентификаторов удаляемых записей (обрабатывается частями по BULK_CHUNK_SIZE).
+            returning: Возвращать ли удалённые записи (если диалект поддерживает DELETE ... RETURNING).
+            **filter_by: Ключевые аргументы для фильтрации, если идентификаторы не переданы.
+
+        Returns:
+            Список удалённых экземпляров модели, если запрошен RETURNING, иначе количество удалённых записей.
+
+        Raises:
+            ValueError: Если не переданы ни идентификаторы, ни фильтры.
+        """
+        if ids is None and not filter_by:
+            raise ValueError("Для массового удаления необходимо передать идентификаторы или фильтры")
+
+        queries = (
+            [delete(cls.model).where(cls.model.id.in_(chunk)) for chunk in _chunks(list(ids), cls.BULK_CHUNK_SIZE)]
+            if ids is not None
+            else [delete(cls.model).filter_by(**filter_by)]
+        )
+        return await cls._execute_bulk(queries, returning and engine.dialect.delete_returning)
+
+    @classmethod
+    async def _execute_bulk(cls, queries: List[Executable], returning: bool) -> List[T] | int:
+        """
+        Выполняет набор запросов UPDATE/DELETE в одной транзакции.
+
+        Args:
+            queries: Список запросов.
+            returning: Добавлять ли к запросам RETURNING и возвращать затронутые записи.
+
+        Returns:
+            Список затронутых экземпляров модели, если returning=True, иначе количество затронутых записей.
+        """
+
+        async def work(session: AsyncSession) -> List[T] | int:
+            affected = []
+            rowcount = 0
+            for query in queries:
+                if returning:
+                    query = query.returning(cls.model)
+                result = await session.execute(query.execution_options(synchronize_session=False))
+                if returning:
+                    affected.extend(result.scalars().all())
+                else:
+                    rowcount += result.rowcount
+            return affected if returning else rowcount
+
+        return await cls._run_write(work)
+
+    @classmethod
+    async def _execute_read(cls, query: Executable, params: Optional[Mapping[str, Any]] = None) -> Result:
+        """
+        Выполняет запрос на чтение на реплике или, если реплик нет или требуется read-your-writes, на основной базе.
+
+        Args:
+            query: Запрос SQLAlchemy.
+            params: Значения связанных параметров (bindparam) запроса.
+
+        Returns:
+            Буферизованный результат запроса.
+
+        Notes:
+            При ошибке подключения реплика временно исключается из ротации, а запрос повторяется на основной базе.
+        """
+        if not is_primary_read_required():
+            replica = replica_router.choose()
+            if replica:
+                index, replica_session = replica
+                try:
+                    async with replica_session() as session:
+                        return await session.execute(query, params)
+                except (OperationalError, InterfaceError, OSError) as e:
+                    replica_router.eject(index, e)
+
+        async with get_read_session() as session:
+            return await session.execute(query, params)
+
+    @classmethod
+    async def _execute_write(cls, query: Executable, params: Optional[Mapping[str, Any]] = None) -> Result:
+        """
+        Выполняет запрос на запись на основной базе и фиксирует транзакцию.
+
+        Args:
+            query: Запрос SQLAlchemy.
+            params: Значения связанных параметров (bindparam) запроса.
+
+        Returns:
+            Буферизованный результат запроса.
+        """
+        return await cls._run_write(lambda session: session.execute(query, params))
+
+    @classmethod
+    async def _run_write(cls, work: Callable[[AsyncSession], Awaitable[R]]) -> R:
+        """
+        Выполняет функцию записи в одной транзакции на основной базе и фиксирует транзакцию.
+
+        Args:
+            work: Асинхронная функция, принимающая сессию и выполняющая в ней запросы.
+
+        Returns:
+            Результат функции записи.
+
+        Notes:
+            В режиме DB_SQLITE_SINGLE_WRITER функция выполняется фоновой задачей писателя вместе с другими
+            накопившимися записями (в своей точке сохранения) и фиксируется одной транзакцией.
+        """
+        if sqlite_writer.enabled:
+            result = await sqlite_writer.submit(work)
+        else:
+            async with get_async_session() as session:
+                result = await work(session)
+                await session.commit()
+        mark_primary_write()
+        return result
@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+from src.config import settings
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Объединение одновременных одинаковых запросов на чтение в пределах воркера.
+
+    Первый вызов с ключом запускает запрос, а вызовы с тем же ключом, пришедшие до его завершения,
+    ожидают тот же запрос и получают тот же результат (или то же исключение). После завершения запроса
+    ключ удаляется, поэтому результат не кешируется: следующий вызов снова обращается к базе данных.
+
+    Notes:
+        Результат разделяется между вызывающими, поэтому его нельзя изменять.
+        Присоединившийся вызов получает данные, прочитанные запросом, начатым до него, поэтому
+        чтения, требующие read-your-writes (is_primary_read_required()), не должны объединяться.
+    """
+
+    def __init__(self, name: str, enabled: bool = settings.SINGLE_FLIGHT_ENABLED):
+        self.name = name
+        self.enabled = enabled
+
+        self._calls: dict[Hashable, asyncio.Future] = {}
+
+        # Счётчики для мониторинга
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """
+        Выполняет запрос или присоединяется к уже выполняющемуся запросу с тем же ключом.
+
+        Args:
+            key: Ключ запроса (обычно его параметры).
+            func: Асинхронная функция, выполняющая запрос.
+            *args: Позиционные аргументы функции.
+
+        Returns:
+            Результат выполнения функции.
+
+        Notes:
+            Запрос защищён от отмены (asyncio.shield): отмена одного из ожидающих вызовов
+            не прерывает запрос для остальных.
+        """
+        if not self.enabled:
+            return await func(*args)
+
+        self.calls += 1
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func(*args))
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        return await asyncio.shield(future)
+
+    def pending(self, key: Hashable) -> Optional[asyncio.Future]:
+        """
+        Возвращает выполняющийся запрос с ключом, не запуская новый.
+
+        Args:
+            key: Ключ запроса.
+
+        Returns:
+            Future выполняющегося запроса или None, если запрос с таким ключом не выполняется.
+        """
+        return self._calls.get(key)
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        """
+        Удаляет завершённый запрос и помечает его исключение как полученное,
+        даже если все ожидавшие вызовы были отменены.
+        """
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> dict:
+        """
+        Возвращает счётчики группы для мониторинга.
+
+        Returns:
+            Словарь с количеством выполняющихся запросов, вызовов, выполненных и объединённых запросов.
+        """
+        return {
+            "name": self.name,
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+        }
@@ -0,0 +1,159 @@
+import asyncio
+from typing import Any, Awaitable, Callable, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database import get_async_session, sqlite_single_writer
+from src.logs.logger import logger
+
+R = TypeVar("R")
+
+
+class SQLiteWriter:
+    """
+    Класс для выполнения всех записей в SQLite одной фоновой задачей.
+
+    SQLite допускает только одного писателя: одновременные транзакции из разных соединений ожидают блокировку
+    и завершаются ошибкой "database is locked". В этом режиме операции записи репозиториев помещаются
+    в асинхронную очередь, а фоновая задача выполняет накопившиеся операции (не более `batch_size`)
+    в одной транзакции с одной фиксацией (групповая фиксация). Каждая операция выполняется в своей точке
+    сохранения (SAVEPOINT), поэтому ошибка одной операции откатывает только её.
+
+    Чтения в этом режиме выполняются через read-only соединения в режиме WAL и не ожидают писателя.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.DB_SQLITE_WRITER_BATCH_SIZE,
+        max_queue: int = settings.DB_SQLITE_WRITER_QUEUE_SIZE,
+        enabled: bool = sqlite_single_writer,
+    ):
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.enabled = enabled
+
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+        # Счётчики для мониторинга
+        self.jobs = 0
+        self.failed_jobs = 0
+        self.commits = 0
+        self.commit_errors = 0
+        self.max_batch = 0
+
+    async def submit(self, work: Callable[[AsyncSession], Awaitable[R]]) -> R:
+        """
+        Ставит операцию записи в очередь и ожидает её фиксации.
+
+        Args:
+            work: Асинхронная функция, принимающая сессию и выполняющая в ней запросы.
+
+        Returns:
+            Результат функции записи после фиксации транзакции.
+
+        Raises:
+            Exception: Исключение, возникшее в функции записи или при фиксации транзакции.
+
+        Notes:
+            Фоновая задача запускается при первой записи, поэтому режим работает и вне lifespan приложения
+            (например, при запуске очистки из командной строки).
+        """
+        if self._task is None:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((work, future))
+        return await future
+
+    def start(self) -> None:
+        """
+        Запускает фоновую задачу записи.
+        """
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Выполняет операции, оставшиеся в очереди, и останавливает фоновую задачу.
+        """
+        if self._task is None:
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._queue = None
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._commit(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _commit(self, batch: list[tuple[Callable[[AsyncSession], Awaitable[Any]], asyncio.Future]]) -> None:
+        """
+        Выполняет пакет операций в одной транзакции и передаёт результаты ожидающим вызовам.
+
+        Args:
+            batch: Список пар из функции записи и Future вызывающего.
+        """
+        outcomes: list[tuple[asyncio.Future, Any, BaseException | None]] = []
+        try:
+            async with get_async_session() as session:
+                for work, future in batch:
+                    if future.done():
+                        # Вызывающий отменён до начала выполнения операции
+                        continue
+                    try:
+                        async with session.begin_nested():
+                            outcomes.append((future, await work(session), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+                await session.commit()
+            self.commits += 1
+        except Exception as e:
+            self.commit_errors += 1
+            logger.error(f"Ошибка при групповой фиксации записей SQLite: {type(e).__name__}: {e}")
+            outcomes = [(future, None, e) for work, future in batch]
+
+        self.jobs += len(outcomes)
+        self.max_batch = max(self.max_batch, len(batch))
+        for future, result, error in outcomes:
+            if error is not None:
+                self.failed_jobs += 1
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        """
+        Возвращает состояние очереди записи для мониторинга.
+
+        Returns:
+            Словарь с размером очереди и счётчиками операций и групповых фиксаций.
+        """
+        return {
+            "enabled": self.enabled,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "jobs": self.jobs,
+            "failed_jobs": self.failed_jobs,
+            "commits": self.commits,
+            "commit_errors": self.commit_errors,
+            "max_batch": self.max_batch,
+        }
+
+
+sqlite_writer = SQLiteWriter()
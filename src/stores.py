@@ -0,0 +1,33 @@
+import importlib
+from typing import Callable, Optional, Type, TypeVar
+
+S = TypeVar("S")
+
+
+def load_store(path: Optional[str], interface: Type[S], default: Callable[[], S]) -> S:
+    """
+    Создаёт подключаемое хранилище по пути для импорта класса или хранилище по умолчанию, если путь не задан.
+
+    Args:
+        path: Путь к классу хранилища в формате "модуль.Класс" (класс создаётся без аргументов).
+        interface: Абстрактный класс, который должно реализовывать хранилище.
+        default: Фабрика хранилища по умолчанию (обычно в памяти воркера).
+
+    Returns:
+        Экземпляр хранилища.
+
+    Raises:
+        ValueError: Если класс не найден или не является подклассом `interface`.
+        TypeError: Если в классе не реализованы абстрактные методы интерфейса.
+
+    Notes:
+        Хранилище создаётся при импорте модуля, поэтому ошибка конфигурации обнаруживается при запуске
+        приложения, а не при первом запросе.
+    """
+    if not path:
+        return default()
+    module_name, _, class_name = path.rpartition(".")
+    store_class = getattr(importlib.import_module(module_name), class_name, None)
+    if not isinstance(store_class, type) or not issubclass(store_class, interface):
+        raise ValueError(f"Хранилище {path} должно быть подклассом {interface.__name__}")
+    return store_class()
@@ -1,29 +1,36 @@
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, Depends, status
 
+from src.auth.constants import Permission
+from src.auth.dependencies import get_current_user_model, require_permissions
 from src.auth.services import UserRepository
 from src.exceptions import UserNotFoundException
-from src.users.schemas.requests import FindUserByEmailRequest
-from src.auth.dependencies import get_current_user, get_current_admin_user
-from src.users.schemas.responses import UserBaseResponse, UserAdminResponse, AllUsersAdminResponse
-
+from src.users.schemas.requests import FindUserByEmailRequest, UserSearchRequest
+from src.users.schemas.responses import AllUsersAdminResponse, UserAdminResponse, UserBaseResponse, UserSearchResponse
 
 router = APIRouter(prefix="/users", tags=["Пользователи"])
 
 
 @router.get("/me", response_model=UserBaseResponse, status_code=status.HTTP_200_OK)
-async def get_current_user_profile(current_user=Depends(get_current_user)):
+async def get_current_user_profile(current_user=Depends(get_current_user_model)):
     return current_user
 
 
 @router.get("/all", response_model=AllUsersAdminResponse, status_code=status.HTTP_200_OK)
-async def get_all_registered_users(admin_user=Depends(get_current_admin_user)):
+async def get_all_registered_users(admin_user=Depends(require_permissions(Permission.USERS_READ))):
     users = await UserRepository.find_all()
     return {"users": users}
 
 
 @router.post("/find-by-email", response_model=UserAdminResponse)
-async def find_user_by_email(data: FindUserByEmailRequest, admin_user=Depends(get_current_admin_user)):
-    user = await UserRepository.find_one_or_none(email=data.email)
+async def find_user_by_email(data: FindUserByEmailRequest, admin_user=Depends(require_permissions(Permission.USERS_READ))):
+    user = await UserRepository.find_by_email(data.email)
     if not user:
         raise UserNotFoundException(data.email)
     return user
+
+
+@router.post("/search", response_model=UserSearchResponse, status_code=status.HTTP_200_OK)
+async def search_users(data: UserSearchRequest, admin_user=Depends(require_permissions(Permission.USERS_READ))):
+    users = await UserRepository.search(**data.model_dump())
+    next_after_id = users[-1].id if len(users) == data.limit else None
+    return {"users": users, "next_after_id": next_after_id}
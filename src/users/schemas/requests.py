@@ -1,5 +1,20 @@
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, EmailStr, Field
 
 
 class FindUserByEmailRequest(BaseModel):
-    email: EmailStr
\ No newline at end of file
+    email: EmailStr
+
+
+class UserSearchRequest(BaseModel):
+    email_prefix: Optional[str] = Field(default=None, min_length=1, max_length=255)
+    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
+    role_title: Optional[str] = None
+    ban: Optional[bool] = None
+    email_confirmed: Optional[bool] = None
+    registered_from: Optional[datetime] = None
+    registered_to: Optional[datetime] = None
+    after_id: Optional[int] = None
+    limit: int = Field(default=50, ge=1, le=200)
@@ -1,5 +1,6 @@
-from typing import Optional, List
-from datetime import datetime, date
+from datetime import date, datetime
+from typing import List, Optional
+
 from pydantic import BaseModel, EmailStr
 
 
@@ -13,9 +14,8 @@ class UserBaseResponse(BaseModel):
     email_confirmed: bool
     registration_date: datetime
 
-    model_config = {
-        "from_attributes": True
-    }
+    model_config = {"from_attributes": True}
+
 
 class UserAdminResponse(UserBaseResponse):
     id: int
@@ -27,3 +27,8 @@ class UserAdminResponse(UserBaseResponse):
 
 class AllUsersAdminResponse(BaseModel):
     users: List[UserAdminResponse]
+
+
+class UserSearchResponse(BaseModel):
+    users: List[UserAdminResponse]
+    next_after_id: Optional[int]
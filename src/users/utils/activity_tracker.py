@@ -0,0 +1,123 @@
+import asyncio
+import time
+from datetime import datetime
+
+from src.auth.services import UserRepository
+from src.config import settings
+from src.logs.logger import logger
+
+
+class ActivityTracker:
+    """
+    Класс для учёта времени последней активности пользователей с объединением записей.
+
+    Обращения аутентифицированных пользователей накапливаются в памяти (по id пользователя) и
+    периодически записываются в базу данных одним пакетным UPDATE. Пользователь, активность которого
+    уже записана, повторно попадает в буфер не раньше, чем через `min_resolution` секунд.
+    """
+
+    def __init__(
+        self,
+        flush_interval: int = settings.ACTIVITY_FLUSH_INTERVAL,
+        min_resolution: int = settings.ACTIVITY_MIN_RESOLUTION,
+        enabled: bool = settings.ACTIVITY_TRACKING_ENABLED,
+    ):
+        self.flush_interval = flush_interval
+        self.min_resolution = min_resolution
+        self.enabled = enabled
+
+        self._pending: dict[int, datetime] = {}
+        self._last_written: dict[int, float] = {}
+        self._task: asyncio.Task | None = None
+
+        # Счётчики для мониторинга
+        self.flushes = 0
+        self.rows_written = 0
+
+    def touch(self, user_id: int) -> None:
+        """
+        Отмечает активность пользователя. Не обращается к базе данных.
+
+        Args:
+            user_id: Идентификатор пользователя.
+        """
+        if not self.enabled:
+            return
+
+        last_written = self._last_written.get(user_id)
+        if last_written is not None and time.monotonic() - last_written < self.min_resolution:
+            return
+
+        self._pending[user_id] = datetime.now()
+
+    async def flush(self) -> None:
+        """
+        Записывает накопленную активность в базу данных одним пакетным запросом.
+
+        Notes:
+            При ошибке записи активность возвращается в буфер и будет записана при следующем сбросе.
+        """
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+
+        now = time.monotonic()
+        self._last_written = {
+            user_id: written_at for user_id, written_at in self._last_written.items() if now - written_at < self.min_resolution
+        }
+
+        try:
+            await UserRepository.update_last_activity(pending)
+        except Exception as e:
+            logger.error(f"Ошибка при записи активности пользователей: {type(e).__name__}: {e}")
+            for user_id, last_activity in pending.items():
+                self._pending.setdefault(user_id, last_activity)
+            return
+
+        for user_id in pending:
+            self._last_written[user_id] = now
+
+        self.flushes += 1
+        self.rows_written += len(pending)
+
+    def start(self) -> None:
+        """
+        Запускает фоновую задачу периодического сброса буфера.
+        """
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Останавливает фоновую задачу и записывает оставшуюся активность.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def stats(self) -> dict:
+        """
+        Возвращает состояние буфера для мониторинга.
+
+        Returns:
+            Словарь с размером буфера и счётчиками записей.
+        """
+        return {
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+        }
+
+
+activity_tracker = ActivityTracker()
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Request, Response, status
+
+from src.auth.utils.jwt_handler import jwt_handler
+from src.config import settings
+
+router = APIRouter(prefix="/.well-known", tags=["Публичные ключи"])
+
+
+@router.get("/jwks.json", status_code=status.HTTP_200_OK)
+async def get_jwks(request: Request) -> Response:
+    """
+    Публикует публичные ключи для локальной проверки JWT-токенов сторонними сервисами.
+
+    Args:
+        request: HTTP-запрос (используется заголовок If-None-Match).
+
+    Returns:
+        Набор ключей JWKS с заголовками Cache-Control и ETag или пустой ответ 304, если ключи не изменились.
+    """
+    headers = {
+        "Cache-Control": f"public, max-age={settings.JWKS_CACHE_MAX_AGE}",
+        "ETag": jwt_handler.jwks_etag,
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if jwt_handler.jwks_etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=jwt_handler.jwks_json, media_type="application/json", headers=headers)
@@ -0,0 +1,94 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+def generate_rsa_key_pair(directory: Path, name: str) -> tuple[Path, Path]:
+    """
+    Создаёт пару RSA-ключей в PEM-файлах.
+
+    Args:
+        directory: Директория для файлов ключей.
+        name: Префикс имён файлов.
+
+    Returns:
+        Кортеж из путей к приватному и публичному ключам.
+    """
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path = directory / f"{name}_private.pem"
+    public_path = directory / f"{name}_public.pem"
+    private_path.write_bytes(
+        private_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    )
+    public_path.write_bytes(
+        private_key.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    )
+    return private_path, public_path
+
+
+# Тесты выполняются во временной директории: в ней создаются база данных SQLite (./db.sqlite3), логи и ключи,
+# а настройки задаются переменными окружения до импорта приложения
+TEST_DIR = Path(tempfile.mkdtemp(prefix="auth-tests-"))
+os.chdir(TEST_DIR)
+sys.path.insert(0, str(ROOT_DIR))
+
+PRIVATE_KEY_PATH, PUBLIC_KEY_PATH = generate_rsa_key_pair(TEST_DIR, "jwt")
+
+TEST_ENVIRONMENT = {
+    "PASSWORD_VALIDATION_LEVEL": "light",
+    "PASSWORDS_COMMON_LIST_PATH": str(ROOT_DIR / "src" / "auth" / "utils" / "common_passwords_list.txt"),
+    "PASSWORD_BCRYPT_SALT_ROUNDS": "4",
+    "DB_TYPE": "sqlite",
+    "JWT_ALGORITHM": "RS256",
+    "JWT_ACCESS_TOKEN_EXPIRE": "30",
+    "JWT_REFRESH_TOKEN_EXPIRE": "15",
+    "JWT_RESET_TOKEN_EXPIRE": "30",
+    "JWT_PRIVATE_KEY_PATH": str(PRIVATE_KEY_PATH),
+    "JWT_PUBLIC_KEY_PATH": str(PUBLIC_KEY_PATH),
+    "INTROSPECTION_SECRET": "introspection-secret",
+    "EMAIL_TEMPLATES": str(ROOT_DIR / "src" / "email" / "templates"),
+    "ENABLE_EMAIL_CONFIRMATION": "False",
+    "EMAIL_CONFIRM_TOKEN_EXPIRE": "72",
+    "EMAIL_FROM": "noreply@example.com",
+    "SMTP_USERNAME": "noreply@example.com",
+    "SMTP_PASSWORD": "password",
+    "SMTP_HOST": "localhost",
+    "SMTP_PORT": "587",
+    "FRONTEND_URL": "http://localhost:3000",
+    "ENABLE_RATE_LIMITER": "False",
+}
+for name, value in TEST_ENVIRONMENT.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def database():
+    """
+    Создаёт схему базы данных с ролями USER и ADMIN и удаляет её после теста.
+    """
+    from sqlalchemy import insert
+
+    from src.auth.constants import UserRole
+    from src.database import Base, engine, read_engine
+    from src.models import Role
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        await connection.execute(insert(Role), [{"title": role.value} for role in UserRole])
+    yield
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+    await read_engine.dispose()
@@ -0,0 +1,78 @@
+import pytest
+
+from src.auth.services import UserRepository
+from src.users.utils.activity_tracker import ActivityTracker
+
+
+async def add_users(count: int) -> list[int]:
+    return [
+        (await UserRepository.add(email=f"user{i}@example.com", password="hash", role_title="USER")).id for i in range(count)
+    ]
+
+
+@pytest.mark.anyio
+async def test_flush_writes_pending_activity_in_one_batch(database):
+    user_ids = await add_users(3)
+    tracker = ActivityTracker(min_resolution=60, enabled=True)
+
+    for user_id in user_ids + user_ids:
+        tracker.touch(user_id)
+    assert tracker.stats()["pending"] == 3
+
+    await tracker.flush()
+
+    assert tracker.stats() == {"pending": 0, "flushes": 1, "rows_written": 3}
+    for user_id in user_ids:
+        assert (await UserRepository.find_by_id(user_id)).last_activity is not None
+
+
+@pytest.mark.anyio
+async def test_user_is_not_buffered_again_within_min_resolution(database):
+    [user_id] = await add_users(1)
+    tracker = ActivityTracker(min_resolution=60, enabled=True)
+    tracker.touch(user_id)
+    await tracker.flush()
+
+    tracker.touch(user_id)
+
+    assert tracker.stats()["pending"] == 0
+
+
+@pytest.mark.anyio
+async def test_failed_flush_keeps_activity_for_next_flush(database, monkeypatch):
+    [user_id] = await add_users(1)
+    tracker = ActivityTracker(min_resolution=60, enabled=True)
+    tracker.touch(user_id)
+
+    async def fail(activity: dict) -> None:
+        raise ConnectionError("база данных недоступна")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(UserRepository, "update_last_activity", fail)
+        await tracker.flush()
+    assert tracker.stats() == {"pending": 1, "flushes": 0, "rows_written": 0}
+
+    await tracker.flush()
+
+    assert tracker.stats() == {"pending": 0, "flushes": 1, "rows_written": 1}
+    assert (await UserRepository.find_by_id(user_id)).last_activity is not None
+
+
+@pytest.mark.anyio
+async def test_stop_flushes_remaining_activity(database):
+    [user_id] = await add_users(1)
+    tracker = ActivityTracker(flush_interval=3600, enabled=True)
+    tracker.start()
+    tracker.touch(user_id)
+
+    await tracker.stop()
+
+    assert (await UserRepository.find_by_id(user_id)).last_activity is not None
+
+
+def test_disabled_tracker_ignores_activity():
+    tracker = ActivityTracker(enabled=False)
+
+    tracker.touch(1)
+
+    assert tracker.stats()["pending"] == 0
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from src.audit.constants import AuthEventType
+from src.audit.services import AuthEventRepository
+from src.audit.writer import AuditWriter
+
+
+def record(writer: AuditWriter, *numbers: int) -> None:
+    for number in numbers:
+        writer.record(AuthEventType.LOGIN, email=f"user{number}@example.com")
+
+
+async def stored_emails() -> list[str]:
+    return sorted(event.email for event in await AuthEventRepository.find_all())
+
+
+def emails(*numbers: int) -> list[str]:
+    return sorted(f"user{number}@example.com" for number in numbers)
+
+
+@pytest.mark.anyio
+async def test_drop_newest_keeps_queued_events(database):
+    writer = AuditWriter(max_queue=3, batch_size=10, overflow_policy="drop_newest", enabled=True)
+
+    record(writer, 1, 2, 3, 4, 5)
+    await writer.flush()
+
+    assert await stored_emails() == emails(1, 2, 3)
+    assert writer.stats()["dropped"] == 2
+
+
+@pytest.mark.anyio
+async def test_drop_oldest_keeps_latest_events(database):
+    writer = AuditWriter(max_queue=3, batch_size=10, overflow_policy="drop_oldest", enabled=True)
+
+    record(writer, 1, 2, 3, 4, 5)
+    await writer.flush()
+
+    assert await stored_emails() == emails(3, 4, 5)
+    assert writer.stats()["dropped"] == 2
+
+
+@pytest.mark.anyio
+async def test_flush_writes_in_batches(database):
+    writer = AuditWriter(max_queue=10, batch_size=2, enabled=True)
+
+    record(writer, 1, 2, 3, 4, 5)
+    await writer.flush()
+
+    assert await stored_emails() == emails(1, 2, 3, 4, 5)
+    assert writer.stats() == {"queued": 0, "written": 5, "batches": 3, "dropped": 0, "write_errors": 0}
+
+
+@pytest.mark.anyio
+async def test_failed_batch_is_requeued_within_queue_size(database, monkeypatch):
+    writer = AuditWriter(max_queue=3, batch_size=2, enabled=True)
+    record(writer, 1, 2, 3)
+
+    async def fail(rows) -> None:
+        # Пока выполняется запись, приходит новое событие и занимает место в очереди
+        record(writer, 4)
+        raise ConnectionError("database is unavailable")
+
+    monkeypatch.setattr(AuthEventRepository, "add_many", fail)
+    await writer.flush()
+    monkeypatch.undo()
+
+    # Из неудавшегося пакета (1, 2) в начало очереди возвращается столько событий, сколько в ней свободно
+    assert writer.stats()["write_errors"] == 1
+    assert writer.stats()["dropped"] == 1
+    await writer.flush()
+    assert await stored_emails() == emails(1, 3, 4)
+
+
+@pytest.mark.anyio
+async def test_full_batch_wakes_writer_before_interval(database):
+    writer = AuditWriter(max_queue=10, batch_size=2, flush_interval=60, enabled=True)
+    writer.start()
+    try:
+        record(writer, 1, 2)
+        for _ in range(100):
+            if writer.stats()["written"] == 2:
+                break
+            await asyncio.sleep(0.01)
+        assert writer.stats()["written"] == 2
+    finally:
+        await writer.stop()
+
+
+@pytest.mark.anyio
+async def test_stop_writes_pending_events(database):
+    writer = AuditWriter(max_queue=10, batch_size=10, flush_interval=60, enabled=True)
+    writer.start()
+    record(writer, 1)
+
+    await writer.stop()
+
+    assert await stored_emails() == emails(1)
+
+
+def test_disabled_writer_ignores_events():
+    writer = AuditWriter(enabled=False)
+
+    record(writer, 1)
+
+    assert writer.stats()["queued"] == 0
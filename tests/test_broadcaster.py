@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.auth.services import UserRepository
+from src.email.constants import BroadcastStatus
+from src.email.services import EmailBroadcastRepository
+from src.email.utils.broadcaster import EmailBroadcaster
+from src.email.utils.email_handler import email_handler
+
+
+class FakeSMTP:
+    """
+    SMTP-сессия, запоминающая получателей; отправка блокируется до установки события `released`.
+    """
+
+    def __init__(self, sent: list[str], released: asyncio.Event):
+        self.sent = sent
+        self.released = released
+
+    async def send_message(self, message) -> None:
+        await self.released.wait()
+        self.sent.append(message["To"])
+
+    async def quit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture
+def smtp(monkeypatch) -> FakeSMTP:
+    fake = FakeSMTP([], asyncio.Event())
+
+    async def connect() -> FakeSMTP:
+        return fake
+
+    monkeypatch.setattr(email_handler, "connect", connect)
+    return fake
+
+
+async def add_broadcast(**data):
+    return await EmailBroadcastRepository.add(subject="Новости", message="Текст", **data)
+
+
+async def add_recipients(count: int) -> None:
+    await UserRepository.add_many(
+        [
+            {"email": f"user{i}@example.com", "password": "hash", "role_title": "USER", "email_confirmed": True}
+            for i in range(count)
+        ]
+    )
+
+
+async def wait_for_status(broadcast_id: int, status: str) -> None:
+    for _ in range(100):
+        broadcast = await EmailBroadcastRepository.find_by_id(broadcast_id)
+        if broadcast.status == status:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"Рассылка {broadcast_id} не перешла в статус {status}")
+
+
+@pytest.mark.anyio
+async def test_running_broadcast_with_expired_lease_is_resumed(database, smtp):
+    await add_recipients(3)
+    smtp.released.set()
+    broadcast = await add_broadcast(
+        status=BroadcastStatus.RUNNING.value,
+        lease_id=uuid4(),
+        lease_expires_at=datetime.now() - timedelta(seconds=1),
+    )
+
+    resumed = await EmailBroadcaster(connections=1).start(broadcast.id)
+
+    assert resumed.status == BroadcastStatus.RUNNING.value
+    assert resumed.lease_id != broadcast.lease_id
+    await wait_for_status(broadcast.id, BroadcastStatus.COMPLETED.value)
+    assert sorted(smtp.sent) == [f"user{i}@example.com" for i in range(3)]
+
+
+@pytest.mark.anyio
+async def test_running_broadcast_with_live_lease_is_not_taken_over(database, smtp):
+    broadcast = await add_broadcast(
+        status=BroadcastStatus.RUNNING.value,
+        lease_id=uuid4(),
+        lease_expires_at=datetime.now() + timedelta(minutes=1),
+    )
+
+    assert await EmailBroadcaster().start(broadcast.id) is None
+
+
+@pytest.mark.anyio
+async def test_pause_returns_without_waiting_for_page(database, smtp):
+    await add_recipients(2)
+    broadcaster = EmailBroadcaster(connections=1)
+    broadcast = await broadcaster.start((await add_broadcast(status=BroadcastStatus.PENDING.value)).id)
+    await asyncio.sleep(0.05)
+
+    paused = await asyncio.wait_for(broadcaster.pause(broadcast.id), timeout=1)
+    assert paused.status == BroadcastStatus.PAUSED.value
+    assert smtp.sent == []
+
+    # Продолжение до конца страницы подхватывает тот же запуск: письма не отправляются повторно
+    resumed = await broadcaster.start(broadcast.id)
+    assert resumed.lease_id == broadcast.lease_id
+    smtp.released.set()
+    await wait_for_status(broadcast.id, BroadcastStatus.COMPLETED.value)
+    assert sorted(smtp.sent) == ["user0@example.com", "user1@example.com"]
+
+
+@pytest.mark.anyio
+async def test_paused_broadcast_releases_lease_after_page(database, smtp):
+    await add_recipients(1)
+    broadcaster = EmailBroadcaster(connections=1)
+    broadcast = await broadcaster.start((await add_broadcast(status=BroadcastStatus.PENDING.value)).id)
+    await asyncio.sleep(0.05)
+    await broadcaster.pause(broadcast.id)
+
+    smtp.released.set()
+    for _ in range(100):
+        stored = await EmailBroadcastRepository.find_by_id(broadcast.id)
+        if stored.lease_id is None:
+            break
+        await asyncio.sleep(0.01)
+
+    assert stored.status == BroadcastStatus.PAUSED.value
+    assert stored.lease_id is None
+    assert stored.last_user_id > 0
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from src.auth.constants import TokenUse
+from src.auth.services import UserRepository
+from src.auth.utils.jwt_handler import jwt_handler
+from src.config import settings
+from src.exceptions import InvalidTokenException
+from src.main import app
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="https://test") as client:
+        yield client
+
+
+async def introspect(client: httpx.AsyncClient, *tokens: str) -> list[dict]:
+    response = await client.post(
+        "/auth/introspect",
+        json={"tokens": list(tokens)},
+        headers={"X-Introspection-Secret": settings.INTROSPECTION_SECRET},
+    )
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+@pytest.mark.anyio
+async def test_only_access_tokens_are_active(database, client):
+    user = await UserRepository.add(email="user@example.com", password="hash", role_title="USER")
+    access_token = await jwt_handler.create_access_token("user@example.com")
+    refresh_token = await jwt_handler.create_refresh_token("user@example.com", user.id)
+    reset_token = await jwt_handler.create_reset_token("user@example.com")
+
+    access, refresh, reset = await introspect(client, access_token, refresh_token, reset_token)
+
+    assert access["active"] is True
+    assert access["user_id"] == user.id
+    assert refresh["active"] is False
+    assert refresh["sub"] is None
+    assert reset["active"] is False
+
+
+@pytest.mark.anyio
+async def test_refresh_token_is_rejected_as_access_token():
+    refresh_token, _, _ = await jwt_handler._create_token("user@example.com", timedelta(minutes=5), TokenUse.REFRESH)
+
+    with pytest.raises(InvalidTokenException):
+        await jwt_handler.decode_token(refresh_token, TokenUse.ACCESS)
@@ -0,0 +1,80 @@
+import pytest
+from conftest import TEST_DIR, generate_rsa_key_pair
+
+from src.auth.utils.jwt_handler import JWTHandler
+from src.config import settings
+from src.exceptions import InvalidTokenException
+
+
+@pytest.fixture
+def old_key_pair() -> tuple[str, str]:
+    private_path, public_path = generate_rsa_key_pair(TEST_DIR, "old")
+    return str(private_path), str(public_path)
+
+
+@pytest.mark.anyio
+async def test_token_with_custom_kid_is_verified_after_rotation(monkeypatch, old_key_pair):
+    old_private_path, old_public_path = old_key_pair
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEY_PATH", old_private_path)
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEY_PATH", old_public_path)
+    monkeypatch.setattr(settings, "JWT_KEY_ID", "2025-01")
+    old_handler = JWTHandler()
+    token = await old_handler.create_access_token("user@example.com")
+
+    # Ротация: новый ключ подписи с новым kid, старый публичный ключ остаётся с прежним kid
+    new_private_path, new_public_path = generate_rsa_key_pair(TEST_DIR, "new")
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEY_PATH", str(new_private_path))
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEY_PATH", str(new_public_path))
+    monkeypatch.setattr(settings, "JWT_KEY_ID", "2025-02")
+    monkeypatch.setattr(settings, "JWT_ADDITIONAL_PUBLIC_KEYS", {"2025-01": old_public_path})
+    new_handler = JWTHandler()
+
+    payload = await new_handler.decode_token(token)
+    assert payload["sub"] == "user@example.com"
+    assert {key["kid"] for key in new_handler.jwks["keys"]} == {"2025-01", "2025-02"}
+
+
+@pytest.mark.anyio
+async def test_token_with_thumbprint_kid_is_verified_after_rotation(monkeypatch, old_key_pair):
+    old_private_path, old_public_path = old_key_pair
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEY_PATH", old_private_path)
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEY_PATH", old_public_path)
+    token = await JWTHandler().create_access_token("user@example.com")
+
+    monkeypatch.setattr(settings, "JWT_ADDITIONAL_PUBLIC_KEY_PATHS", [old_public_path])
+    new_handler = JWTHandler()
+
+    assert (await new_handler.decode_token(token))["sub"] == "user@example.com"
+
+
+@pytest.mark.anyio
+async def test_token_signed_with_removed_key_is_rejected(monkeypatch, old_key_pair):
+    old_private_path, old_public_path = old_key_pair
+    monkeypatch.setattr(settings, "JWT_PRIVATE_KEY_PATH", old_private_path)
+    monkeypatch.setattr(settings, "JWT_PUBLIC_KEY_PATH", old_public_path)
+    monkeypatch.setattr(settings, "JWT_KEY_ID", "2025-01")
+    token = await JWTHandler().create_access_token("user@example.com")
+
+    monkeypatch.undo()
+    with pytest.raises(InvalidTokenException):
+        await JWTHandler().decode_token(token)
+
+
+def test_additional_key_cannot_reuse_current_kid(monkeypatch, old_key_pair):
+    _, old_public_path = old_key_pair
+    monkeypatch.setattr(settings, "JWT_KEY_ID", "current")
+    monkeypatch.setattr(settings, "JWT_ADDITIONAL_PUBLIC_KEYS", {"current": old_public_path})
+
+    with pytest.raises(ValueError):
+        JWTHandler()
+
+
+@pytest.mark.anyio
+async def test_cached_payload_is_not_shared_between_callers():
+    handler = JWTHandler()
+    token = await handler.create_access_token("user@example.com")
+
+    payload = await handler.decode_token(token)
+    payload["sub"] = "attacker@example.com"
+
+    assert (await handler.decode_token(token))["sub"] == "user@example.com"
@@ -0,0 +1,152 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.auth.services import UserRepository
+from src.auth.utils.password_handler import password_handler
+from src.exceptions import AccountTemporarilyLockedException
+from src.limits.lockout import LoginLockout, MemoryLockoutStore
+
+
+class Clock:
+    """
+    Управляемое время для проверки блокировок без ожидания.
+    """
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr("src.limits.lockout.time.time", clock)
+    return clock
+
+
+def create_lockout(**options) -> LoginLockout:
+    options = {"threshold": 3, "base_delay": 10, "max_delay": 60, "reset_after": 300, "enabled": True, **options}
+    return LoginLockout(MemoryLockoutStore(max_size=100), **options)
+
+
+async def locked_for(lockout: LoginLockout, email: str) -> int | None:
+    try:
+        await lockout.check(email)
+    except AccountTemporarilyLockedException as e:
+        return int(e.headers["Retry-After"])
+    return None
+
+
+@pytest.mark.anyio
+async def test_account_is_locked_after_threshold(clock):
+    lockout = create_lockout()
+
+    for _ in range(2):
+        await lockout.register_failure("user@example.com")
+    assert await locked_for(lockout, "user@example.com") is None
+
+    await lockout.register_failure("User@Example.com")
+
+    assert await locked_for(lockout, "user@example.com") == 10
+    assert lockout.stats()["rejected"] == 1
+
+
+@pytest.mark.anyio
+async def test_lock_doubles_up_to_max_delay(clock):
+    lockout = create_lockout()
+    delays = []
+
+    for _ in range(6):
+        await lockout.register_failure("user@example.com")
+        delays.append(await locked_for(lockout, "user@example.com"))
+
+    assert delays == [None, None, 10, 20, 40, 60]
+
+
+@pytest.mark.anyio
+async def test_lock_expires(clock):
+    lockout = create_lockout()
+    for _ in range(3):
+        await lockout.register_failure("user@example.com")
+
+    clock.now += 10
+
+    assert await locked_for(lockout, "user@example.com") is None
+    # Счётчик сохраняется до reset_after: следующая неудача сразу блокирует вход на удвоенное время
+    await lockout.register_failure("user@example.com")
+    assert await locked_for(lockout, "user@example.com") == 20
+
+
+@pytest.mark.anyio
+async def test_counter_is_reset_after_success_and_inactivity(clock):
+    lockout = create_lockout()
+    for _ in range(2):
+        await lockout.register_failure("user@example.com")
+    await lockout.reset("user@example.com")
+    await lockout.register_failure("user@example.com")
+    assert await locked_for(lockout, "user@example.com") is None
+
+    await lockout.register_failure("user@example.com")
+    clock.now += 300
+    await lockout.register_failure("user@example.com")
+
+    assert await locked_for(lockout, "user@example.com") is None
+
+
+@pytest.mark.anyio
+async def test_memory_store_evicts_least_recently_updated(clock):
+    store = MemoryLockoutStore(max_size=2)
+
+    await store.set("first@example.com", {"failures": 1}, clock.now + 60)
+    await store.set("second@example.com", {"failures": 1}, clock.now + 60)
+    await store.set("first@example.com", {"failures": 2}, clock.now + 60)
+    await store.set("third@example.com", {"failures": 1}, clock.now + 60)
+
+    assert len(store) == 2
+    assert await store.get("second@example.com") is None
+    assert await store.get("first@example.com") == {"failures": 2}
+
+
+@pytest.mark.anyio
+async def test_memory_store_evicts_expired_entries(clock):
+    store = MemoryLockoutStore(max_size=10)
+    await store.set("first@example.com", {"failures": 1}, clock.now + 10)
+    await store.set("second@example.com", {"failures": 1}, clock.now + 60)
+
+    clock.now += 10
+    assert await store.get("first@example.com") is None
+
+    clock.now += 50
+    await store.set("third@example.com", {"failures": 1}, clock.now + 60)
+    assert len(store) == 1
+
+
+@pytest.mark.anyio
+async def test_locked_login_is_rejected_before_password_check(database, clock, monkeypatch):
+    from src.main import app
+
+    lockout = create_lockout(threshold=2)
+    monkeypatch.setattr("src.auth.router.login_lockout", lockout)
+    checks = []
+    verify_password = password_handler.verify_password
+
+    def counting_verify_password(password: str, hashed_password: str) -> bool:
+        checks.append(password)
+        return verify_password(password, hashed_password)
+
+    monkeypatch.setattr(password_handler, "verify_password", counting_verify_password)
+    await UserRepository.add(
+        email="user@example.com", password=password_handler.hash_password("Passw0rd123"), role_title="USER"
+    )
+    credentials = {"email": "user@example.com", "password": "wrong-password"}
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="https://test") as client:
+        assert (await client.post("/auth/login", json=credentials)).status_code == 401
+        assert (await client.post("/auth/login", json=credentials)).status_code == 401
+        response = await client.post("/auth/login", json={**credentials, "password": "Passw0rd123"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "10"
+    assert len(checks) == 2
@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from conftest import ROOT_DIR, TEST_DIR
+
+from src.auth.services import RefreshTokenRepository, UserRepository
+
+
+async def add_user(email: str = "user@example.com") -> int:
+    return (await UserRepository.add(email=email, password="hash", role_title="USER")).id
+
+
+async def add_token(user_id: int, max_sessions: int, expires_in: timedelta, revoked_grace: int = 0, **data) -> UUID:
+    jti = uuid4()
+    await RefreshTokenRepository.add_with_session_cap(
+        max_sessions, revoked_grace, jti=jti, user_id=user_id, expires_at=datetime.now() + expires_in, **data
+    )
+    return jti
+
+
+async def stored_jtis(user_id: int) -> set[UUID]:
+    return {token.jti for token in await RefreshTokenRepository.find_all(user_id=user_id)}
+
+
+@pytest.mark.anyio
+async def test_oldest_sessions_over_cap_are_removed(database):
+    user_id = await add_user()
+    other_user_id = await add_user("other@example.com")
+    other = await add_token(other_user_id, 2, timedelta(days=1))
+
+    jtis = [await add_token(user_id, 2, timedelta(days=day)) for day in (1, 2, 3)]
+
+    assert await stored_jtis(user_id) == set(jtis[1:])
+    assert await stored_jtis(other_user_id) == {other}
+
+
+@pytest.mark.anyio
+async def test_expired_and_revoked_tokens_are_removed_on_issue(database):
+    user_id = await add_user()
+    expired = await add_token(user_id, 0, timedelta(seconds=-1))
+    revoked_long_ago = await add_token(user_id, 0, timedelta(days=1), revoked=datetime.now() - timedelta(minutes=1))
+    revoked_recently = await add_token(user_id, 0, timedelta(days=1), revoked=datetime.now())
+
+    # Недавно отозванный токен остаётся в окне дедупликации ротации
+    issued = await add_token(user_id, 5, timedelta(days=1), revoked_grace=10)
+
+    assert await stored_jtis(user_id) == {revoked_recently, issued}
+    assert not {expired, revoked_long_ago} & await stored_jtis(user_id)
+
+
+@pytest.mark.anyio
+async def test_zero_cap_keeps_all_sessions(database):
+    user_id = await add_user()
+
+    jtis = {await add_token(user_id, 0, timedelta(days=1)) for _ in range(3)}
+
+    assert await stored_jtis(user_id) == jtis
+
+
+@pytest.mark.anyio
+async def test_sessions_survive_email_change(database):
+    user_id = await add_user()
+    jti = await add_token(user_id, 5, timedelta(days=1))
+
+    await UserRepository.update(user_id, email="renamed@example.com")
+
+    token = await RefreshTokenRepository.find_by_jti(jti)
+    assert token.user_id == user_id
+    assert token.user.email == "renamed@example.com"
+
+
+def migrate(command: str, revision: str) -> None:
+    subprocess.run(
+        [sys.executable, "-m", "alembic", "-c", str(ROOT_DIR / "alembic.ini"), command, revision],
+        cwd=TEST_DIR,
+        env={**os.environ, "PYTHONPATH": str(ROOT_DIR)},
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def migrated_database():
+    """
+    Предоставляет путь к базе данных SQLite, схема которой создаётся миграциями Alembic, и удаляет её после теста.
+    """
+    path = TEST_DIR / "db.sqlite3"
+    path.unlink(missing_ok=True)
+    yield path
+    path.unlink(missing_ok=True)
+
+
+def test_migration_moves_tokens_to_user_id_and_uuid(migrated_database):
+    migrate("upgrade", "3d7a9f1c5e20")
+    jti = uuid4()
+    with sqlite3.connect(migrated_database) as connection:
+        connection.execute("INSERT INTO roles (title) VALUES ('USER')")
+        user_id = connection.execute(
+            "INSERT INTO users (email, password, role_title, registration_date, ban) "
+            "VALUES ('user@example.com', 'hash', 'USER', '2026-01-01 00:00:00', 0)"
+        ).lastrowid
+        connection.execute(
+            "INSERT INTO refresh_tokens (jti, email, expires_at, created_at) "
+            "VALUES (?, 'user@example.com', '2100-01-01 00:00:00', '2026-01-01 00:00:00')",
+            (str(jti),),
+        )
+        connection.execute(
+            "INSERT INTO refresh_tokens (jti, email, expires_at, created_at) "
+            "VALUES (?, 'deleted@example.com', '2100-01-01 00:00:00', '2026-01-01 00:00:00')",
+            (str(uuid4()),),
+        )
+
+    migrate("upgrade", "e41b6c8d3f57")
+    with sqlite3.connect(migrated_database) as connection:
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(refresh_tokens)")}
+        rows = connection.execute("SELECT jti, user_id FROM refresh_tokens").fetchall()
+    assert "email" not in columns
+    # Токены без владельца удаляются, jti хранится в формате типа Uuid
+    assert rows == [(jti.hex, user_id)]
+
+    migrate("downgrade", "3d7a9f1c5e20")
+    with sqlite3.connect(migrated_database) as connection:
+        rows = connection.execute("SELECT jti, email FROM refresh_tokens").fetchall()
+    assert rows == [(str(jti), "user@example.com")]
@@ -0,0 +1,131 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.auth.services import RefreshTokenRepository, UserRepository
+from src.auth.utils.jwt_handler import JWTHandler
+from src.auth.utils.refresh_grace import RefreshGrace, RotatedTokens
+from src.auth.utils.token_hasher import token_hasher
+from src.config import settings
+
+
+@pytest.fixture
+def opaque_handler(monkeypatch) -> JWTHandler:
+    monkeypatch.setattr(settings, "JWT_REFRESH_TOKEN_OPAQUE", True)
+    return JWTHandler()
+
+
+async def add_user() -> int:
+    return (await UserRepository.add(email="user@example.com", password="hash", role_title="USER")).id
+
+
+def rotated(user_id: int, suffix: str) -> RotatedTokens:
+    return RotatedTokens(user_id, "user@example.com", f"access-{suffix}", f"refresh-{suffix}")
+
+
+@pytest.mark.anyio
+async def test_opaque_refresh_token_is_found_by_digest(database, opaque_handler):
+    user_id = await add_user()
+
+    token = await opaque_handler.create_refresh_token("user@example.com", user_id)
+
+    assert opaque_handler.is_opaque_token(token)
+    stored = await opaque_handler.find_refresh_token(token)
+    assert stored.user_id == user_id
+    assert stored.token_hash == token_hasher.hash_token(token)
+    assert stored.user.email == "user@example.com"
+    assert await opaque_handler.find_refresh_token(token + "x") is None
+
+
+@pytest.mark.anyio
+async def test_opaque_refresh_token_is_revoked_once(database, opaque_handler):
+    user_id = await add_user()
+    token_hash = token_hasher.hash_token(await opaque_handler.create_refresh_token("user@example.com", user_id))
+    revoked = datetime.now()
+
+    assert (await RefreshTokenRepository.revoke_by_token_hash(token_hash, revoked)).revoked == revoked
+    # Повторный отзыв (выход из системы в другой вкладке) не перезаписывает дату отзыва
+    assert await RefreshTokenRepository.revoke_by_token_hash(token_hash, revoked + timedelta(seconds=1)) is None
+    assert (await RefreshTokenRepository.find_by_token_hash(token_hash)).revoked == revoked
+
+
+@pytest.mark.anyio
+async def test_expired_opaque_refresh_token_is_not_found(database, opaque_handler):
+    user_id = await add_user()
+    token = await opaque_handler.create_refresh_token("user@example.com", user_id)
+    await RefreshTokenRepository.update_many(
+        {"expires_at": datetime.now() - timedelta(seconds=1)}, token_hash=token_hasher.hash_token(token)
+    )
+
+    assert await opaque_handler.find_refresh_token(token) is None
+
+
+@pytest.mark.anyio
+async def test_concurrent_rotations_share_one_result():
+    grace = RefreshGrace(grace_period=10, max_size=10)
+    jti = uuid4()
+    calls = 0
+
+    async def rotate() -> RotatedTokens:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return rotated(1, "new")
+
+    results = await asyncio.gather(*(grace.rotate(jti, rotate) for _ in range(5)))
+
+    assert calls == 1
+    assert set(results) == {rotated(1, "new")}
+    assert await grace.get(jti) == rotated(1, "new")
+    assert grace.stats()["rotations"] == 1
+
+
+@pytest.mark.anyio
+async def test_rotated_tokens_expire_after_grace_period(monkeypatch):
+    grace = RefreshGrace(grace_period=10, max_size=10)
+    jti = uuid4()
+
+    async def rotate() -> RotatedTokens:
+        return rotated(1, "new")
+
+    await grace.rotate(jti, rotate)
+    now = time.monotonic()
+    monkeypatch.setattr("src.auth.utils.refresh_grace.time.monotonic", lambda: now + 11)
+
+    assert await grace.get(jti) is None
+    assert grace.stats()["cached"] == 0
+
+
+@pytest.mark.anyio
+async def test_discard_forgets_rotations_of_user():
+    grace = RefreshGrace(grace_period=10, max_size=10)
+    first, second = uuid4(), uuid4()
+
+    async def rotate_first() -> RotatedTokens:
+        return rotated(1, "first")
+
+    async def rotate_second() -> RotatedTokens:
+        return rotated(2, "second")
+
+    await grace.rotate(first, rotate_first)
+    await grace.rotate(second, rotate_second)
+
+    grace.discard(1)
+
+    assert await grace.get(first) is None
+    assert await grace.get(second) == rotated(2, "second")
+
+
+@pytest.mark.anyio
+async def test_disabled_grace_period_does_not_cache_rotation():
+    grace = RefreshGrace(grace_period=0, max_size=10)
+    jti = uuid4()
+
+    async def rotate() -> RotatedTokens:
+        return rotated(1, "new")
+
+    assert await grace.rotate(jti, rotate) == rotated(1, "new")
+    assert await grace.get(jti) is None
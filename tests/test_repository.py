@@ -0,0 +1,24 @@
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from src.auth.services import RefreshTokenRepository, UserRepository
+
+
+@pytest.mark.anyio
+async def test_add_if_absent_returns_none_for_duplicate_key(database):
+    assert await UserRepository.add_if_absent(("email",), email="user@example.com", password="hash", role_title="USER")
+
+    assert await UserRepository.add_if_absent(("email",), email="user@example.com", password="other", role_title="USER") is None
+
+
+@pytest.mark.anyio
+async def test_add_if_absent_raises_for_other_unique_violation(database):
+    user = await UserRepository.add(email="user@example.com", password="hash", role_title="USER")
+    token = {"user_id": user.id, "expires_at": datetime.now() + timedelta(days=1), "token_hash": "0" * 64}
+    await RefreshTokenRepository.add_if_absent(("jti",), jti=uuid4(), **token)
+
+    with pytest.raises(IntegrityError):
+        await RefreshTokenRepository.add_if_absent(("jti",), jti=uuid4(), **token)
@@ -0,0 +1,31 @@
+import pytest
+
+from src.config import settings
+from src.serve import _get_workers_count
+
+
+@pytest.fixture
+def sqlite_single_writer(monkeypatch):
+    monkeypatch.setattr(settings, "DB_TYPE", "sqlite")
+    monkeypatch.setattr(settings, "DB_SQLITE_SINGLE_WRITER", True)
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_single_writer_runs_one_worker(monkeypatch, sqlite_single_writer, workers):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", workers)
+
+    assert _get_workers_count() == 1
+
+
+def test_single_writer_refuses_several_workers(monkeypatch, sqlite_single_writer):
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 4)
+
+    with pytest.raises(ValueError):
+        _get_workers_count()
+
+
+def test_workers_are_not_limited_without_single_writer(monkeypatch):
+    monkeypatch.setattr(settings, "DB_SQLITE_SINGLE_WRITER", False)
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 4)
+
+    assert _get_workers_count() == 4
@@ -0,0 +1,111 @@
+import asyncio
+import contextvars
+
+import pytest
+
+from src.auth.services import UserRepository, find_principal_flight
+from src.single_flight import SingleFlight
+
+
+def in_new_request(coroutine):
+    """
+    Выполняет корутину в отдельной задаче с пустым контекстом, как обработку нового HTTP-запроса.
+    """
+    return asyncio.create_task(coroutine, context=contextvars.Context())
+
+
+@pytest.mark.anyio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test", enabled=True)
+    calls = 0
+
+    async def query(value: int) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return value
+
+    results = await asyncio.gather(*(flight.do("key", query, 1) for _ in range(5)))
+
+    assert results == [1] * 5
+    assert calls == 1
+    assert flight.stats() == {"name": "test", "in_flight": 0, "calls": 5, "executed": 1, "coalesced": 4}
+
+
+@pytest.mark.anyio
+async def test_exception_is_shared_and_key_is_released():
+    flight = SingleFlight("test", enabled=True)
+
+    async def query() -> None:
+        await asyncio.sleep(0.01)
+        raise ConnectionError("database is unavailable")
+
+    results = await asyncio.gather(*(flight.do("key", query) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert flight.pending("key") is None
+
+
+@pytest.mark.anyio
+async def test_cancelled_caller_does_not_cancel_query_for_others():
+    flight = SingleFlight("test", enabled=True)
+
+    async def query() -> str:
+        await asyncio.sleep(0.05)
+        return "result"
+
+    first = asyncio.create_task(flight.do("key", query))
+    second = asyncio.create_task(flight.do("key", query))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "result"
+
+
+@pytest.mark.anyio
+async def test_disabled_flight_executes_every_call():
+    flight = SingleFlight("test", enabled=False)
+    calls = 0
+
+    async def query() -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(flight.do("key", query) for _ in range(3)))
+
+    assert calls == 3
+
+
+@pytest.mark.anyio
+async def test_principal_lookups_are_coalesced(database):
+    await in_new_request(UserRepository.add(email="user@example.com", password="hash", role_title="USER"))
+    coalesced = find_principal_flight.coalesced
+
+    async def lookups() -> list:
+        return await asyncio.gather(*(UserRepository.find_principal_by_email("user@example.com") for _ in range(5)))
+
+    principals = await in_new_request(lookups())
+
+    assert {principal.email for principal in principals} == {"user@example.com"}
+    assert find_principal_flight.coalesced - coalesced == 4
+
+
+@pytest.mark.anyio
+async def test_principal_lookups_after_write_are_not_coalesced(database):
+    user = await in_new_request(UserRepository.add(email="user@example.com", password="hash", role_title="USER"))
+    coalesced = find_principal_flight.coalesced
+
+    async def lookups_after_write() -> list:
+        await UserRepository.update(user.id, role_title="ADMIN")
+        return await asyncio.gather(*(UserRepository.find_principal_by_email("user@example.com") for _ in range(5)))
+
+    async def slow_lookup():
+        await asyncio.sleep(0)
+        return await UserRepository.find_principal_by_email("user@example.com")
+
+    # Чтение другого запроса, начатое до записи, не должно отдать устаревшую роль запросу, выполнившему запись
+    _, principals = await asyncio.gather(in_new_request(slow_lookup()), in_new_request(lookups_after_write()))
+
+    assert {principal.role_title for principal in principals} == {"ADMIN"}
+    assert find_principal_flight.coalesced == coalesced
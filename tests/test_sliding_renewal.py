@@ -0,0 +1,55 @@
+import pytest
+from fastapi import FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+
+from src.auth.middleware import SlidingRenewalMiddleware
+from src.auth.services import UserRepository
+from src.auth.utils.jwt_handler import jwt_handler
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(SlidingRenewalMiddleware, window=jwt_handler.access_token_exp)
+
+    @app.get("/ok")
+    async def ok() -> dict:
+        return {}
+
+    @app.get("/forbidden")
+    async def forbidden() -> dict:
+        raise HTTPException(status_code=403)
+
+    @app.get("/error")
+    async def error() -> dict:
+        raise HTTPException(status_code=500)
+
+    return app
+
+
+@pytest.fixture
+async def client(database):
+    user = await UserRepository.add(email="user@example.com", password="hash", role_title="USER")
+    cookies = {
+        "access_token": await jwt_handler.create_access_token("user@example.com"),
+        "refresh_token": await jwt_handler.create_refresh_token("user@example.com", user.id),
+    }
+    async with AsyncClient(transport=ASGITransport(app=create_app()), base_url="https://test", cookies=cookies) as client:
+        yield client
+
+
+def renewed(response) -> bool:
+    return any(value.startswith("access_token=") for value in response.headers.get_list("set-cookie"))
+
+
+@pytest.mark.anyio
+async def test_successful_response_renews_access_token(client):
+    assert renewed(await client.get("/ok"))
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path", ["/forbidden", "/error", "/missing"])
+async def test_error_response_does_not_renew_access_token(client, path):
+    response = await client.get(path)
+
+    assert response.status_code >= 400
+    assert not renewed(response)
@@ -0,0 +1,35 @@
+from typing import Optional
+
+import pytest
+
+from src.idempotency import IdempotencyStore, MemoryIdempotencyStore
+from src.limits.lockout import LockoutStore
+from src.stores import load_store
+
+
+class IncompleteIdempotencyStore(IdempotencyStore):
+    async def get(self, key: str) -> Optional[dict]:
+        return None
+
+
+class UnrelatedStore:
+    pass
+
+
+def test_default_store_is_created_without_path():
+    assert isinstance(load_store(None, IdempotencyStore, MemoryIdempotencyStore), MemoryIdempotencyStore)
+
+
+def test_store_with_missing_methods_fails_on_load():
+    with pytest.raises(TypeError):
+        load_store(f"{__name__}.IncompleteIdempotencyStore", IdempotencyStore, MemoryIdempotencyStore)
+
+
+def test_store_not_implementing_interface_fails_on_load():
+    with pytest.raises(ValueError):
+        load_store(f"{__name__}.UnrelatedStore", IdempotencyStore, MemoryIdempotencyStore)
+
+
+def test_lockout_store_interface_is_abstract():
+    with pytest.raises(TypeError):
+        LockoutStore()
@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.auth.services import UserRepository
+from src.models import User
+
+
+def test_prefix_pattern_is_bound_as_single_parameter():
+    query = select(User.id).where(User.email.like(UserRepository._prefix_pattern("a_b%c/"), escape="/"))
+    compiled = query.compile(dialect=postgresql.asyncpg.dialect())
+
+    assert "||" not in str(compiled)
+    assert list(compiled.params.values()) == ["a/_b/%c//%"]
+
+
+@pytest.mark.anyio
+async def test_search_escapes_like_wildcards(database):
+    for email in ("a_b@example.com", "axb@example.com", "a%b@example.com"):
+        await UserRepository.add(email=email, password="hash", role_title="USER", first_name="Иван")
+
+    assert [user.email for user in await UserRepository.search(email_prefix="a_")] == ["a_b@example.com"]
+    assert [user.email for user in await UserRepository.search(email_prefix="a%")] == ["a%b@example.com"]
+    assert len(await UserRepository.search(email_prefix="a")) == 3
+    assert len(await UserRepository.search(name="Ив")) == 3